@@ -2,6 +2,8 @@ from __future__ import absolute_import, unicode_literals
 import os
 from celery import Celery
 
+from unravel.lib.instrumentation import instrument_celery_tasks
+
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legal_accord.settings')
 
@@ -16,6 +18,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
 
+# Time each task, see the metrics endpoint.
+instrument_celery_tasks()
+
 
 @app.task(bind=True)
 def debug_task(self):
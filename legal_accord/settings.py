@@ -49,7 +49,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'unravel',
+    'unravel.apps.UnravelConfig',
 ]
 
 if DEBUG:
@@ -61,6 +61,7 @@ if DEBUG:
 # https://docs.djangoproject.com/en/2.1/topics/http/middleware/
 
 MIDDLEWARE = [
+    'unravel.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -162,13 +163,40 @@ MEDIA_ROOT = os.getenv('DJANGO_MEDIA_ROOT')
 # Cache
 # https://docs.djangoproject.com/en/2.1/ref/settings/#caches
 
+# The default cache is shared between processes.
+# Set DJANGO_CACHE_BACKEND to use a shared backend such as memcached instead of files.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
         'LOCATION': os.getenv('DJANGO_CACHE_LOCATION'),
     }
 }
 
+# The model cache keeps recently used document, tag, and result reads in each process,
+# in front of the shared cache. See unravel.lib.tiered_cache.
+UNRAVEL_CACHE = {
+    'SHARED_ALIAS': 'default',
+    'LOCAL_MAX_ENTRIES': int(os.getenv('UNRAVEL_CACHE_LOCAL_MAX_ENTRIES', '1000')),
+    'LOCAL_MAX_BYTES': int(os.getenv('UNRAVEL_CACHE_LOCAL_MAX_BYTES', str(32 * 1024 * 1024))),
+    'TIMEOUT': int(os.getenv('UNRAVEL_CACHE_TIMEOUT', '300')),
+    'GENERATION_TTL': int(os.getenv('UNRAVEL_CACHE_GENERATION_TTL', '5')),
+}
+
+# New document versions are compared to the previous version of the same document.
+# The change ratio is from 0 (unchanged) to 1 (all changed), weighted by paragraph length.
+# A new version is only analysed when the change ratio is above UNRAVEL_CHANGE_ANALYSE_RATIO,
+# and the document_version_changed signal is only sent when it is above UNRAVEL_CHANGE_NOTIFY_RATIO.
+UNRAVEL_CHANGE_ANALYSE_RATIO = float(os.getenv('UNRAVEL_CHANGE_ANALYSE_RATIO', '0'))
+UNRAVEL_CHANGE_NOTIFY_RATIO = float(os.getenv('UNRAVEL_CHANGE_NOTIFY_RATIO', '0.05'))
+
+# Request and task timings are available at /metrics to the INTERNAL_IPS. See unravel.lib.instrumentation.
+# Set UNRAVEL_PROFILE_SLOW_SECONDS to sample the stacks of requests and tasks,
+# and log the most common stacks of those that take longer than this many seconds.
+UNRAVEL_METRICS = {
+    'PROFILE_SLOW_SECONDS': float(os.getenv('UNRAVEL_PROFILE_SLOW_SECONDS', '0')),
+    'PROFILE_INTERVAL': float(os.getenv('UNRAVEL_PROFILE_INTERVAL', '0.005')),
+}
+
 # Security and HTTPS and CSRF
 # https://docs.djangoproject.com/en/2.1/ref/middleware/#http-strict-transport-security
 # https://docs.djangoproject.com/en/2.1/ref/csrf/
@@ -1,5 +1,6 @@
 from .document_admin import DocumentAdmin
 from .document_result_admin import DocumentResultAdmin
+from .document_source_admin import DocumentSourceAdmin
 from .document_tag_admin import DocumentTagAdmin
 from .document_version_admin import DocumentVersionAdmin
 
@@ -12,5 +13,6 @@ admin.site.register(app_models.User, UserAdmin)
 
 admin.site.register(app_models.Document, DocumentAdmin)
 admin.site.register(app_models.DocumentResult, DocumentResultAdmin)
+admin.site.register(app_models.DocumentSource, DocumentSourceAdmin)
 admin.site.register(app_models.DocumentTag, DocumentTagAdmin)
 admin.site.register(app_models.DocumentVersion, DocumentVersionAdmin)
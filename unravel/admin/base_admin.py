@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from unravel.lib.tiered_cache import get_model_cache
+
 
 class BaseAdmin(admin.ModelAdmin):
 
@@ -12,3 +14,15 @@ class BaseAdmin(admin.ModelAdmin):
         # need to include the current user when saving the model
         # SEE ALSO: super().delete_model(request, obj)
         obj.delete(request=request)
+
+    def delete_queryset(self, request, queryset):
+        # bulk deletes do not go through the model delete,
+        # the admin runs them in a transaction so the cached reads are invalidated on commit
+        super().delete_queryset(request, queryset)
+        get_model_cache().invalidate_on_commit(queryset.model)
+
+    def save_related(self, request, form, formsets, change):
+        # many to many changes do not go through the model save,
+        # so invalidate cached reads again after they are saved
+        super().save_related(request, form, formsets, change)
+        get_model_cache().invalidate_on_commit(form.instance)
@@ -1,5 +1,22 @@
+from django.contrib import admin
+
+from unravel import models as app_models
 from unravel.admin.base_admin import BaseAdmin
 
 
+class DocumentResultMetricInline(admin.TabularInline):
+    model = app_models.DocumentResultMetric
+    fields = ('metric', 'value', 'analysed_date')
+    readonly_fields = ('metric', 'value', 'analysed_date')
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 class DocumentResultAdmin(BaseAdmin):
-    pass
+    list_display = ('__str__', 'document_version', 'analyser_name', 'analyser_version', 'created_date')
+    list_filter = ('analyser_name',)
+    readonly_fields = ('analyser_name', 'analyser_version', 'analyser_model_version')
+    inlines = (DocumentResultMetricInline,)
@@ -0,0 +1,8 @@
+from unravel.admin.base_admin import BaseAdmin
+
+
+class DocumentSourceAdmin(BaseAdmin):
+    list_display = ('url', 'document', 'enabled', 'last_status', 'last_checked_date', 'last_changed_date')
+    list_filter = ('enabled', 'last_status')
+    readonly_fields = (
+        'etag', 'last_modified', 'content_hash', 'last_status', 'last_error', 'last_checked_date', 'last_changed_date')
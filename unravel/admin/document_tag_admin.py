@@ -2,4 +2,4 @@ from unravel.admin.base_admin import BaseAdmin
 
 
 class DocumentTagAdmin(BaseAdmin):
-    pass
+    search_fields = ('title', 'name')
@@ -2,4 +2,6 @@ from unravel.admin.base_admin import BaseAdmin
 
 
 class DocumentVersionAdmin(BaseAdmin):
-    pass
+    search_fields = ('document__title',)
+    # the version name includes the document title
+    list_select_related = ('document',)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class UnravelConfig(AppConfig):
     name = 'unravel'
+
+    def ready(self):
+        from unravel import receivers  # noqa: F401
@@ -0,0 +1,24 @@
+import hashlib
+
+# Size of the chunks read when hashing a file.
+CHUNK_SIZE = 64 * 1024
+
+
+def hash_bytes(data: bytes) -> str:
+    """Get the hex SHA-256 digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Get the hex SHA-256 digest of the UTF-8 encoded text."""
+    return hash_bytes(text.encode('utf-8'))
+
+
+def hash_file(content_file) -> str:
+    """Get the hex SHA-256 digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    content_file.seek(0)
+    for chunk in iter(lambda: content_file.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    content_file.seek(0)
+    return digest.hexdigest()
@@ -0,0 +1,92 @@
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from docutils import nodes
+from docutils.core import publish_parts
+from docutils.readers import standalone
+from docutils.transforms import Transform
+
+from unravel.lib.content_hash import hash_text
+
+# Change the version when the rendering settings change, so cached documents are rendered again.
+RENDERER_VERSION = '3'
+
+# The link schemes allowed in rendered text, other links are rendered as plain text.
+# Links without a scheme are only allowed to a fragment of the same page.
+SAFE_URI_SCHEMES = ('http', 'https', 'mailto')
+
+# docutils settings for rendering untrusted text, the reader also removes unsafe links and images
+_DOCUTILS_SETTINGS = {
+    '_disable_config': True,
+    'doctitle_xform': False,
+    'file_insertion_enabled': False,
+    'halt_level': 5,
+    'initial_header_level': 2,
+    'raw_enabled': False,
+    'report_level': 5,
+}
+
+
+def is_safe_uri(uri: str) -> bool:
+    """Check whether a link or image uri can be included in the rendered text."""
+    if uri.startswith('#'):
+        return True
+    try:
+        scheme = urlsplit(uri).scheme
+    except ValueError:
+        return False
+    return scheme.lower() in SAFE_URI_SCHEMES
+
+
+class _RemoveUnsafeUris(Transform):
+    """Replace links with an unsafe uri by their text, and remove images with an unsafe uri."""
+
+    # after the references are resolved to uris
+    default_priority = 900
+
+    def apply(self):
+        for node in list(self.document.traverse(nodes.reference)):
+            if 'refuri' in node and not is_safe_uri(node['refuri']):
+                node.replace_self(nodes.inline(node.rawsource, '', *node.children))
+        for node in list(self.document.traverse(nodes.image)):
+            if not is_safe_uri(node.get('uri', '')):
+                node.parent.remove(node)
+
+
+class _SafeReader(standalone.Reader):
+
+    def get_transforms(self):
+        return super().get_transforms() + [_RemoveUnsafeUris]
+
+
+def render_document(source: str) -> str:
+    """Render a whole reStructuredText document to an HTML fragment.
+    The document is rendered at once, so section levels, references, and footnotes resolve across the document."""
+    parts = publish_parts(
+        source=source, reader=_SafeReader(), writer_name='html', settings_overrides=_DOCUTILS_SETTINGS)
+    return parts['fragment']
+
+
+class ContentRenderer:
+    """Render document text to HTML using docutils.
+
+    The output is cached by the content hash,
+    so versions with the same content are only rendered once.
+    """
+
+    def __init__(self, render_cache=None, timeout=None):
+        self.cache = render_cache or cache
+        self.timeout = timeout
+
+    def render(self, text: str, content_hash: str = None) -> str:
+        """Render the text. The content hash is the hash of the text, it is calculated if it is not given."""
+        text = text or ''
+        key = self._cache_key(content_hash or hash_text(text))
+        rendered = self.cache.get(key)
+        if rendered is None:
+            rendered = render_document(text)
+            self.cache.set(key, rendered, timeout=self.timeout)
+        return rendered
+
+    def _cache_key(self, content_hash: str) -> str:
+        return 'unravel:rst:{}:{}'.format(RENDERER_VERSION, content_hash)
@@ -0,0 +1,252 @@
+import io
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Case, CharField, F, Func, Value, When
+from django.utils import timezone
+
+from unravel import models as app_models
+from unravel._version import __version__
+from unravel.lib.snapshot_archive import BINARY, DATETIME, SnapshotReader, SnapshotWriter
+from unravel.lib.tiered_cache import get_model_cache
+from unravel.tasks import queue_render_document_version, update_search_vectors
+
+# A table in the snapshot, with the column names and archive column types.
+# The values of a column in expressions are read from the expression instead of the field.
+SnapshotTable = namedtuple('SnapshotTable', ['name', 'model', 'columns', 'types', 'expressions'])
+
+# The raw text of the document versions, stored once for each different text.
+# The key is the md5 of the text, which is calculated by the database.
+# The version table has the key in the raw text column, which is replaced by the text after import.
+CONTENT_TABLE = 'content'
+CONTENT_COLUMNS = ('content_key', 'content_text_raw')
+
+# Document version fields that are not exported, they are set again after import.
+_VERSION_EXCLUDE = ('content_text_formatted', 'content_formatted_hash', 'content_text_norm', 'content_text_simple')
+
+# The content key of a version, an empty text stays empty and null stays null.
+_VERSION_EXPRESSIONS = {
+    'content_text_raw': Case(
+        When(content_text_raw='', then=Value('')),
+        default=Func(F('content_text_raw'), function='md5'), output_field=CharField()),
+}
+
+_COLUMN_TYPES = {
+    'AutoField': 'int',
+    'BigAutoField': 'int',
+    'BigIntegerField': 'int',
+    'ForeignKey': 'int',
+    'IntegerField': 'int',
+    'PositiveIntegerField': 'int',
+    'FloatField': 'float',
+    'BooleanField': 'bool',
+    'DateTimeField': DATETIME,
+    'BinaryField': BINARY,
+    'ArrayField': 'array',
+}
+
+SEARCH_VECTOR_BATCH_SIZE = 1000
+
+
+def _table(name: str, model, exclude: Sequence[str] = (), expressions: Optional[dict] = None) -> SnapshotTable:
+    """Build the table for a model. The user foreign keys are not exported, as users differ between databases."""
+    user_model = get_user_model()
+    fields = [
+        field for field in model._meta.concrete_fields
+        if field.name not in exclude and not (field.is_relation and field.related_model is user_model)]
+    return SnapshotTable(
+        name, model, [field.column for field in fields],
+        [_COLUMN_TYPES.get(field.get_internal_type(), 'text') for field in fields], expressions or {})
+
+
+def snapshot_tables() -> List[SnapshotTable]:
+    """Get the snapshot tables, in the order they can be loaded."""
+    return [
+        _table('document', app_models.Document),
+        _table('documenttag', app_models.DocumentTag),
+        _table('documenttag_documents', app_models.DocumentTag.documents.through),
+        _table('documentversion', app_models.DocumentVersion, exclude=_VERSION_EXCLUDE,
+               expressions=_VERSION_EXPRESSIONS),
+        _table('documentsource', app_models.DocumentSource),
+        _table('documentresult', app_models.DocumentResult),
+        _table('documentresult_documents', app_models.DocumentResult.documents.through),
+        _table('documentresultmetric', app_models.DocumentResultMetric),
+    ]
+
+
+def _table_rows(table: SnapshotTable, chunk_rows: int) -> Iterator[tuple]:
+    query = table.model.objects.order_by('pk')
+    names = []
+    for column in table.columns:
+        if column in table.expressions:
+            # an annotation can not have the same name as a field
+            name = 'snapshot_{}'.format(column)
+            query = query.annotate(**{name: table.expressions[column]})
+            names.append(name)
+        else:
+            names.append(column)
+    return query.values_list(*names).iterator(chunk_size=chunk_rows)
+
+
+def _content_rows(chunk_rows: int) -> Iterator[tuple]:
+    """Get each different non-empty raw text once, with its content key."""
+    sql = (
+        'SELECT DISTINCT ON (md5(content_text_raw)) md5(content_text_raw), content_text_raw FROM {} '
+        "WHERE content_text_raw <> '' ORDER BY md5(content_text_raw)").format(
+        connection.ops.quote_name(app_models.DocumentVersion._meta.db_table))
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql)
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield from rows
+
+
+def export_snapshot(file, chunk_rows: int = 5000,
+                    progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """Write all documents, versions, tags, sources, and results to a snapshot archive.
+    The export runs in one read only, repeatable read transaction, unless it is called in a transaction.
+    Returns the number of rows exported for each table."""
+    counts = {}
+    # all the tables are read from the same snapshot of the database,
+    # so the foreign keys and the content keys match even if there are writes during the export
+    in_transaction = connection.in_atomic_block
+    with transaction.atomic(), SnapshotWriter(file, chunk_rows=chunk_rows, metadata={
+            'version': __version__, 'created': timezone.now().isoformat()}) as writer:
+        if not in_transaction:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        for table in snapshot_tables():
+            counts[table.name] = writer.write_table(
+                table.name, table.columns, table.types, _table_rows(table, chunk_rows))
+            if progress is not None:
+                progress(table.name, counts[table.name])
+
+        # versions often share the same text, so each text is stored once
+        counts[CONTENT_TABLE] = writer.write_table(
+            CONTENT_TABLE, CONTENT_COLUMNS, ('text', 'text'), _content_rows(chunk_rows))
+        if progress is not None:
+            progress(CONTENT_TABLE, counts[CONTENT_TABLE])
+    return counts
+
+
+def _copy_value(value, column_type: str) -> Optional[str]:
+    """Format a value for a PostgreSQL COPY in csv format."""
+    if value is None:
+        return None
+    if column_type == 'bool':
+        return 't' if value else 'f'
+    if column_type == BINARY:
+        return '\\x' + value.hex()
+    if column_type == 'array':
+        return '{' + ','.join(str(item) for item in value) + '}'
+    if column_type == DATETIME:
+        return value.isoformat()
+    return str(value)
+
+
+def copy_csv(rows: Iterable[Sequence], types: Sequence[str]) -> io.StringIO:
+    """Build the csv input for a COPY. Null is an unquoted empty field, and every other value is quoted,
+    so an empty string is not loaded as null."""
+    output = io.StringIO()
+    for row in rows:
+        fields = []
+        for value, column_type in zip(row, types):
+            value = _copy_value(value, column_type)
+            fields.append('' if value is None else '"{}"'.format(value.replace('"', '""')))
+        output.write(','.join(fields))
+        output.write('\n')
+    output.seek(0)
+    return output
+
+
+def _copy_chunks(cursor, table_name: str, columns: Sequence[str], types: Sequence[str], chunks) -> None:
+    sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+        connection.ops.quote_name(table_name), ', '.join(connection.ops.quote_name(column) for column in columns))
+    for rows in chunks:
+        cursor.copy_expert(sql, copy_csv(rows, types))
+
+
+def queue_renders(progress: Optional[Callable[[str, int], None]] = None) -> int:
+    """Queue the render task for every version that does not have current formatted text.
+    Returns the number of versions queued."""
+    versions = app_models.DocumentVersion.objects.filter(content_hash__isnull=False).exclude(
+        content_formatted_hash=F('content_hash')).order_by('pk').values_list('pk', 'content_hash')
+    queued = 0
+    for version_id, content_hash in versions.iterator(chunk_size=SEARCH_VECTOR_BATCH_SIZE):
+        if queue_render_document_version(version_id, content_hash):
+            queued += 1
+    if progress is not None:
+        progress('render tasks', queued)
+    return queued
+
+
+def import_snapshot(file, update_vectors: bool = True, render: bool = True,
+                    progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """Load a snapshot archive into empty tables using COPY.
+
+    The model save methods are not used, so there are no admin log entries.
+    The id sequences are reset afterwards, the search vectors are updated if
+    update_vectors is True, and the render tasks are queued once the import
+    has committed if render is True.
+    Returns the number of rows imported for each table.
+    """
+    counts = {}
+    with SnapshotReader(file) as reader:
+        tables = [table for table in snapshot_tables() if table.name in reader.tables]
+        not_empty = [table.name for table in tables if table.model.objects.exists()]
+        if not_empty:
+            raise ValueError('Snapshots can only be imported into empty tables. Not empty: {}.'.format(
+                ', '.join(not_empty)))
+        if 'documentversion' in reader.tables and CONTENT_TABLE not in reader.tables:
+            raise ValueError('The snapshot has document versions without the {} table.'.format(CONTENT_TABLE))
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in tables:
+                columns = reader.columns(table.name)
+                unknown = set(columns) - set(table.columns)
+                if unknown:
+                    raise ValueError('Unknown columns in the {} table: {}.'.format(
+                        table.name, ', '.join(sorted(unknown))))
+                _copy_chunks(cursor, table.model._meta.db_table, columns, reader.types(table.name),
+                             reader.iter_chunks(table.name))
+                counts[table.name] = reader.row_count(table.name)
+                if progress is not None:
+                    progress(table.name, counts[table.name])
+
+            if CONTENT_TABLE in reader.tables:
+                # load the texts into a temporary table, then replace the content key of each version with the text
+                cursor.execute(
+                    'CREATE TEMPORARY TABLE unravel_snapshot_content (content_key text PRIMARY KEY, '
+                    'content_text_raw text) ON COMMIT DROP')
+                _copy_chunks(cursor, 'unravel_snapshot_content', CONTENT_COLUMNS, ('text', 'text'),
+                             reader.iter_chunks(CONTENT_TABLE))
+                cursor.execute(
+                    'UPDATE {version} SET content_text_raw = c.content_text_raw FROM unravel_snapshot_content c '
+                    'WHERE {version}.content_text_raw = c.content_key'.format(
+                        version=connection.ops.quote_name(app_models.DocumentVersion._meta.db_table)))
+                counts[CONTENT_TABLE] = reader.row_count(CONTENT_TABLE)
+                if progress is not None:
+                    progress(CONTENT_TABLE, counts[CONTENT_TABLE])
+
+            for sql in connection.ops.sequence_reset_sql(no_style(), [table.model for table in tables]):
+                cursor.execute(sql)
+
+    for table in tables:
+        get_model_cache().invalidate_on_commit(table.model)
+
+    if update_vectors:
+        version_ids = list(app_models.DocumentVersion.objects.order_by('pk').values_list('pk', flat=True))
+        for index in range(0, len(version_ids), SEARCH_VECTOR_BATCH_SIZE):
+            update_search_vectors(version_ids[index:index + SEARCH_VECTOR_BATCH_SIZE])
+        if progress is not None:
+            progress('search vectors', len(version_ids))
+
+    if render:
+        # the render tasks must not run before the imported versions are visible to the celery workers
+        transaction.on_commit(lambda: queue_renders(progress))
+    return counts
@@ -0,0 +1,60 @@
+import re
+from typing import Iterator, Optional, Tuple
+
+# Size of the chunks read when streaming a file.
+CHUNK_SIZE = 64 * 1024
+
+_BYTE_RANGE = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', re.IGNORECASE)
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range is outside the content."""
+    pass
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Get the (start, end) inclusive byte positions from a Range header.
+
+    Returns None when there is no range or it can't be used, so the whole content should be sent.
+    Only a single byte range is supported, a header with multiple ranges is ignored.
+    Raises RangeNotSatisfiable when the range does not overlap the content.
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE.match(header)
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # suffix range: the last n bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = int(last) if last else size - 1
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file_range(content_file, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read the inclusive byte range from a file in chunks, then close the file."""
+    try:
+        content_file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = content_file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        content_file.close()
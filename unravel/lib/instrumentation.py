@@ -0,0 +1,345 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import Counter as FrameCounter
+from contextlib import ContextDecorator
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in seconds for timings.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+LabelValues = Tuple[Tuple[str, str], ...]
+
+
+def _label_values(labels: Dict[str, object]) -> LabelValues:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: LabelValues, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ''
+    escaped = ('{}="{}"'.format(name, value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+               for name, value in items)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A count that only increases, for each set of label values."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = {}  # type: Dict[LabelValues, float]
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_values(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return ['{}{} {}'.format(self.name, _format_labels(labels), _format_value(value))
+                for labels, value in values]
+
+
+class Histogram:
+    """Counts of observed values in cumulative buckets, with the sum and count, for each set of label values."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # for each set of label values: the count in each bucket (not cumulative), the sum, and the count
+        self._values = {}  # type: Dict[LabelValues, list]
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            values[0][index] += 1
+            values[1] += value
+            values[2] += 1
+
+    def count(self, **labels) -> int:
+        values = self._values.get(_label_values(labels))
+        return values[2] if values else 0
+
+    def sum(self, **labels) -> float:
+        values = self._values.get(_label_values(labels))
+        return values[1] if values else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count)
+                            in self._values.items())
+        lines = []
+        for labels, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                lines.append('{}_bucket{} {}'.format(
+                    self.name, _format_labels(labels, (('le', _format_value(bound)),)), cumulative))
+            lines.append('{}_sum{} {}'.format(self.name, _format_labels(labels), _format_value(total)))
+            lines.append('{}_count{} {}'.format(self.name, _format_labels(labels), count))
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics for this process, rendered in the Prometheus text format.
+
+    Each process (web worker or celery worker) has its own registry,
+    so the metrics endpoint shows the process that handled the request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # type: Dict[str, object]
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._get_or_create(Counter, name, documentation)
+
+    def histogram(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, buckets)
+
+    def render(self, extra: Optional[Dict[str, float]] = None) -> str:
+        """Get all the metrics in the Prometheus text format.
+        The extra values are added as gauges, e.g. for counters kept elsewhere."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for name, metric in metrics:
+            lines.append('# HELP {} {}'.format(name, metric.documentation))
+            lines.append('# TYPE {} {}'.format(name, metric.kind))
+            lines.extend(metric.samples())
+        for name, value in sorted((extra or {}).items()):
+            lines.append('# TYPE {} gauge'.format(name))
+            lines.append('{} {}'.format(name, _format_value(value)))
+        return '\n'.join(lines) + '\n'
+
+    def _get_or_create(self, metric_class, name: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args)
+            elif not isinstance(metric, metric_class):
+                raise ValueError('Metric "{}" is already registered as a {}.'.format(name, metric.kind))
+            return metric
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the metrics registry for this process."""
+    return _registry
+
+
+class timed(ContextDecorator):
+    """Observe the seconds taken by a block or function in a histogram.
+
+    Use as a context manager or a decorator:
+
+        with timed('unravel_search_vector_seconds', 'Time to update search vectors.'):
+            ...
+
+        @timed('unravel_heatmap_seconds', 'Time to build a sentence heatmap.', stage='tokenize')
+        def tokenize(text):
+            ...
+    """
+
+    def __init__(self, name: str, documentation: str, registry: Optional[MetricsRegistry] = None, **labels):
+        self.histogram = (registry or get_registry()).histogram(name, documentation)
+        self.labels = labels
+        self._started = threading.local()
+
+    def __enter__(self):
+        starts = getattr(self._started, 'values', None)
+        if starts is None:
+            starts = self._started.values = []
+        starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._started.values.pop(), **self.labels)
+        return False
+
+
+class QueryTimer:
+    """Count the database queries and the time spent in them, using a connection execute wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - started
+
+
+class SamplingProfiler:
+    """Sample the stacks of threads that are inside a profiled span.
+
+    A single daemon thread takes a sample of each profiled thread's stack
+    every interval seconds. When a span takes longer than slow_seconds,
+    the most common stacks are logged. Sampling only reads the frames of
+    other threads, so the profiled code is not slowed down by tracing.
+    """
+
+    def __init__(self, interval: float = 0.005, slow_seconds: float = 1.0, max_stacks: int = 10):
+        self.interval = interval
+        self.slow_seconds = slow_seconds
+        self.max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._spans = {}  # type: Dict[int, FrameCounter]
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def span(self, name: str) -> 'ProfiledSpan':
+        return ProfiledSpan(self, name)
+
+    def start_span(self) -> None:
+        with self._lock:
+            self._spans[threading.get_ident()] = FrameCounter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name='unravel-sampling-profiler', daemon=True)
+                self._thread.start()
+
+    def end_span(self) -> FrameCounter:
+        with self._lock:
+            return self._spans.pop(threading.get_ident(), FrameCounter())
+
+    def format_stacks(self, stacks: FrameCounter) -> str:
+        total = sum(stacks.values())
+        parts = []
+        for stack, count in stacks.most_common(self.max_stacks):
+            parts.append('{} of {} samples:\n{}'.format(count, total, stack))
+        return '\n'.join(parts)
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                idents = list(self._spans)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = ''.join(traceback.format_list(traceback.extract_stack(frame, limit=30)))
+                with self._lock:
+                    counter = self._spans.get(ident)
+                    if counter is not None:
+                        counter[stack] += 1
+
+
+class ProfiledSpan:
+    """A block of code that is sampled by the profiler, and logged if it is slow."""
+
+    def __init__(self, profiler: SamplingProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self.profiler.start_span()
+        return self
+
+    def __exit__(self, *exc):
+        stacks = self.profiler.end_span()
+        elapsed = time.perf_counter() - self._started
+        if elapsed >= self.profiler.slow_seconds and stacks:
+            logger.warning('Slow {} took {:.3f} seconds. Most common stacks:\n{}'.format(
+                self.name, elapsed, self.profiler.format_stacks(stacks)))
+        return False
+
+
+_profiler = None
+_profiler_loaded = False
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """Get the sampling profiler for this process.
+    Returns None if profiling is not enabled in the UNRAVEL_METRICS setting."""
+    global _profiler, _profiler_loaded
+    if not _profiler_loaded:
+        from django.conf import settings
+
+        options = getattr(settings, 'UNRAVEL_METRICS', {})
+        if options.get('PROFILE_SLOW_SECONDS'):
+            _profiler = SamplingProfiler(
+                interval=options.get('PROFILE_INTERVAL', 0.005), slow_seconds=options['PROFILE_SLOW_SECONDS'])
+        _profiler_loaded = True
+    return _profiler
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def profiled(name: str):
+    """Profile a block of code if profiling is enabled, otherwise do nothing."""
+    profiler = get_profiler()
+    return profiler.span(name) if profiler is not None else _NoSpan()
+
+
+_task_runs = {}  # type: Dict[str, tuple]
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    span = profiled('task {}'.format(task.name))
+    span.__enter__()
+    _task_runs[task_id] = (time.perf_counter(), span)
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    run = _task_runs.pop(task_id, None)
+    if run is None:
+        return
+    started, span = run
+    span.__exit__(None, None, None)
+    get_registry().histogram('unravel_task_seconds', 'Time to run each celery task.').observe(
+        time.perf_counter() - started, task=task.name, state=state or 'UNKNOWN')
+
+
+def instrument_celery_tasks() -> None:
+    """Time every celery task run in this process, and profile slow tasks if profiling is enabled."""
+    from celery import signals
+
+    signals.task_prerun.connect(_task_prerun, weak=False, dispatch_uid='unravel_task_prerun')
+    signals.task_postrun.connect(_task_postrun, weak=False, dispatch_uid='unravel_task_postrun')
@@ -0,0 +1,50 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    """The pagination cursor could not be decoded."""
+    pass
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last item on a page as an opaque cursor."""
+    data = json.dumps({'id': last_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """Get the id of the last item on the previous page from a cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))['id']
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise InvalidCursor('Invalid cursor "{}".'.format(cursor))
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InvalidCursor('Invalid cursor "{}".'.format(cursor))
+    return value
+
+
+def keyset_page(queryset, cursor: Optional[str], limit: int) -> Tuple[List, Optional[str]]:
+    """Get one page of a queryset ordered by id, starting after the cursor.
+
+    Unlike OFFSET pagination, every page is an index range scan on the
+    primary key, so the cost of a page does not depend on how far into
+    the results it is. The queryset can be a values() queryset, as long
+    as it includes the 'id' field.
+
+    Returns the items on the page and the cursor for the next page, or None if this is the last page.
+    """
+    query = queryset.order_by('id')
+    if cursor:
+        query = query.filter(id__gt=decode_cursor(cursor))
+
+    items = list(query[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    last_id = last['id'] if isinstance(last, dict) else last.id
+    return items, encode_cursor(last_id)
@@ -0,0 +1,258 @@
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from unravel import models as app_models
+from unravel.lib.content_hash import hash_text
+from unravel.lib.instrumentation import QueryTimer
+from unravel.lib.text_analysis.corpus_generator import generate_corpus_text
+from unravel.lib.tiered_cache import get_model_cache
+from unravel.tasks import render_document_version, update_search_vectors
+
+# The title prefix of seeded documents and tags, used to find them again for clean up.
+SEED_PREFIX = 'load-test'
+
+# One timed request or query.
+Sample = namedtuple('Sample', ['scenario', 'status', 'seconds', 'queries', 'db_seconds'])
+
+
+def seed_documents(count: int, versions: int = 3, tags: int = 20, size: int = 20 * 1024, seed: int = 0,
+                   user=None, render: bool = True, batch_size: int = 500,
+                   progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, List[int]]:
+    """Create documents, versions, and tags using bulk_create, which is the same path the celery tasks use.
+
+    The version text is generated EULA-like text of about size bytes, varying between versions.
+    The search vectors are set, and the formatted text is rendered when render is True,
+    so the views do not queue celery tasks. Returns the ids of the created objects by model name.
+    """
+    generator = random.Random(seed)
+    created = {'documents': [], 'versions': [], 'tags': []}  # type: Dict[str, List[int]]
+
+    tag_objects = [
+        app_models.DocumentTag(
+            title='{} {} tag {}'.format(SEED_PREFIX, seed, index), name='{}-{}-tag-{}'.format(SEED_PREFIX, seed, index),
+            created_user=user)
+        for index in range(tags)]
+    app_models.DocumentTag.objects.bulk_create(tag_objects, batch_size=batch_size)
+    created['tags'] = [tag.pk for tag in tag_objects]
+
+    tag_links = app_models.DocumentTag.documents.through
+    for start in range(0, count, batch_size):
+        with transaction.atomic():
+            documents = [
+                app_models.Document(
+                    title='{} {} document {}'.format(SEED_PREFIX, seed, index),
+                    description='Generated document {} for load testing.'.format(index), created_user=user)
+                for index in range(start, min(count, start + batch_size))]
+            app_models.Document.objects.bulk_create(documents)
+
+            version_objects = []
+            for document in documents:
+                for _ in range(versions):
+                    text = generate_corpus_text(max(256, int(size * generator.uniform(0.5, 1.5))),
+                                                seed=generator.getrandbits(32))
+                    version_objects.append(app_models.DocumentVersion(
+                        document=document, content_text_raw=text, content_hash=hash_text(text), created_user=user))
+            app_models.DocumentVersion.objects.bulk_create(version_objects)
+
+            if created['tags']:
+                tag_links.objects.bulk_create([
+                    tag_links(documenttag_id=tag_id, document_id=document.pk)
+                    for document in documents
+                    for tag_id in generator.sample(created['tags'], min(len(created['tags']), 3))])
+
+        version_ids = [version.pk for version in version_objects]
+        update_search_vectors(version_ids)
+        if render:
+            for version_id in version_ids:
+                render_document_version(version_id)
+
+        created['documents'].extend(document.pk for document in documents)
+        created['versions'].extend(version_ids)
+        if progress is not None:
+            progress('documents', len(created['documents']))
+
+    for model in (app_models.Document, app_models.DocumentVersion, app_models.DocumentTag):
+        get_model_cache().invalidate(model)
+    return created
+
+
+def delete_seeded(seed: Optional[int] = None) -> int:
+    """Delete the seeded documents and tags. Versions are deleted with their documents.
+    Returns the number of deleted documents."""
+    prefix = SEED_PREFIX if seed is None else '{} {} '.format(SEED_PREFIX, seed)
+    app_models.DocumentTag.objects.filter(title__startswith=prefix).delete()
+    deleted = app_models.Document.objects.filter(title__startswith=prefix).delete()[1].get(
+        app_models.Document._meta.label, 0)
+    for model in (app_models.Document, app_models.DocumentVersion, app_models.DocumentTag):
+        get_model_cache().invalidate(model)
+    return deleted
+
+
+class Scenario:
+    """A kind of request made by the load test clients.
+
+    A scenario either requests a url from the test client, or, when there is
+    no view for it, runs a function that queries the database directly.
+    """
+
+    def __init__(self, name: str, url: Optional[Callable[[random.Random], str]] = None,
+                 run: Optional[Callable[[random.Random], None]] = None, login: bool = False):
+        self.name = name
+        self.url = url
+        self.run = run
+        self.login = login
+
+    def __call__(self, client: Client, generator: random.Random) -> int:
+        if self.run is not None:
+            self.run(generator)
+            return 200
+        response = client.get(self.url(generator))
+        # read streamed content so the time includes sending the content
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+
+_SEARCH_WORDS = ['licence', 'terminate', 'indemnify', 'confidential', 'liability', 'warranty', 'personal data']
+
+
+def build_scenarios(document_ids: List[int], version_ids: Dict[int, List[int]]) -> Dict[str, Scenario]:
+    """Build the available scenarios for the seeded documents.
+
+    version_ids maps each document id to its version ids.
+    """
+
+    def document_url(name):
+        return lambda generator: reverse(name, args=[generator.choice(document_ids)])
+
+    def version_url(name):
+        def url(generator):
+            document_id = generator.choice(document_ids)
+            return reverse(name, args=[document_id, generator.choice(version_ids[document_id])])
+        return url
+
+    def search(generator):
+        query = SearchQuery(generator.choice(_SEARCH_WORDS), config='english')
+        list(app_models.DocumentVersion.objects.filter(content_text_norm=query).values_list('pk', flat=True)[:20])
+
+    def admin_search(model_name):
+        # the seeded titles are numbered, so searching for a number matches some of them
+        def url(generator):
+            return '{}?{}'.format(reverse('admin:unravel_{}_changelist'.format(model_name)),
+                                  urlencode({'q': generator.randint(0, 99)}))
+        return url
+
+    scenarios = [
+        Scenario('document_content', document_url('document_content')),
+        Scenario('document_formatted', document_url('document_formatted')),
+        Scenario('version_content', version_url('document_version_content')),
+        Scenario('version_formatted', version_url('document_version_formatted')),
+        Scenario('document_list', lambda generator: '{}?limit=100'.format(reverse('document_list'))),
+        Scenario('tag_list', lambda generator: '{}?limit=100&fields=title,documents'.format(reverse('tag_list'))),
+        Scenario('full_text_search', run=search),
+        Scenario('admin_documents', admin_search('document'), login=True),
+        Scenario('admin_versions', admin_search('documentversion'), login=True),
+        Scenario('admin_tags', admin_search('documenttag'), login=True),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+class LoadTest:
+    """Make requests from many concurrent clients and record the latency and database use of each.
+
+    Each client is a Django test Client in its own thread with its own
+    database connection, so requests go through the full middleware and
+    view stack without a web server.
+    """
+
+    def __init__(self, scenarios: Iterable[Scenario], clients: int = 8, requests: int = 1000,
+                 user=None, seed: int = 0):
+        self.scenarios = list(scenarios)
+        self.clients = clients
+        self.requests = requests
+        self.user = user
+        self.seed = seed
+
+    def run(self) -> List[Sample]:
+        counter = iter(range(self.requests))
+        lock = threading.Lock()
+
+        def next_request():
+            with lock:
+                return next(counter, None)
+
+        with ThreadPoolExecutor(max_workers=self.clients) as executor:
+            futures = [executor.submit(self._client, index, next_request) for index in range(self.clients)]
+            samples = []  # type: List[Sample]
+            for future in futures:
+                samples.extend(future.result())
+        return samples
+
+    def _client(self, index: int, next_request: Callable[[], Optional[int]]) -> List[Sample]:
+        generator = random.Random(self.seed * 1000 + index)
+        client = Client()
+        if self.user is not None and any(scenario.login for scenario in self.scenarios):
+            client.force_login(self.user)
+
+        samples = []
+        try:
+            while next_request() is not None:
+                scenario = generator.choice(self.scenarios)
+                timer = QueryTimer()
+                started = time.perf_counter()
+                try:
+                    with connection.execute_wrapper(timer):
+                        status = scenario(client, generator)
+                except Exception:
+                    status = None
+                elapsed = time.perf_counter() - started
+                samples.append(Sample(scenario.name, status, elapsed, timer.queries, timer.seconds))
+        finally:
+            connections.close_all()
+        return samples
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Get a percentile of a list of values, using the nearest rank."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(math.ceil(percent / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarise(samples: List[Sample], elapsed: float) -> Dict[str, dict]:
+    """Get the latency percentiles, and the mean queries and database time per request, for each scenario."""
+    by_scenario = {}  # type: Dict[str, List[Sample]]
+    for sample in samples:
+        by_scenario.setdefault(sample.scenario, []).append(sample)
+    by_scenario['all'] = samples
+
+    summary = {}
+    for name, items in sorted(by_scenario.items()):
+        latencies = [item.seconds * 1000 for item in items]
+        summary[name] = {
+            'requests': len(items),
+            'errors': sum(1 for item in items if item.status is None or item.status >= 400),
+            'requests_per_second': len(items) / elapsed if elapsed else None,
+            'p50_ms': percentile(latencies, 50),
+            'p90_ms': percentile(latencies, 90),
+            'p99_ms': percentile(latencies, 99),
+            'max_ms': max(latencies) if latencies else None,
+            'queries_mean': sum(item.queries for item in items) / len(items) if items else None,
+            'queries_max': max(item.queries for item in items) if items else None,
+            'db_ms_mean': sum(item.db_seconds for item in items) * 1000 / len(items) if items else None,
+        }
+    return summary
@@ -0,0 +1,140 @@
+import base64
+import json
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from django.utils.dateparse import parse_datetime
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# The column types that are stored differently in the archive json.
+DATETIME = 'datetime'
+BINARY = 'binary'
+
+
+def _encode(value, column_type: str):
+    if value is None:
+        return None
+    if column_type == BINARY:
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if column_type == DATETIME:
+        return value.isoformat()
+    return value
+
+
+def _decode(value, column_type: str):
+    if value is None:
+        return None
+    if column_type == BINARY:
+        return base64.b64decode(value)
+    if column_type == DATETIME:
+        return parse_datetime(value)
+    return value
+
+
+class SnapshotWriter:
+    """Write tables to a zip archive as chunks of columnar json.
+
+    Each chunk is a json object with a list of values for each column,
+    which compresses well and can be loaded one chunk at a time.
+    A chunk ends after chunk_rows rows or chunk_bytes bytes of values, whichever is first.
+    """
+
+    def __init__(self, file, chunk_rows: int = 5000, chunk_bytes: int = 8 * 1024 * 1024,
+                 metadata: Optional[dict] = None):
+        self.chunk_rows = chunk_rows
+        self.chunk_bytes = chunk_bytes
+        self._zip = zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._tables = {}  # type: Dict[str, dict]
+        # extra values for the manifest, e.g. the app version
+        self.metadata = dict(metadata or {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(write_manifest=exc_type is None)
+        return False
+
+    def write_table(self, name: str, columns: Sequence[str], types: Sequence[str], rows: Iterable[Sequence]) -> int:
+        """Write the rows of a table, and return the number of rows written."""
+        table = self._tables[name] = {'columns': list(columns), 'types': list(types), 'rows': 0, 'chunks': []}
+        chunk = [[] for _ in columns]  # type: List[List[Any]]
+        chunk_rows = chunk_bytes = 0
+
+        for row in rows:
+            for values, value, column_type in zip(chunk, row, types):
+                value = _encode(value, column_type)
+                values.append(value)
+                if isinstance(value, str):
+                    chunk_bytes += len(value)
+            chunk_rows += 1
+            if chunk_rows >= self.chunk_rows or chunk_bytes >= self.chunk_bytes:
+                self._write_chunk(name, table, chunk)
+                chunk = [[] for _ in columns]
+                chunk_rows = chunk_bytes = 0
+
+        if chunk_rows:
+            self._write_chunk(name, table, chunk)
+        return table['rows']
+
+    def close(self, write_manifest: bool = True) -> None:
+        if write_manifest:
+            manifest = dict(self.metadata, format_version=FORMAT_VERSION, tables=self._tables)
+            self._zip.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True))
+        self._zip.close()
+
+    def _write_chunk(self, name: str, table: dict, chunk: List[List[Any]]) -> None:
+        path = 'tables/{}/{:05d}.json'.format(name, len(table['chunks']))
+        self._zip.writestr(path, json.dumps(dict(zip(table['columns'], chunk)), separators=(',', ':')))
+        table['chunks'].append(path)
+        table['rows'] += len(chunk[0])
+
+
+class SnapshotReader:
+    """Read the tables written by SnapshotWriter, one chunk at a time."""
+
+    def __init__(self, file):
+        self._zip = zipfile.ZipFile(file, 'r')
+        try:
+            self.manifest = json.loads(self._zip.read(MANIFEST_NAME).decode('utf-8'))
+        except KeyError:
+            self._zip.close()
+            raise ValueError('The archive is not a snapshot, it has no manifest.')
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            self._zip.close()
+            raise ValueError('Unsupported snapshot format version {}.'.format(self.manifest.get('format_version')))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self.manifest['tables'])
+
+    def columns(self, name: str) -> List[str]:
+        return self.manifest['tables'][name]['columns']
+
+    def types(self, name: str) -> List[str]:
+        return self.manifest['tables'][name]['types']
+
+    def row_count(self, name: str) -> int:
+        return self.manifest['tables'][name]['rows']
+
+    def iter_chunks(self, name: str) -> Iterator[List[tuple]]:
+        """Get the rows of a table, as a list of row tuples for each chunk."""
+        table = self.manifest['tables'][name]
+        for path in table['chunks']:
+            chunk = json.loads(self._zip.read(path).decode('utf-8'))
+            columns = [
+                [_decode(value, column_type) for value in chunk[column]]
+                for column, column_type in zip(table['columns'], table['types'])]
+            yield list(zip(*columns))
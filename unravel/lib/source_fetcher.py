@@ -0,0 +1,155 @@
+import asyncio
+import socket
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from unravel.lib.content_hash import hash_text
+
+# A url to check, with the validators and content hash from the previous check.
+FetchTarget = namedtuple('FetchTarget', ['key', 'url', 'etag', 'last_modified', 'content_hash'])
+
+
+class FetchResult:
+    """The outcome of checking one url."""
+
+    def __init__(self, target: FetchTarget, status: Optional[int] = None, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, text: Optional[str] = None, error: Optional[str] = None):
+        self.target = target
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.text = text
+        self.error = error
+        self.content_hash = hash_text(text) if text is not None else target.content_hash
+
+        # True if the content was downloaded and is different to the previous content
+        self.changed = text is not None and self.content_hash != target.content_hash
+
+    def __repr__(self):
+        return 'FetchResult({!r}, status={}, changed={}, error={!r})'.format(
+            self.target.url, self.status, self.changed, self.error)
+
+
+class HostRateLimiter:
+    """Limit how often requests are started for each host.
+
+    A request waits for its host before it takes a slot from the semaphore
+    that bounds the requests in progress, so requests waiting for a busy host
+    do not hold slots that requests to other hosts could use.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._locks = {}  # type: Dict[str, asyncio.Lock]
+        self._next_allowed = {}  # type: Dict[str, float]
+
+    async def acquire(self, url: str, semaphore: asyncio.Semaphore) -> None:
+        """Wait until a request to the host of the url is allowed, then acquire the semaphore.
+        The caller must release the semaphore when the request has finished."""
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self._next_allowed.get(host, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await semaphore.acquire()
+            # the interval starts when the request starts, which can be later than allowed if all slots were in use
+            self._next_allowed[host] = time.monotonic() + self.interval
+
+
+class SourceFetcher:
+    """Check many urls for changes concurrently.
+
+    Requests are conditional, using the ETag and Last-Modified validators
+    from the previous check. When the server sends the content anyway,
+    the content hash is compared to the previous hash to decide whether
+    the content changed.
+
+    asyncio bounds the number of requests in progress and the request rate
+    for each host. Each request is made with urllib in a worker thread, so
+    there are no extra dependencies.
+    """
+
+    def __init__(self, concurrency: int = 20, host_interval: float = 1.0, timeout: float = 30,
+                 max_bytes: int = 20 * 1024 * 1024, user_agent: str = 'unravel-source-fetcher'):
+        self.concurrency = concurrency
+        self.host_interval = host_interval
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+
+    def run(self, targets: Iterable[FetchTarget], on_result: Optional[Callable[[FetchResult], None]] = None,
+            on_finish: Optional[Callable[[], None]] = None) -> List[FetchResult]:
+        """Check the targets and wait for all checks to finish.
+
+        on_result is called in a single separate thread as each check finishes,
+        so it can write to the database while other checks are in progress.
+        When on_result is given, the downloaded text is not kept in the returned results.
+        on_finish is called in the same thread after all checks, e.g. to close database connections.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.fetch_all(targets, on_result, on_finish))
+        finally:
+            loop.close()
+
+    async def fetch_all(self, targets: Iterable[FetchTarget],
+                        on_result: Optional[Callable[[FetchResult], None]] = None,
+                        on_finish: Optional[Callable[[], None]] = None) -> List[FetchResult]:
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rate_limiter = HostRateLimiter(self.host_interval)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as request_executor, \
+                ThreadPoolExecutor(max_workers=1) as result_executor:
+
+            async def check(target: FetchTarget) -> FetchResult:
+                await rate_limiter.acquire(target.url, semaphore)
+                try:
+                    result = await loop.run_in_executor(request_executor, self.fetch, target)
+                finally:
+                    semaphore.release()
+                if on_result is not None:
+                    await loop.run_in_executor(result_executor, on_result, result)
+                    result.text = None
+                return result
+
+            try:
+                return list(await asyncio.gather(*[check(target) for target in targets]))
+            finally:
+                if on_finish is not None:
+                    await loop.run_in_executor(result_executor, on_finish)
+
+    def fetch(self, target: FetchTarget) -> FetchResult:
+        """Make a conditional request for one target."""
+        headers = {'User-Agent': self.user_agent, 'Accept-Encoding': 'identity'}
+        if target.etag:
+            headers['If-None-Match'] = target.etag
+        if target.last_modified:
+            headers['If-Modified-Since'] = target.last_modified
+        request = urllib.request.Request(target.url, headers=headers)
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read(self.max_bytes + 1)
+                if len(body) > self.max_bytes:
+                    return FetchResult(target, status=response.status, error='Content is larger than the limit.')
+                text = body.decode(response.headers.get_content_charset() or 'utf-8', errors='replace')
+                return FetchResult(
+                    target, status=response.status, etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'), text=text)
+
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return FetchResult(
+                    target, status=304, etag=e.headers.get('ETag') or target.etag,
+                    last_modified=e.headers.get('Last-Modified') or target.last_modified)
+            return FetchResult(target, status=e.code, error=str(e))
+
+        except (urllib.error.URLError, socket.timeout, OSError, LookupError) as e:
+            return FetchResult(target, error=str(e))
@@ -0,0 +1,214 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations, islice
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from django.utils.module_loading import import_string
+
+from unravel.lib.text_analysis.readability_benchmark import ANALYSERS, FORMULAS, HEATMAP_ANALYSER
+from unravel.lib.text_analysis.sentence_heatmap import SentenceHeatmap
+
+# The sentence heatmap score for each readability formula class it calculates.
+HEATMAP_FORMULAS = {
+    'AutomatedReadabilityIndex': 'automated_readability_index',
+    'ColemanLiauIndex': 'coleman_liau_index',
+    'FleschKincaidGradeLevel': 'flesch_kincaid_grade_level',
+    'FleschReadingEase': 'flesch_reading_ease',
+    'GunningFogIndex': 'gunning_fog_index',
+}
+
+# The analyser and formulas created in this process, by name. Each worker process loads them once.
+_analysers = {}  # type: Dict[str, Tuple[object, float]]
+_formulas = {}  # type: Dict[Tuple[str, str], object]
+
+
+def _get_analyser(name: str) -> Tuple[object, float]:
+    """Get the analyser and the seconds it took to load, creating it the first time in this process."""
+    if name not in _analysers:
+        started = time.perf_counter()
+        analyser = None if name == HEATMAP_ANALYSER else import_string(ANALYSERS.get(name, name))()
+        _analysers[name] = (analyser, time.perf_counter() - started)
+    return _analysers[name]
+
+
+def _get_formula(analyser_name: str, analyser, path: str):
+    key = (analyser_name, path)
+    if key not in _formulas:
+        _formulas[key] = import_string(path)(logging.getLogger(__name__), analyser)
+    return _formulas[key]
+
+
+def score_texts(analyser_name: str, formula_paths: List[str],
+                texts: List[Tuple[Hashable, str]]) -> Tuple[Dict[Hashable, Dict[str, Optional[float]]], float, float]:
+    """Calculate the readability level of each text using each formula with one analyser.
+
+    This runs in a worker process. Returns the levels by text key and formula
+    class name, the analyser load seconds, and the seconds spent scoring.
+    A formula that fails for a text has a level of None.
+    """
+    analyser, load_seconds = _get_analyser(analyser_name)
+    started = time.perf_counter()
+    levels = {}
+    for key, text in texts:
+        if analyser_name == HEATMAP_ANALYSER:
+            summary = SentenceHeatmap.from_text(text).summary()
+            levels[key] = {
+                name: summary[HEATMAP_FORMULAS[name]]
+                for name in (path.rsplit('.', 1)[-1] for path in formula_paths) if name in HEATMAP_FORMULAS}
+            continue
+
+        text_levels = levels[key] = {}
+        for path in formula_paths:
+            try:
+                text_levels[path.rsplit('.', 1)[-1]] = _get_formula(analyser_name, analyser, path).calc(text).level
+            except Exception:
+                text_levels[path.rsplit('.', 1)[-1]] = None
+    return levels, load_seconds, time.perf_counter() - started
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    return ordered[min(len(ordered) - 1, int(percent / 100.0 * len(ordered)))]
+
+
+class ComparisonReport:
+    """The readability levels from each analyser side by side, with how much each pair of analysers disagree."""
+
+    def __init__(self, analysers: List[str], formulas: List[str], threshold: float):
+        self.analysers = analysers
+        self.formulas = formulas
+        self.threshold = threshold
+        # text key -> formula class name -> analyser name -> level
+        self.scores = {}  # type: Dict[Hashable, Dict[str, Dict[str, Optional[float]]]]
+        self.errors = {}  # type: Dict[str, str]
+        self.load_seconds = {}  # type: Dict[str, float]
+        self.analyser_seconds = {name: 0.0 for name in analysers}  # type: Dict[str, float]
+        self.wall_seconds = 0.0
+
+    def add(self, analyser: str, levels: Dict[Hashable, Dict[str, Optional[float]]]) -> None:
+        for key, formula_levels in levels.items():
+            text_scores = self.scores.setdefault(key, {})
+            for formula, level in formula_levels.items():
+                text_scores.setdefault(formula, {})[analyser] = level
+
+    def _pairs(self) -> Iterable[Tuple[str, str]]:
+        return combinations([name for name in self.analysers if name not in self.errors], 2)
+
+    def divergence(self) -> List[dict]:
+        """Get statistics of the difference in level between each pair of analysers, for each formula."""
+        rows = []
+        for formula in self.formulas:
+            for first, second in self._pairs():
+                differences = []
+                for text_scores in self.scores.values():
+                    levels = text_scores.get(formula, {})
+                    if levels.get(first) is not None and levels.get(second) is not None:
+                        differences.append(levels[first] - levels[second])
+                if not differences:
+                    continue
+                absolute = sorted(abs(difference) for difference in differences)
+                rows.append({
+                    'formula': formula,
+                    'analysers': [first, second],
+                    'texts': len(differences),
+                    'mean_difference': sum(differences) / len(differences),
+                    'mean_absolute_difference': sum(absolute) / len(absolute),
+                    'median_absolute_difference': _percentile(absolute, 50),
+                    'p90_absolute_difference': _percentile(absolute, 90),
+                    'max_absolute_difference': absolute[-1],
+                    'over_threshold': sum(1 for value in absolute if value > self.threshold),
+                })
+        return rows
+
+    def flagged(self) -> List[dict]:
+        """Get the texts where a pair of analysers disagree on a formula by more than the threshold,
+        most divergent first."""
+        flagged = []
+        for key, text_scores in self.scores.items():
+            formulas = {}
+            worst = 0.0
+            for formula, levels in text_scores.items():
+                values = [level for level in levels.values() if level is not None]
+                difference = max(values) - min(values) if len(values) > 1 else 0.0
+                if difference > self.threshold:
+                    formulas[formula] = levels
+                    worst = max(worst, difference)
+            if formulas:
+                flagged.append({'key': key, 'max_difference': worst, 'formulas': formulas})
+        return sorted(flagged, key=lambda item: -item['max_difference'])
+
+    def to_dict(self) -> dict:
+        return {
+            'analysers': self.analysers,
+            'formulas': self.formulas,
+            'threshold': self.threshold,
+            'errors': self.errors,
+            'load_seconds': self.load_seconds,
+            'analyser_seconds': self.analyser_seconds,
+            'wall_seconds': self.wall_seconds,
+            'texts': len(self.scores),
+            'scores': {str(key): text_scores for key, text_scores in self.scores.items()},
+            'divergence': self.divergence(),
+            'flagged': self.flagged(),
+        }
+
+
+class AnalyserComparison:
+    """Score the same texts with several text analysers at the same time.
+
+    Each analyser has its own pool of worker processes, as the analysers are
+    CPU bound Python code that would hold the GIL in threads. Each worker
+    process loads its analyser once. The texts are sent in chunks to every
+    analyser's pool, so the wall clock time is about the time of the slowest
+    analyser. Only a few chunks are pending at a time, so the texts can be a
+    generator over a large number of documents.
+    """
+
+    def __init__(self, analysers: Iterable[str], formulas: Iterable[str] = None, workers: int = 1,
+                 chunk_size: int = 10, threshold: float = 1.0):
+        self.analysers = list(analysers)
+        formulas = set(formulas or [])
+        self.formula_paths = [path for path in FORMULAS if not formulas or
+                              path in formulas or path.rsplit('.', 1)[-1] in formulas]
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+
+    def run(self, texts: Iterable[Tuple[Hashable, str]]) -> ComparisonReport:
+        report = ComparisonReport(
+            self.analysers, [path.rsplit('.', 1)[-1] for path in self.formula_paths], self.threshold)
+        started = time.perf_counter()
+        pools = {name: ProcessPoolExecutor(max_workers=self.workers) for name in self.analysers}
+        try:
+            texts = iter(texts)
+            pending = {}
+            max_pending = 2 * self.workers * len(self.analysers)
+            while True:
+                while len(pending) < max_pending:
+                    chunk = list(islice(texts, self.chunk_size))
+                    if not chunk:
+                        break
+                    for name, pool in pools.items():
+                        if name not in report.errors:
+                            pending[pool.submit(score_texts, name, self.formula_paths, chunk)] = name
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._add_result(report, pending.pop(future), future)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+        report.wall_seconds = time.perf_counter() - started
+        return report
+
+    def _add_result(self, report: ComparisonReport, name: str, future) -> None:
+        try:
+            levels, load_seconds, seconds = future.result()
+        except Exception as e:
+            # an analyser that cannot be loaded fails every chunk, so only the first error is kept
+            report.errors.setdefault(name, str(e))
+            return
+        report.add(name, levels)
+        report.load_seconds[name] = max(report.load_seconds.get(name, 0.0), load_seconds)
+        report.analyser_seconds[name] += seconds
@@ -0,0 +1,252 @@
+import hashlib
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n\s*')
+_WHITESPACE = re.compile(r'\s+')
+
+_HEADER = struct.Struct('<4sI')
+_MAGIC = b'UCF1'
+
+# The number of paragraphs the diff can examine, as a multiple of the number of paragraphs in both versions,
+# before the remaining regions are matched greedily.
+_DIFF_WORK_FACTOR = 32
+# The largest region without unique paragraphs, in old paragraphs times new paragraphs,
+# that is matched exactly using the longest common subsequence instead of greedily.
+_LCS_MAX_CELLS = 40000
+
+
+def split_paragraphs(text: str) -> List[Tuple[int, int]]:
+    """Find the (start, end) character offsets of the blank line separated paragraphs in a text."""
+    spans = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        if match.start() > start:
+            spans.append((start, match.start()))
+        start = match.end()
+    if len(text) > start:
+        spans.append((start, len(text)))
+    return [(start, end) for start, end in spans if text[start:end].strip()]
+
+
+def _unique_anchors(old: Sequence[int], old_start: int, old_end: int,
+                    new: Sequence[int], new_start: int, new_end: int) -> List[Tuple[int, int]]:
+    """Find the longest in-order run of hashes that appear exactly once in both regions,
+    as (old index, new index) pairs, using patience sorting."""
+    counts = {}  # type: Dict[int, List[int]]
+    for index in range(old_start, old_end):
+        counts.setdefault(old[index], [0, 0, index])[0] += 1
+    for index in range(new_start, new_end):
+        entry = counts.get(new[index])
+        if entry is not None:
+            entry[1] += 1
+            entry.append(index)
+    pairs = sorted((entry[2], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[1] == 1)
+
+    # longest increasing subsequence of the new indexes
+    tails = []  # type: List[int]
+    tail_pairs = []  # type: List[int]
+    previous = [-1] * len(pairs)
+    for position, (_, new_index) in enumerate(pairs):
+        pile = bisect_left(tails, new_index)
+        if pile == len(tails):
+            tails.append(new_index)
+            tail_pairs.append(position)
+        else:
+            tails[pile] = new_index
+            tail_pairs[pile] = position
+        previous[position] = tail_pairs[pile - 1] if pile else -1
+
+    anchors = []
+    position = tail_pairs[-1] if tail_pairs else -1
+    while position >= 0:
+        anchors.append(pairs[position])
+        position = previous[position]
+    anchors.reverse()
+    return anchors
+
+
+def _lcs_matches(old: Sequence[int], old_start: int, old_end: int,
+                 new: Sequence[int], new_start: int, new_end: int) -> List[Tuple[int, int]]:
+    """Match the longest common subsequence of two small regions using dynamic programming."""
+    rows, columns = old_end - old_start, new_end - new_start
+    # lengths[i][j] is the length of the longest common subsequence of old[i:] and new[j:] within the regions
+    lengths = [[0] * (columns + 1) for _ in range(rows + 1)]
+    for i in range(rows - 1, -1, -1):
+        row, below = lengths[i], lengths[i + 1]
+        value = old[old_start + i]
+        for j in range(columns - 1, -1, -1):
+            if value == new[new_start + j]:
+                row[j] = below[j + 1] + 1
+            else:
+                row[j] = max(below[j], row[j + 1])
+
+    matches = []
+    i = j = 0
+    while i < rows and j < columns:
+        if old[old_start + i] == new[new_start + j]:
+            matches.append((old_start + i, new_start + j))
+            i += 1
+            j += 1
+        elif lengths[i + 1][j] >= lengths[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+    return matches
+
+
+def _greedy_matches(old: Sequence[int], old_start: int, old_end: int,
+                    new: Sequence[int], new_start: int, new_end: int) -> List[Tuple[int, int]]:
+    """Match each old hash in order to its next occurrence in the new region.
+    This is not the longest match, but it takes O(n log n) time for any number of repeated hashes."""
+    positions = {}  # type: Dict[int, List[int]]
+    for index in range(new_start, new_end):
+        positions.setdefault(new[index], []).append(index)
+
+    matches = []
+    last = new_start - 1
+    for index in range(old_start, old_end):
+        candidates = positions.get(old[index])
+        if not candidates:
+            continue
+        found = bisect_right(candidates, last)
+        if found < len(candidates):
+            last = candidates[found]
+            matches.append((index, last))
+    return matches
+
+
+def match_paragraphs(old: Sequence[int], new: Sequence[int]) -> List[Tuple[int, int]]:
+    """Find the paragraphs that are unchanged between two sequences of paragraph hashes,
+    as (old index, new index) pairs in increasing order.
+
+    This is a patience diff. The common start and end are matched, then the
+    hashes that appear once in both versions are matched in order, and the
+    regions between them are matched the same way. Small regions without
+    unique hashes are matched exactly. Large regions without unique hashes,
+    e.g. many repeated "(a)" paragraphs, are matched greedily, so the time is
+    bounded for any text.
+    """
+    matches = []
+    work = _DIFF_WORK_FACTOR * (len(old) + len(new))
+    regions = [(0, len(old), 0, len(new))]
+    while regions:
+        old_start, old_end, new_start, new_end = regions.pop()
+        while old_start < old_end and new_start < new_end and old[old_start] == new[new_start]:
+            matches.append((old_start, new_start))
+            old_start += 1
+            new_start += 1
+        while old_start < old_end and new_start < new_end and old[old_end - 1] == new[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+            matches.append((old_end, new_end))
+        if old_start == old_end or new_start == new_end:
+            continue
+
+        work -= (old_end - old_start) + (new_end - new_start)
+        anchors = _unique_anchors(old, old_start, old_end, new, new_start, new_end) if work > 0 else []
+        if not anchors:
+            if (old_end - old_start) * (new_end - new_start) <= _LCS_MAX_CELLS:
+                matches.extend(_lcs_matches(old, old_start, old_end, new, new_start, new_end))
+            else:
+                matches.extend(_greedy_matches(old, old_start, old_end, new, new_start, new_end))
+            continue
+
+        for old_index, new_index in anchors:
+            matches.append((old_index, new_index))
+            regions.append((old_start, old_index, new_start, new_index))
+            old_start, new_start = old_index + 1, new_index + 1
+        regions.append((old_start, old_end, new_start, new_end))
+
+    matches.sort()
+    return matches
+
+
+class ChangeFingerprint:
+    """A hash and length for each paragraph of a text.
+
+    Whitespace is normalised before hashing, so re-wrapping or re-indenting
+    a paragraph does not change its hash. Two fingerprints can be compared
+    without the text of either version.
+    """
+
+    def __init__(self, hashes: array = None, lengths: array = None):
+        self.hashes = hashes if hashes is not None else array('Q')
+        self.lengths = lengths if lengths is not None else array('I')
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'ChangeFingerprint':
+        fingerprint = cls()
+        for start, end in split_paragraphs(text or ''):
+            normalised = _WHITESPACE.sub(' ', text[start:end].strip())
+            digest = hashlib.md5(normalised.encode('utf-8')).digest()[:8]
+            fingerprint.hashes.append(int.from_bytes(digest, 'little'))
+            fingerprint.lengths.append(len(normalised))
+        return fingerprint
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ChangeFingerprint':
+        data = memoryview(data)
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError('Unrecognised change fingerprint format.')
+        hashes, lengths = array('Q'), array('I')
+        offset = _HEADER.size
+        hashes.frombytes(data[offset:offset + count * hashes.itemsize])
+        offset += count * hashes.itemsize
+        lengths.frombytes(data[offset:offset + count * lengths.itemsize])
+        if sys.byteorder != 'little':
+            hashes.byteswap()
+            lengths.byteswap()
+        return cls(hashes, lengths)
+
+    def to_bytes(self) -> bytes:
+        hashes, lengths = self.hashes, self.lengths
+        if sys.byteorder != 'little':
+            hashes, lengths = array('Q', hashes), array('I', lengths)
+            hashes.byteswap()
+            lengths.byteswap()
+        return _HEADER.pack(_MAGIC, len(self)) + hashes.tobytes() + lengths.tobytes()
+
+    def compare(self, previous: 'ChangeFingerprint') -> 'ChangeSummary':
+        """Compare this fingerprint to the fingerprint of a previous version."""
+        matches = match_paragraphs(previous.hashes, self.hashes)
+        matched = sum(self.lengths[new_index] for _, new_index in matches)
+        matched_old = set(old_index for old_index, _ in matches)
+        matched_new = set(new_index for _, new_index in matches)
+        added = [index for index in range(len(self)) if index not in matched_new]
+        removed = [index for index in range(len(previous)) if index not in matched_old]
+
+        total = sum(previous.lengths) + sum(self.lengths)
+        ratio = 1.0 - 2.0 * matched / total if total else 0.0
+        return ChangeSummary(ratio, added, removed)
+
+
+class ChangeSummary:
+    """How much a text changed compared to a previous version.
+
+    The ratio is 0 when all paragraphs are unchanged and 1 when none are
+    unchanged, weighted by paragraph length. The added paragraphs are the
+    indexes of new or changed paragraphs in the new version, and the removed
+    paragraphs are the indexes of removed or changed paragraphs in the previous version.
+    """
+
+    def __init__(self, ratio: float, added_paragraphs: List[int], removed_paragraphs: List[int]):
+        self.ratio = max(0.0, min(1.0, ratio))
+        self.added_paragraphs = added_paragraphs
+        self.removed_paragraphs = removed_paragraphs
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added_paragraphs or self.removed_paragraphs)
+
+    def __repr__(self):
+        return 'ChangeSummary(ratio={:.3f}, added={}, removed={})'.format(
+            self.ratio, len(self.added_paragraphs), len(self.removed_paragraphs))
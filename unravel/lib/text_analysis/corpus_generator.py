@@ -0,0 +1,118 @@
+import random
+import re
+from typing import List
+
+# Parts of EULA and terms of service clauses. Sentences are built by choosing one option from each part.
+_SUBJECTS = [
+    'The Licensee', 'You', 'The Licensor', 'We', 'The Company', 'Either party', 'The Customer',
+    'Any third party provider', 'The End User', 'Each Authorised User',
+]
+_MODALS = [
+    'must not', 'shall', 'may', 'shall not', 'agrees to', 'is entitled to', 'acknowledges that it will',
+    'undertakes to', 'is not permitted to', 'reserves the right to',
+]
+_ACTIONS = [
+    'copy, modify, translate, or create derivative works of the Software',
+    'disclose Confidential Information to any person',
+    'terminate this Agreement by giving written notice',
+    'sublicense, rent, lease, or lend the Software',
+    'use the Services in compliance with all applicable laws and regulations',
+    'indemnify and hold harmless the Licensor and its affiliates',
+    'collect, store, and process Personal Data',
+    'suspend access to the Services without liability',
+    'reverse engineer, decompile, or disassemble any part of the Software',
+    'pay all Fees in accordance with the applicable Order Form',
+    'assign or transfer any rights or obligations under this Agreement',
+    'update the Documentation from time to time',
+]
+_CONDITIONS = [
+    'except as expressly permitted by this Agreement',
+    'to the maximum extent permitted by applicable law',
+    'unless otherwise agreed in writing by both parties',
+    'within thirty (30) days of the date of the invoice',
+    'notwithstanding any other provision of this Agreement',
+    'subject to the limitations set out in clause {clause}',
+    'provided that such use does not infringe the intellectual property rights of any third party',
+    'for the duration of the Subscription Term',
+    'in accordance with the Privacy Policy as amended from time to time',
+    'whether in contract, tort (including negligence), or otherwise',
+]
+_HEADINGS = [
+    'Definitions and Interpretation', 'Grant of Licence', 'Restrictions', 'Fees and Payment',
+    'Intellectual Property', 'Confidentiality', 'Data Protection', 'Warranties', 'Limitation of Liability',
+    'Indemnity', 'Term and Termination', 'Governing Law', 'General',
+]
+_DEFINITIONS = [
+    'Agreement', 'Software', 'Services', 'Documentation', 'Fees', 'Confidential Information', 'Personal Data',
+    'Subscription Term', 'Order Form', 'Intellectual Property Rights',
+]
+
+_SIZE_UNITS = {'K': 1024, 'M': 1024 * 1024}
+
+
+def parse_size(value: str) -> int:
+    """Parse a text size in bytes, with an optional K or M suffix, e.g. '20K'."""
+    value = value.strip().upper()
+    try:
+        return int(value.rstrip('KM')) * _SIZE_UNITS.get(value[-1:], 1)
+    except ValueError:
+        raise ValueError('Invalid size "{}".'.format(value))
+
+
+def generate_corpus_text(size: int, seed: int = 0) -> str:
+    """Generate an EULA-like text of about size bytes of UTF-8.
+
+    The same size and seed always give the same text, so benchmark results
+    can be compared between runs. The text has numbered clause headings,
+    a definitions section, short and long sentences, abbreviations, and
+    capitalised defined terms, to exercise sentence and word tokenisation
+    the way real agreements do.
+    """
+    generator = random.Random(seed)
+    paragraphs = []  # type: List[str]
+    length = 0
+    clause = 0
+
+    while length < size:
+        clause += 1
+        heading = '{}. {}'.format(clause, _HEADINGS[(clause - 1) % len(_HEADINGS)].upper())
+        paragraphs.append(heading)
+        length += len(heading) + 2
+
+        for sub_clause in range(1, generator.randint(2, 6)):
+            if clause == 1:
+                term = generator.choice(_DEFINITIONS)
+                sentences = ['"{}" means the {} described in the Order Form, as amended from time to time.'.format(
+                    term, term.lower())]
+            else:
+                sentences = [_sentence(generator, clause) for _ in range(generator.randint(1, 5))]
+            paragraph = '{}.{} {}'.format(clause, sub_clause, ' '.join(sentences))
+            paragraphs.append(paragraph)
+            length += len(paragraph) + 2
+
+    text = '\n\n'.join(paragraphs)
+    return _truncate(text, size)
+
+
+def _sentence(generator: random.Random, clause: int) -> str:
+    parts = [generator.choice(_SUBJECTS), generator.choice(_MODALS), generator.choice(_ACTIONS)]
+    for _ in range(generator.choice((0, 1, 1, 2, 3))):
+        parts.append(generator.choice(_CONDITIONS).format(clause=generator.randint(1, max(1, clause))))
+    sentence = ' '.join(parts)
+    if generator.random() < 0.2:
+        sentence += ', e.g. as described in the Documentation'
+    return sentence + '.'
+
+
+def _truncate(text: str, size: int) -> str:
+    """Cut the text at the last sentence end before size bytes of UTF-8."""
+    if len(text.encode('utf-8')) <= size:
+        return text
+    text = text.encode('utf-8')[:size].decode('utf-8', errors='ignore')
+    end = text.rfind('.')
+    return text[:end + 1] if end > 0 else text
+
+
+def count_words(text: str) -> int:
+    """Count the words in a text, so throughput is measured the same way for every analyser."""
+    return len(re.findall(r"[^\W_]+(?:['’][^\W_]+)*", text))
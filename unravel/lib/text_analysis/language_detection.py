@@ -0,0 +1,98 @@
+import math
+import re
+from collections import Counter
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional
+
+from unravel.lib.instrumentation import timed
+from unravel.lib.text_analysis.language_profiles import SAMPLE_TEXTS
+
+# The language used when the text is too short or no language is a clear match.
+UNKNOWN_LANGUAGE = 'simple'
+
+_LETTERS = re.compile(r'[^\W\d_]+')
+
+
+def _normalise(text: str) -> str:
+    """Lower case the letters in the text, with each word separated by a single space."""
+    return ' {} '.format(' '.join(_LETTERS.findall(text.lower())))
+
+
+def _trigrams(text: str) -> List[str]:
+    return [text[index:index + 3] for index in range(len(text) - 2)]
+
+
+class LanguageDetector:
+    """Detect the language of a text using character trigram profiles.
+
+    Each language profile is the smoothed log probability of each trigram
+    in a sample text. A text is scored against every profile using a
+    sample of the text, and the most probable language is chosen.
+    This runs offline, needs no dependencies, and takes well under a
+    millisecond for a typical sample.
+    """
+
+    def __init__(self, sample_texts: Optional[Dict[str, str]] = None, sample_size: int = 1000,
+                 min_letters: int = 20, min_margin: float = 0.05):
+        self.sample_size = sample_size
+        self.min_letters = min_letters
+        self.min_margin = min_margin
+        self._profiles = {}  # type: Dict[str, Dict[str, float]]
+        self._unseen = {}  # type: Dict[str, float]
+
+        for language, text in (sample_texts or SAMPLE_TEXTS).items():
+            counts = Counter(_trigrams(_normalise(text)))
+            total = sum(counts.values())
+            # add-one smoothing over the trigrams in the sample plus one for all unseen trigrams
+            denominator = math.log(total + len(counts) + 1)
+            self._profiles[language] = {gram: math.log(count + 1) - denominator for gram, count in counts.items()}
+            self._unseen[language] = -denominator
+
+    @property
+    def languages(self) -> List[str]:
+        return sorted(self._profiles)
+
+    def detect(self, text: str) -> str:
+        """Get the language of a text, or UNKNOWN_LANGUAGE if the language could not be determined."""
+        grams = _trigrams(_normalise(self._sample(text or '')))
+        if len(grams) < self.min_letters:
+            return UNKNOWN_LANGUAGE
+
+        best_language = UNKNOWN_LANGUAGE
+        best_score = second_score = -math.inf
+        for language, profile in self._profiles.items():
+            score = sum(map(profile.get, grams, repeat(self._unseen[language])))
+            if score > best_score:
+                best_language, best_score, second_score = language, score, best_score
+            elif score > second_score:
+                second_score = score
+
+        # the average log probability per trigram of the best language must be clearly better than the next
+        if second_score > -math.inf and (best_score - second_score) / len(grams) < self.min_margin:
+            return UNKNOWN_LANGUAGE
+        return best_language
+
+    def detect_many(self, texts: Iterable[str]) -> List[str]:
+        """Get the language of each text."""
+        return [self.detect(text) for text in texts]
+
+    def _sample(self, text: str) -> str:
+        """Take evenly spaced windows from the text, as the start of a document is often a title or headings."""
+        if len(text) <= self.sample_size:
+            return text
+        windows = 4
+        window_size = self.sample_size // windows
+        step = (len(text) - window_size) // (windows - 1)
+        return ' '.join(text[index * step:index * step + window_size] for index in range(windows))
+
+
+_detector = None
+
+
+def get_language_detector() -> LanguageDetector:
+    """Get a shared language detector, so the profiles are only built once per process."""
+    global _detector
+    if _detector is None:
+        with timed('unravel_analyser_load_seconds', 'Time to load a text analyser.', analyser='language_detector'):
+            _detector = LanguageDetector()
+    return _detector
@@ -0,0 +1,185 @@
+# Sample texts used to build the character n-gram profile for each language.
+# The keys are the PostgreSQL text search configurations used by DocumentVersion.content_language.
+# Each sample is typical of the terms of service, licence, and privacy policy text that is analysed.
+
+SAMPLE_TEXTS = {
+    'english': (
+        "All human beings are born free and equal in dignity and rights. They are endowed with reason and "
+        "conscience and should act towards one another in a spirit of brotherhood. "
+        "These terms of service govern your use of the software and the website. By accessing or using the "
+        "service you agree to be bound by these terms. If you do not agree with any part of the terms, you may "
+        "not use the service. We may change these terms at any time, and the changes will take effect when they "
+        "are published. We collect personal information that you provide to us when you register for an account, "
+        "and we use that information to provide and improve the service. We will not sell your personal data to "
+        "third parties without your consent. The licensor grants you a limited, non-exclusive, non-transferable "
+        "licence to install and use the software. You must not copy, modify, or distribute the software except "
+        "as expressly permitted by this agreement. This agreement is governed by the laws of the state where the "
+        "company has its principal place of business. Any dispute arising out of or in connection with this "
+        "agreement shall be resolved by the courts of that jurisdiction."),
+    'danish': (
+        "Alle mennesker er født frie og lige i værdighed og rettigheder. De er udstyret med fornuft og "
+        "samvittighed, og de bør handle mod hverandre i en broderskabets ånd. "
+        "Disse vilkår gælder for din brug af softwaren og hjemmesiden. Ved at bruge tjenesten accepterer du at "
+        "være bundet af disse vilkår. Hvis du ikke accepterer vilkårene, må du ikke bruge tjenesten. Vi kan til "
+        "enhver tid ændre vilkårene, og ændringerne træder i kraft, når de offentliggøres. Vi indsamler "
+        "personoplysninger, som du giver os, når du opretter en konto, og vi bruger oplysningerne til at levere "
+        "og forbedre tjenesten. Vi sælger ikke dine personoplysninger til tredjemand uden dit samtykke. "
+        "Licensgiveren giver dig en begrænset og ikke-eksklusiv ret til at installere og bruge softwaren. Du må "
+        "ikke kopiere, ændre eller distribuere softwaren, medmindre det udtrykkeligt er tilladt i denne aftale. "
+        "Aftalen er underlagt dansk ret, og enhver tvist skal afgøres af de danske domstole. Selskabets "
+        "ansvar er begrænset til det beløb, som du har betalt for tjenesten."),
+    'dutch': (
+        "Alle mensen worden vrij en gelijk in waardigheid en rechten geboren. Zij zijn begiftigd met verstand en "
+        "geweten, en behoren zich jegens elkander in een geest van broederschap te gedragen. "
+        "Deze gebruiksvoorwaarden zijn van toepassing op uw gebruik van de software en de website. Door de dienst "
+        "te gebruiken gaat u akkoord met deze voorwaarden. Als u niet akkoord gaat met de voorwaarden, mag u de "
+        "dienst niet gebruiken. Wij kunnen deze voorwaarden op elk moment wijzigen, en de wijzigingen worden van "
+        "kracht zodra zij zijn gepubliceerd. Wij verzamelen persoonsgegevens die u ons verstrekt wanneer u een "
+        "account aanmaakt, en wij gebruiken deze gegevens om de dienst te leveren en te verbeteren. Wij verkopen "
+        "uw persoonsgegevens niet aan derden zonder uw toestemming. De licentiegever verleent u een beperkte, "
+        "niet-exclusieve licentie om de software te installeren en te gebruiken. U mag de software niet kopiëren, "
+        "wijzigen of verspreiden, tenzij dit uitdrukkelijk is toegestaan in deze overeenkomst. Op deze "
+        "overeenkomst is het Nederlands recht van toepassing."),
+    'finnish': (
+        "Kaikki ihmiset syntyvät vapaina ja tasavertaisina arvoltaan ja oikeuksiltaan. Heille on annettu järki "
+        "ja omatunto, ja heidän on toimittava toisiaan kohtaan veljeyden hengessä. "
+        "Näitä käyttöehtoja sovelletaan ohjelmiston ja verkkosivuston käyttöön. Käyttämällä palvelua hyväksyt "
+        "nämä ehdot. Jos et hyväksy ehtoja, et saa käyttää palvelua. Voimme muuttaa näitä ehtoja milloin tahansa, "
+        "ja muutokset tulevat voimaan, kun ne on julkaistu. Keräämme henkilötietoja, jotka annat meille, kun "
+        "rekisteröidyt käyttäjäksi, ja käytämme tietoja palvelun tarjoamiseen ja kehittämiseen. Emme myy "
+        "henkilötietojasi kolmansille osapuolille ilman suostumustasi. Lisenssinantaja myöntää sinulle "
+        "rajoitetun ja ei-yksinomaisen oikeuden asentaa ja käyttää ohjelmistoa. Et saa kopioida, muokata tai "
+        "levittää ohjelmistoa, ellei tässä sopimuksessa nimenomaisesti sallita sitä. Tähän sopimukseen "
+        "sovelletaan Suomen lakia, ja riidat ratkaistaan käräjäoikeudessa."),
+    'french': (
+        "Tous les êtres humains naissent libres et égaux en dignité et en droits. Ils sont doués de raison et de "
+        "conscience et doivent agir les uns envers les autres dans un esprit de fraternité. "
+        "Les présentes conditions d'utilisation régissent votre utilisation du logiciel et du site web. En "
+        "accédant au service ou en l'utilisant, vous acceptez d'être lié par ces conditions. Si vous n'acceptez "
+        "pas les conditions, vous ne devez pas utiliser le service. Nous pouvons modifier ces conditions à tout "
+        "moment, et les modifications prennent effet dès leur publication. Nous collectons les données "
+        "personnelles que vous nous fournissez lors de la création d'un compte, et nous utilisons ces données "
+        "pour fournir et améliorer le service. Nous ne vendons pas vos données personnelles à des tiers sans "
+        "votre consentement. Le concédant vous accorde une licence limitée et non exclusive pour installer et "
+        "utiliser le logiciel. Vous ne pouvez pas copier, modifier ou distribuer le logiciel, sauf dans la mesure "
+        "expressément autorisée par le présent contrat, qui est régi par le droit français."),
+    'german': (
+        "Alle Menschen sind frei und gleich an Würde und Rechten geboren. Sie sind mit Vernunft und Gewissen "
+        "begabt und sollen einander im Geist der Brüderlichkeit begegnen. "
+        "Diese Nutzungsbedingungen gelten für Ihre Nutzung der Software und der Webseite. Durch die Nutzung des "
+        "Dienstes erklären Sie sich mit diesen Bedingungen einverstanden. Wenn Sie mit den Bedingungen nicht "
+        "einverstanden sind, dürfen Sie den Dienst nicht nutzen. Wir können diese Bedingungen jederzeit ändern, "
+        "und die Änderungen werden mit ihrer Veröffentlichung wirksam. Wir erheben personenbezogene Daten, die "
+        "Sie uns bei der Registrierung eines Kontos zur Verfügung stellen, und verwenden diese Daten, um den "
+        "Dienst bereitzustellen und zu verbessern. Wir verkaufen Ihre personenbezogenen Daten nicht ohne Ihre "
+        "Einwilligung an Dritte. Der Lizenzgeber gewährt Ihnen eine beschränkte, nicht ausschließliche Lizenz "
+        "zur Installation und Nutzung der Software. Sie dürfen die Software nicht kopieren, verändern oder "
+        "verbreiten, soweit dies nicht ausdrücklich in dieser Vereinbarung erlaubt ist. Es gilt deutsches Recht."),
+    'hungarian': (
+        "Minden emberi lény szabadon születik és egyenlő méltósága és joga van. Az emberek, ésszel és "
+        "lelkiismerettel bírván, egymással szemben testvéri szellemben kell hogy viseltessenek. "
+        "Ezek a felhasználási feltételek vonatkoznak a szoftver és a weboldal használatára. A szolgáltatás "
+        "használatával Ön elfogadja ezeket a feltételeket. Ha nem fogadja el a feltételeket, nem használhatja a "
+        "szolgáltatást. A feltételeket bármikor módosíthatjuk, és a módosítások a közzétételükkel lépnek "
+        "hatályba. Összegyűjtjük azokat a személyes adatokat, amelyeket a fiók létrehozásakor megad nekünk, és "
+        "ezeket az adatokat a szolgáltatás nyújtására és fejlesztésére használjuk. Személyes adatait nem adjuk "
+        "el harmadik félnek az Ön hozzájárulása nélkül. A licencadó korlátozott, nem kizárólagos jogot biztosít "
+        "Önnek a szoftver telepítésére és használatára. A szoftvert nem másolhatja, nem módosíthatja és nem "
+        "terjesztheti, kivéve, ha ezt a szerződés kifejezetten megengedi. A szerződésre a magyar jog irányadó."),
+    'italian': (
+        "Tutti gli esseri umani nascono liberi ed eguali in dignità e diritti. Essi sono dotati di ragione e di "
+        "coscienza e devono agire gli uni verso gli altri in spirito di fratellanza. "
+        "I presenti termini di servizio regolano l'utilizzo del software e del sito web. Accedendo al servizio o "
+        "utilizzandolo, l'utente accetta di essere vincolato da questi termini. Se non accetti i termini, non "
+        "puoi utilizzare il servizio. Possiamo modificare questi termini in qualsiasi momento, e le modifiche "
+        "entrano in vigore al momento della pubblicazione. Raccogliamo i dati personali che ci fornisci quando "
+        "crei un account, e utilizziamo questi dati per fornire e migliorare il servizio. Non vendiamo i tuoi "
+        "dati personali a terzi senza il tuo consenso. Il licenziante ti concede una licenza limitata e non "
+        "esclusiva per installare e utilizzare il software. Non puoi copiare, modificare o distribuire il "
+        "software, salvo quanto espressamente consentito dal presente contratto, che è regolato dalla legge "
+        "italiana. Qualsiasi controversia sarà di competenza del tribunale della sede della società."),
+    'norwegian': (
+        "Alle mennesker er født frie og med samme menneskeverd og menneskerettigheter. De er utstyrt med fornuft "
+        "og samvittighet og bør handle mot hverandre i brorskapets ånd. "
+        "Disse vilkårene gjelder for din bruk av programvaren og nettstedet. Ved å bruke tjenesten godtar du å "
+        "være bundet av disse vilkårene. Hvis du ikke godtar vilkårene, kan du ikke bruke tjenesten. Vi kan når "
+        "som helst endre vilkårene, og endringene trer i kraft når de blir publisert. Vi samler inn "
+        "personopplysninger som du gir oss når du oppretter en konto, og vi bruker opplysningene til å levere og "
+        "forbedre tjenesten. Vi selger ikke personopplysningene dine til tredjeparter uten ditt samtykke. "
+        "Lisensgiveren gir deg en begrenset og ikke-eksklusiv rett til å installere og bruke programvaren. Du kan "
+        "ikke kopiere, endre eller distribuere programvaren med mindre det uttrykkelig er tillatt i denne "
+        "avtalen. Avtalen er underlagt norsk lov, og tvister skal avgjøres av de norske domstolene. Selskapets "
+        "ansvar er begrenset til beløpet du har betalt for tjenesten."),
+    'portuguese': (
+        "Todos os seres humanos nascem livres e iguais em dignidade e em direitos. Dotados de razão e de "
+        "consciência, devem agir uns para com os outros em espírito de fraternidade. "
+        "Estes termos de serviço regem a sua utilização do software e do sítio web. Ao aceder ou utilizar o "
+        "serviço, o utilizador concorda em ficar vinculado a estes termos. Se não concordar com os termos, não "
+        "pode utilizar o serviço. Podemos alterar estes termos a qualquer momento, e as alterações entram em "
+        "vigor quando forem publicadas. Recolhemos os dados pessoais que nos fornece quando cria uma conta, e "
+        "utilizamos esses dados para prestar e melhorar o serviço. Não vendemos os seus dados pessoais a "
+        "terceiros sem o seu consentimento. O licenciante concede-lhe uma licença limitada e não exclusiva para "
+        "instalar e utilizar o software. Não pode copiar, modificar ou distribuir o software, exceto quando "
+        "expressamente permitido por este contrato. Este contrato é regido pela lei portuguesa, e qualquer "
+        "litígio será resolvido pelos tribunais competentes."),
+    'romanian': (
+        "Toate ființele umane se nasc libere și egale în demnitate și în drepturi. Ele sunt înzestrate cu "
+        "rațiune și conștiință și trebuie să se comporte unele față de altele în spiritul fraternității. "
+        "Acești termeni de utilizare se aplică utilizării software-ului și a site-ului web. Prin accesarea sau "
+        "utilizarea serviciului, sunteți de acord să respectați acești termeni. Dacă nu sunteți de acord cu "
+        "termenii, nu puteți utiliza serviciul. Putem modifica acești termeni în orice moment, iar modificările "
+        "intră în vigoare la data publicării. Colectăm datele personale pe care ni le furnizați atunci când vă "
+        "creați un cont și folosim aceste date pentru a furniza și a îmbunătăți serviciul. Nu vindem datele "
+        "dumneavoastră personale către terți fără consimțământul dumneavoastră. Licențiatorul vă acordă o "
+        "licență limitată și neexclusivă pentru a instala și a utiliza software-ul. Nu aveți dreptul să copiați, "
+        "să modificați sau să distribuiți software-ul, cu excepția cazurilor permise în mod expres de acest "
+        "contract. Contractul este guvernat de legea română."),
+    'russian': (
+        "Все люди рождаются свободными и равными в своем достоинстве и правах. Они наделены разумом и совестью "
+        "и должны поступать в отношении друг друга в духе братства. "
+        "Настоящие условия использования регулируют использование программного обеспечения и веб-сайта. "
+        "Используя сервис, вы соглашаетесь соблюдать настоящие условия. Если вы не согласны с условиями, вы не "
+        "можете использовать сервис. Мы можем изменить эти условия в любое время, и изменения вступают в силу "
+        "с момента их публикации. Мы собираем персональные данные, которые вы предоставляете нам при создании "
+        "учетной записи, и используем эти данные для предоставления и улучшения сервиса. Мы не продаем ваши "
+        "персональные данные третьим лицам без вашего согласия. Лицензиар предоставляет вам ограниченную "
+        "неисключительную лицензию на установку и использование программного обеспечения. Вы не можете "
+        "копировать, изменять или распространять программное обеспечение, за исключением случаев, прямо "
+        "разрешенных настоящим соглашением. Соглашение регулируется законодательством Российской Федерации."),
+    'spanish': (
+        "Todos los seres humanos nacen libres e iguales en dignidad y derechos y, dotados como están de razón y "
+        "conciencia, deben comportarse fraternalmente los unos con los otros. "
+        "Estos términos de servicio rigen el uso del software y del sitio web. Al acceder al servicio o "
+        "utilizarlo, usted acepta quedar vinculado por estos términos. Si no está de acuerdo con los términos, no "
+        "puede utilizar el servicio. Podemos modificar estos términos en cualquier momento, y los cambios "
+        "entrarán en vigor cuando se publiquen. Recopilamos los datos personales que nos proporciona cuando crea "
+        "una cuenta, y utilizamos estos datos para prestar y mejorar el servicio. No vendemos sus datos "
+        "personales a terceros sin su consentimiento. El licenciante le otorga una licencia limitada y no "
+        "exclusiva para instalar y utilizar el software. Usted no puede copiar, modificar ni distribuir el "
+        "software, salvo en la medida en que lo permita expresamente este contrato. Este contrato se rige por "
+        "las leyes de España, y cualquier controversia será resuelta por los juzgados y tribunales competentes."),
+    'swedish': (
+        "Alla människor är födda fria och lika i värde och rättigheter. De har utrustats med förnuft och "
+        "samvete och bör handla gentemot varandra i en anda av broderskap. "
+        "Dessa användarvillkor gäller för din användning av programvaran och webbplatsen. Genom att använda "
+        "tjänsten godkänner du att vara bunden av dessa villkor. Om du inte godkänner villkoren får du inte "
+        "använda tjänsten. Vi kan när som helst ändra villkoren, och ändringarna träder i kraft när de "
+        "publiceras. Vi samlar in personuppgifter som du lämnar till oss när du skapar ett konto, och vi använder "
+        "uppgifterna för att tillhandahålla och förbättra tjänsten. Vi säljer inte dina personuppgifter till "
+        "tredje part utan ditt samtycke. Licensgivaren ger dig en begränsad och icke-exklusiv rätt att "
+        "installera och använda programvaran. Du får inte kopiera, ändra eller sprida programvaran, såvida det "
+        "inte uttryckligen är tillåtet enligt detta avtal. Avtalet regleras av svensk lag, och tvister ska "
+        "avgöras av svensk domstol. Bolagets ansvar är begränsat till det belopp som du har betalat."),
+    'turkish': (
+        "Bütün insanlar hür, haysiyet ve haklar bakımından eşit doğarlar. Akıl ve vicdana sahiptirler ve "
+        "birbirlerine karşı kardeşlik zihniyeti ile hareket etmelidirler. "
+        "Bu kullanım koşulları, yazılımın ve web sitesinin kullanımını düzenler. Hizmeti kullanarak bu "
+        "koşullarla bağlı olmayı kabul etmiş olursunuz. Koşulları kabul etmiyorsanız hizmeti kullanamazsınız. "
+        "Bu koşulları herhangi bir zamanda değiştirebiliriz ve değişiklikler yayınlandıkları tarihte yürürlüğe "
+        "girer. Bir hesap oluşturduğunuzda bize sağladığınız kişisel verileri topluyoruz ve bu verileri hizmeti "
+        "sunmak ve geliştirmek için kullanıyoruz. Kişisel verilerinizi izniniz olmadan üçüncü kişilere "
+        "satmıyoruz. Lisans veren, yazılımı kurmanız ve kullanmanız için size sınırlı ve münhasır olmayan bir "
+        "lisans verir. Bu sözleşmede açıkça izin verilmedikçe yazılımı kopyalayamaz, değiştiremez veya "
+        "dağıtamazsınız. Bu sözleşme Türkiye Cumhuriyeti kanunlarına tabidir ve uyuşmazlıklar mahkemelerde "
+        "çözülür."),
+}
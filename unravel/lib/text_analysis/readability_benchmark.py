@@ -0,0 +1,188 @@
+import logging
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from unravel._version import __version__
+from unravel.lib.text_analysis.corpus_generator import count_words, generate_corpus_text
+from unravel.lib.text_analysis.sentence_heatmap import SentenceHeatmap
+
+# The readability formula classes, each created with a logger and a text analyser.
+FORMULAS = [
+    'unravel.lib.text_analysis.readability.AutomatedReadabilityIndex',
+    'unravel.lib.text_analysis.readability.coleman_liau_index.ColemanLiauIndex',
+    'unravel.lib.text_analysis.readability.DaleChallReadabilityFormula',
+    'unravel.lib.text_analysis.readability.flesch_kincaid_grade_level.FleschKincaidGradeLevel',
+    'unravel.lib.text_analysis.readability.FleschReadingEase',
+    'unravel.lib.text_analysis.readability.gunning_fog_index.GunningFogIndex',
+    'unravel.lib.text_analysis.readability.LinsearWrite',
+    'unravel.lib.text_analysis.readability.lix.Lix',
+    'unravel.lib.text_analysis.readability.rix.Rix',
+    'unravel.lib.text_analysis.readability.simple_measure_of_gobbledygook.SimpleMeasureOfGobbledygook',
+]
+
+# The text analysers used by the formulas.
+ANALYSERS = {
+    'nltk': 'unravel.lib.text_analysis.text_analysers.nltk_text_analyser.NltkTextAnalyser',
+    'spacy': 'unravel.lib.text_analysis.text_analysers.spacy_text_analyser.SpacyTextAnalyser',
+}
+
+# The sentence heatmap calculates all of its scores at once, so it is measured as a single formula.
+HEATMAP_ANALYSER = 'sentence_heatmap'
+
+DEFAULT_SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+
+
+def measure(func: Callable[[], object], repeat: int = 1) -> Tuple[object, float, int]:
+    """Call a function and return its result, the fastest time in seconds, and the peak memory in bytes.
+
+    The calls are timed without tracemalloc, as tracing slows down allocation heavy code.
+    The peak memory is measured in one more call with tracemalloc.
+    """
+    best = None
+    result = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+class ReadabilityBenchmark:
+    """Time the readability formulas with each text analyser over generated texts of increasing size.
+
+    Analysers that cannot be imported or created are recorded with the error
+    and skipped, so the benchmark still runs when an optional analyser is not installed.
+    """
+
+    def __init__(self, sizes: Iterable[int] = None, analysers: Iterable[str] = None,
+                 formulas: Iterable[str] = None, repeat: int = 3, seed: int = 0,
+                 logger: Optional[logging.Logger] = None):
+        self.sizes = sorted(sizes or DEFAULT_SIZES)
+        self.analysers = list(analysers or list(ANALYSERS) + [HEATMAP_ANALYSER])
+        # formulas can be given as dotted paths or class names
+        formulas = set(formulas or [])
+        self.formulas = [path for path in FORMULAS if not formulas or
+                         path in formulas or path.rsplit('.', 1)[-1] in formulas]
+        self.repeat = repeat
+        self.seed = seed
+        self.logger = logger or logging.getLogger(__name__)
+
+    def run(self, progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """Run the benchmark and return the results as a JSON serialisable dict."""
+        texts = {size: generate_corpus_text(size, self.seed) for size in self.sizes}
+        words = {size: count_words(text) for size, text in texts.items()}
+
+        analysers = {}  # type: Dict[str, dict]
+        results = []  # type: List[dict]
+        for name in self.analysers:
+            if name == HEATMAP_ANALYSER:
+                analysers[name] = {'load_seconds': 0.0, 'load_peak_bytes': 0, 'error': None}
+                calcs = [('SentenceHeatmap', SentenceHeatmap.from_text,
+                          lambda heatmap: heatmap.summary()['flesch_kincaid_grade_level'])]
+            else:
+                analyser, analysers[name] = self._load_analyser(name)
+                if analyser is None:
+                    continue
+                calcs = list(self._formula_calcs(analyser))
+
+            for formula_name, calc, level in calcs:
+                for size in self.sizes:
+                    row = self._run_one(name, formula_name, calc, level, texts[size], size, words[size])
+                    results.append(row)
+                    if progress is not None:
+                        progress(row)
+
+        return {
+            'version': __version__,
+            'python': platform.python_version(),
+            'created': timezone.now().isoformat(),
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'sizes': self.sizes,
+            'analysers': analysers,
+            'results': results,
+        }
+
+    def _load_analyser(self, name: str) -> Tuple[object, dict]:
+        try:
+            # the analyser is created once, and the load time and peak memory are from that one call,
+            # so both include importing the analyser and its models the first time in this process
+            tracemalloc.start()
+            try:
+                started = time.perf_counter()
+                analyser = import_string(ANALYSERS.get(name, name))()
+                seconds = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        except Exception as e:
+            self.logger.warning('Could not load text analyser "{}": {}'.format(name, e))
+            return None, {'load_seconds': None, 'load_peak_bytes': None, 'error': str(e)}
+        return analyser, {'load_seconds': seconds, 'load_peak_bytes': peak, 'error': None}
+
+    def _formula_calcs(self, analyser) -> Iterable[Tuple[str, Callable, Callable]]:
+        for path in self.formulas:
+            try:
+                formula = import_string(path)(self.logger, analyser)
+            except Exception as e:
+                self.logger.warning('Could not create readability formula "{}": {}'.format(path, e))
+                continue
+            yield path.rsplit('.', 1)[-1], formula.calc, lambda reading_level: reading_level.level
+
+    def _run_one(self, analyser: str, formula: str, calc: Callable, level: Callable,
+                 text: str, size: int, words: int) -> dict:
+        row = {'analyser': analyser, 'formula': formula, 'size': size, 'words': words}
+        try:
+            result, seconds, peak = measure(lambda: calc(text), self.repeat)
+        except Exception as e:
+            self.logger.warning('Benchmark of {} with {} failed: {}'.format(formula, analyser, e))
+            row.update({'seconds': None, 'words_per_second': None, 'peak_bytes': None, 'level': None,
+                        'error': str(e)})
+            return row
+        row.update({
+            'seconds': seconds,
+            'words_per_second': words / seconds if seconds else None,
+            'peak_bytes': peak,
+            'level': level(result),
+            'error': None,
+        })
+        return row
+
+
+def compare_results(previous: dict, current: dict, max_slowdown: float = 0.1) -> List[dict]:
+    """Compare the throughput of two benchmark runs.
+
+    Returns a row for each analyser, formula, and size in both runs, with the
+    change in words per second. A row is a regression when the current
+    throughput is more than max_slowdown (a fraction) lower than the previous throughput.
+    """
+    previous_rows = {(row['analyser'], row['formula'], row['size']): row for row in previous.get('results', [])}
+    compared = []
+    for row in current.get('results', []):
+        before = previous_rows.get((row['analyser'], row['formula'], row['size']))
+        if before is None or not before.get('words_per_second') or not row.get('words_per_second'):
+            continue
+        change = row['words_per_second'] / before['words_per_second'] - 1.0
+        compared.append({
+            'analyser': row['analyser'],
+            'formula': row['formula'],
+            'size': row['size'],
+            'previous_words_per_second': before['words_per_second'],
+            'words_per_second': row['words_per_second'],
+            'change': change,
+            'regression': change < -max_slowdown,
+        })
+    return compared
@@ -0,0 +1,254 @@
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from unravel.lib.instrumentation import timed
+
+# Word and sentence patterns used for the per-sentence counts.
+# These are deliberately simple so that a large document can be processed in a single pass.
+_WORD = re.compile(r"[^\W_]+(?:['’\-][^\W_]+)*")
+_SENTENCE_END = re.compile(r'[.!?]+[\"\'”’)\]]*\s+|\n[ \t]*\n\s*')
+_LAST_TOKEN = re.compile(r'(\S+)\Z')
+_INITIALISM = re.compile(r'^(?:[^\W\d_]\.)*[^\W\d_]$')
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+_SILENT_ENDING = re.compile(r'(?:[^laeiouy]es|[^laeiouy]ed|[^laeiouy]e)$')
+
+_ABBREVIATIONS = frozenset((
+    'art', 'cl', 'co', 'corp', 'cf', 'dr', 'e.g', 'eg', 'etc', 'i.e', 'ie', 'inc', 'jr', 'ltd', 'mr', 'mrs', 'ms',
+    'no', 'nos', 'para', 'pty', 'reg', 'sch', 'sec', 'sr', 'st', 'viz', 'vol', 'vs',
+))
+
+# Identifies the analysis that produced a heatmap, change the version when the counting rules change.
+ANALYSER_NAME = 'sentence_heatmap'
+ANALYSER_VERSION = '1'
+
+# Readability scores that can be calculated from the counts of a single sentence.
+SCORES = (
+    'flesch_reading_ease',
+    'flesch_kincaid_grade_level',
+    'gunning_fog_index',
+    'automated_readability_index',
+    'coleman_liau_index',
+)
+
+# Scores are stored as signed 16-bit integers with one decimal place.
+_SCORE_SCALE = 10
+_SCORE_MIN = -32767
+_SCORE_MAX = 32767
+_SCORE_MISSING = -32768
+_COUNT_MAX = 65535
+
+_HEADER = struct.Struct('<4sI')
+_MAGIC = b'USH1'
+
+# (attribute name, array typecode) in serialised order
+_COLUMNS = (
+    ('starts', 'I'),
+    ('ends', 'I'),
+    ('words', 'H'),
+    ('syllables', 'H'),
+    ('complex_words', 'H'),
+    ('letters', 'H'),
+) + tuple((name, 'h') for name in SCORES)
+
+_TOKENIZE_TIMER = timed(
+    'unravel_text_analysis_seconds', 'Time spent in each text analysis stage.',
+    analyser='sentence_heatmap', stage='tokenize')
+# the sentence heatmap calculates all of its readability formulas together for each sentence
+_SCORE_TIMER = timed(
+    'unravel_text_analysis_seconds', 'Time spent in each text analysis stage.',
+    analyser='sentence_heatmap', stage='formulas')
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Estimate the number of syllables in a word by counting vowel groups."""
+    word = word.lower()
+    if len(word) <= 3:
+        return 1
+    word = _SILENT_ENDING.sub('', word)
+    if word.startswith('y'):
+        word = word[1:]
+    return max(1, len(_VOWEL_GROUPS.findall(word)))
+
+
+def readability_scores(sentences: int, words: int, syllables: int, complex_words: int, letters: int) -> Tuple:
+    """Calculate the readability scores in SCORES order from text counts.
+    Scores are None when there are no words or sentences."""
+    if sentences < 1 or words < 1:
+        return (None,) * len(SCORES)
+
+    words_per_sentence = words / sentences
+    syllables_per_word = syllables / words
+    letters_per_100_words = 100.0 * letters / words
+    sentences_per_100_words = 100.0 * sentences / words
+
+    return (
+        206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word,
+        0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59,
+        0.4 * (words_per_sentence + 100.0 * complex_words / words),
+        4.71 * letters / words + 0.5 * words_per_sentence - 21.43,
+        0.0588 * letters_per_100_words - 0.296 * sentences_per_100_words - 15.8,
+    )
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """Find the (start, end) character offsets of the sentences in a text."""
+    spans = []
+    text_len = len(text)
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        boundary = match.end()
+        if text[match.start()] == '.' and boundary < text_len:
+            # don't split after abbreviations, initialisms, or before a lower case word
+            if text[boundary].islower():
+                continue
+            token = _LAST_TOKEN.search(text, max(start, match.start() - 20), match.start())
+            if token:
+                token = token.group(1).lower()
+                if token in _ABBREVIATIONS or _INITIALISM.match(token):
+                    continue
+        _append_span(text, start, boundary, spans)
+        start = boundary
+    _append_span(text, start, text_len, spans)
+    return spans
+
+
+def _append_span(text: str, start: int, end: int, spans: List[Tuple[int, int]]) -> None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if end > start:
+        spans.append((start, end))
+
+
+class SentenceHeatmap:
+    """Per-sentence readability metrics stored as packed numeric arrays.
+
+    Each sentence is a position in every array, so a heatmap for a large
+    document is a few flat arrays instead of thousands of objects or rows.
+    The sentence start and end character offsets are sorted, which allows
+    a character range to be sliced using binary search.
+    """
+
+    def __init__(self, **columns):
+        for name, typecode in _COLUMNS:
+            setattr(self, name, columns.get(name) or array(typecode))
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'SentenceHeatmap':
+        """Build the heatmap by analysing each sentence in the text."""
+        heatmap = cls()
+        scores = [getattr(heatmap, name) for name in SCORES]
+        find_words = _WORD.findall
+
+        with _TOKENIZE_TIMER:
+            spans = split_sentences(text or '')
+
+        with _SCORE_TIMER:
+            for start, end in spans:
+                words = find_words(text, start, end)
+                syllables = complex_words = letters = 0
+                for word in words:
+                    word_syllables = count_syllables(word)
+                    syllables += word_syllables
+                    letters += len(word)
+                    if word_syllables >= 3:
+                        complex_words += 1
+
+                heatmap.starts.append(start)
+                heatmap.ends.append(end)
+                heatmap.words.append(min(len(words), _COUNT_MAX))
+                heatmap.syllables.append(min(syllables, _COUNT_MAX))
+                heatmap.complex_words.append(min(complex_words, _COUNT_MAX))
+                heatmap.letters.append(min(letters, _COUNT_MAX))
+
+                values = readability_scores(1, len(words), syllables, complex_words, letters)
+                for column, value in zip(scores, values):
+                    column.append(_pack_score(value))
+
+        return heatmap
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SentenceHeatmap':
+        """Load a heatmap from the output of to_bytes."""
+        data = memoryview(data)
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError('Unrecognised sentence heatmap format.')
+
+        columns = {}
+        offset = _HEADER.size
+        for name, typecode in _COLUMNS:
+            column = array(typecode)
+            size = count * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns[name] = column
+            offset += size
+        return cls(**columns)
+
+    def to_bytes(self) -> bytes:
+        """Serialise the heatmap to a compact little-endian byte string."""
+        parts = [_HEADER.pack(_MAGIC, len(self))]
+        for name, typecode in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != 'little':
+                column = array(typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b''.join(parts)
+
+    def slice(self, start: int, end: int) -> 'SentenceHeatmap':
+        """Get the sentences that overlap the character range [start, end)."""
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end, first)
+        return SentenceHeatmap(**{name: getattr(self, name)[first:last] for name, _ in _COLUMNS})
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Get the document-level counts and readability scores."""
+        values = {
+            'sentence_count': len(self),
+            'word_count': sum(self.words),
+            'syllable_count': sum(self.syllables),
+            'complex_word_count': sum(self.complex_words),
+            'letter_count': sum(self.letters),
+        }
+        scores = readability_scores(
+            values['sentence_count'], values['word_count'], values['syllable_count'],
+            values['complex_word_count'], values['letter_count'])
+        values.update(zip(SCORES, scores))
+        return values
+
+    def rows(self) -> List[Dict[str, Optional[float]]]:
+        """Get the heatmap as a list with one dict per sentence."""
+        names = ['start', 'end'] + [name for name, _ in _COLUMNS[2:]]
+        columns = [getattr(self, name) for name, _ in _COLUMNS]
+        rows = []
+        for values in zip(*columns):
+            row = dict(zip(names, values))
+            for name in SCORES:
+                row[name] = _unpack_score(row[name])
+            rows.append(row)
+        return rows
+
+
+def _pack_score(value: Optional[float]) -> int:
+    if value is None:
+        return _SCORE_MISSING
+    return max(_SCORE_MIN, min(_SCORE_MAX, int(round(value * _SCORE_SCALE))))
+
+
+def _unpack_score(value: int) -> Optional[float]:
+    if value == _SCORE_MISSING:
+        return None
+    return value / _SCORE_SCALE
@@ -0,0 +1,228 @@
+import math
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+_MISSING = object()
+
+
+class LruCache:
+    """A thread-safe in-process least recently used cache.
+
+    The cache is bounded by both the number of entries and the approximate
+    size in bytes of the stored values. Values are stored as-is, not copied,
+    so cached values must not be modified.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, size, value = entry
+            if expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, size: int, timeout: Optional[float] = None) -> None:
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, size, value)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+class TieredCache:
+    """A cache for model reads with an in-process LRU in front of a shared Django cache.
+
+    Keys are versioned with a generation number per model. Saving or
+    deleting a model increments the generation, so the old keys are never
+    read again and age out of both tiers. Each process checks the shared
+    generation at most every generation_ttl seconds, so other processes see
+    an invalidation after at most that delay.
+    """
+
+    def __init__(self, shared=None, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024,
+                 timeout: float = 300, generation_ttl: float = 5):
+        self.shared = shared if shared is not None else caches['default']
+        self.local = LruCache(max_entries, max_bytes)
+        self.timeout = timeout
+        self.generation_ttl = generation_ttl
+        self._generations = {}  # type: Dict[str, tuple]
+        self._changed = {}  # type: Dict[str, tuple]
+        self._counters = {'local_hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+
+        value = self.shared.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('shared_hits')
+            self._set_local(key, value)
+            return value
+
+        self._count('misses')
+        return default
+
+    def set(self, key: str, value, timeout: Optional[float] = None) -> None:
+        timeout = self.timeout if timeout is None else timeout
+        self.shared.set(key, value, timeout)
+        self._set_local(key, value, timeout)
+
+    def get_or_set(self, key: str, default_func, timeout: Optional[float] = None):
+        """Get a value, or calculate and store it if it is not cached. Values of None are not cached."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default_func()
+            if value is not None:
+                self.set(key, value, timeout)
+        return value
+
+    def model_key(self, model, *parts) -> str:
+        """Build a cache key that is invalidated when any instance of the model is saved or deleted."""
+        label = model._meta.label_lower
+        return 'unravel:{}:{}:{}'.format(label, self.generation(label), ':'.join(str(part) for part in parts))
+
+    def generation(self, label: str) -> int:
+        now = time.monotonic()
+        cached = self._generations.get(label)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        key = self._generation_key(label)
+        generation = self.shared.get(key)
+        if generation is None:
+            # start from the current time, so a lost generation does not reuse old keys
+            self.shared.add(key, int(time.time() * 1000), None)
+            generation = self.shared.get(key)
+        self._generations[label] = (now + self.generation_ttl, generation)
+        return generation
+
+    def invalidate(self, model) -> None:
+        """Invalidate all cached values for a model."""
+        label = model._meta.label_lower
+        key = self._generation_key(label)
+        try:
+            generation = self.shared.incr(key)
+        except ValueError:
+            generation = int(time.time() * 1000)
+            self.shared.set(key, generation, None)
+        self._generations[label] = (time.monotonic() + self.generation_ttl, generation)
+        changed = time.time()
+        self.shared.set(self._changed_key(label), changed, None)
+        self._changed[label] = (time.monotonic() + self.generation_ttl, changed)
+        self._count('invalidations')
+
+    def invalidate_on_commit(self, model) -> None:
+        """Invalidate all cached values for a model when the current transaction commits.
+        Invalidating before the commit would let a concurrent read cache the old values under the new generation.
+        Outside a transaction the values are invalidated immediately."""
+        transaction.on_commit(lambda: self.invalidate(model))
+
+    def changed_date(self, model) -> datetime:
+        """Get when the model was last invalidated, rounded up to the next second as HTTP dates only have seconds.
+        If it is not known, e.g. the shared cache was cleared, it is set to now.
+        Like the generation, it is read from the shared cache at most every generation_ttl seconds."""
+        label = model._meta.label_lower
+        now = time.monotonic()
+        cached = self._changed.get(label)
+        if cached is not None and cached[0] > now:
+            changed = cached[1]
+        else:
+            key = self._changed_key(label)
+            changed = self.shared.get(key)
+            if changed is None:
+                self.shared.add(key, time.time(), None)
+                changed = self.shared.get(key) or time.time()
+            self._changed[label] = (now + self.generation_ttl, changed)
+        return datetime.fromtimestamp(math.ceil(changed), tz=timezone.utc)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit and miss counters for this process."""
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['local_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        stats['local_entries'] = len(self.local)
+        stats['local_bytes'] = self.local.current_bytes
+        return stats
+
+    def _set_local(self, key: str, value, timeout: Optional[float] = None) -> None:
+        try:
+            size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        self.local.set(key, value, size, self.timeout if timeout is None else timeout)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _generation_key(self, label: str) -> str:
+        return 'unravel:generation:{}'.format(label)
+
+    def _changed_key(self, label: str) -> str:
+        return 'unravel:changed:{}'.format(label)
+
+
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> TieredCache:
+    """Get the tiered cache for this process, configured from the UNRAVEL_CACHE setting."""
+    global _model_cache
+    if _model_cache is None:
+        with _model_cache_lock:
+            if _model_cache is None:
+                options = getattr(settings, 'UNRAVEL_CACHE', {})
+                _model_cache = TieredCache(
+                    shared=caches[options.get('SHARED_ALIAS', 'default')],
+                    max_entries=options.get('LOCAL_MAX_ENTRIES', 1000),
+                    max_bytes=options.get('LOCAL_MAX_BYTES', 32 * 1024 * 1024),
+                    timeout=options.get('TIMEOUT', 300),
+                    generation_ttl=options.get('GENERATION_TTL', 5))
+    return _model_cache
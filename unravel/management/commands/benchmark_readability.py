@@ -0,0 +1,95 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from unravel.lib.text_analysis.corpus_generator import parse_size
+from unravel.lib.text_analysis.readability_benchmark import (
+    ANALYSERS, DEFAULT_SIZES, HEATMAP_ANALYSER, ReadabilityBenchmark, compare_results)
+
+
+class Command(BaseCommand):
+    help = 'Measure the speed and memory use of the readability formulas over generated EULA-like texts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size', action='append', dest='sizes',
+            help='The size of a generated text in bytes, with an optional K or M suffix. '
+                 'Can be given more than once. Default: {}.'.format(', '.join(str(size) for size in DEFAULT_SIZES)))
+        parser.add_argument(
+            '--analyser', action='append', dest='analysers',
+            choices=sorted(ANALYSERS) + [HEATMAP_ANALYSER],
+            help='Only benchmark this text analyser. Can be given more than once.')
+        parser.add_argument(
+            '--formula', action='append', dest='formulas',
+            help='Only benchmark this readability formula class. Can be given more than once.')
+        parser.add_argument(
+            '--repeat', type=int, default=3, help='The number of timed runs; the fastest run is reported.')
+        parser.add_argument(
+            '--seed', type=int, default=0, help='The seed for the generated texts.')
+        parser.add_argument(
+            '--output', help='Write the results as JSON to this file.')
+        parser.add_argument(
+            '--compare', help='Compare the throughput to the results in this JSON file from a previous run.')
+        parser.add_argument(
+            '--max-slowdown', type=float, default=0.1,
+            help='The fraction of throughput that can be lost before a comparison is a regression.')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [parse_size(size) for size in options['sizes'] or []]
+        except ValueError as e:
+            raise CommandError(e)
+
+        previous = None
+        if options['compare']:
+            with open(options['compare'], 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+
+        benchmark = ReadabilityBenchmark(
+            sizes=sizes, analysers=options['analysers'], formulas=options['formulas'],
+            repeat=options['repeat'], seed=options['seed'])
+        results = benchmark.run(progress=self._write_row if options['verbosity'] > 1 else None)
+
+        for name, analyser in sorted(results['analysers'].items()):
+            if analyser['error']:
+                self.stderr.write('{}: not available: {}'.format(name, analyser['error']))
+            else:
+                self.stdout.write('{}: loaded in {:.3f}s, peak memory {:,} bytes'.format(
+                    name, analyser['load_seconds'], analyser['load_peak_bytes']))
+        if options['verbosity'] <= 1:
+            for row in results['results']:
+                self._write_row(row)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write('Wrote results to {}.'.format(options['output']))
+
+        if previous is not None:
+            self._compare(previous, results, options['max_slowdown'])
+
+    def _write_row(self, row: dict) -> None:
+        if row['error']:
+            self.stderr.write('{analyser:<16} {formula:<28} {size:>10,} bytes: {error}'.format(**row))
+            return
+        level = row['level']
+        # the words per second is None when the calculation was too fast to time
+        speed = row['words_per_second']
+        self.stdout.write(
+            '{analyser:<16} {formula:<28} {size:>10,} bytes {words:>9,} words '
+            '{speed:>12} words/s {peak_bytes:>13,} peak bytes  level {level}'.format(
+                **dict(row, speed='-' if speed is None else '{:,.0f}'.format(speed),
+                       level=round(level, 1) if isinstance(level, float) else level)))
+
+    def _compare(self, previous: dict, current: dict, max_slowdown: float) -> None:
+        self.stdout.write('Compared to version {} from {}:'.format(previous.get('version'), previous.get('created')))
+        compared = compare_results(previous, current, max_slowdown)
+        for row in compared:
+            self.stdout.write('{flag} {analyser:<16} {formula:<28} {size:>10,} bytes {change:>+8.1%}'.format(
+                flag='!' if row['regression'] else ' ', **row))
+
+        regressions = sum(1 for row in compared if row['regression'])
+        if regressions:
+            raise CommandError('{} of {} benchmarks are more than {:.0%} slower.'.format(
+                regressions, len(compared), max_slowdown))
+        self.stdout.write('No regressions in {} benchmarks.'.format(len(compared)))
@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from unravel import models as app_models
+from unravel.lib.text_analysis.analyser_comparison import AnalyserComparison
+from unravel.lib.text_analysis.readability_benchmark import ANALYSERS, HEATMAP_ANALYSER
+
+
+class Command(BaseCommand):
+    help = 'Score document versions with several text analysers at the same time, and report where they disagree.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyser', action='append', dest='analysers', choices=sorted(ANALYSERS) + [HEATMAP_ANALYSER],
+            help='Compare this text analyser. Can be given more than once. Default: {}.'.format(
+                ', '.join(sorted(ANALYSERS))))
+        parser.add_argument(
+            '--formula', action='append', dest='formulas',
+            help='Only compare this readability formula class. Can be given more than once.')
+        parser.add_argument(
+            '--document', type=int, action='append', dest='document_ids',
+            help='Only compare the latest version of this document. Can be given more than once.')
+        parser.add_argument(
+            '--limit', type=int, help='The maximum number of document versions to compare.')
+        parser.add_argument(
+            '--threshold', type=float, default=1.0,
+            help='Flag a version when two analysers give levels further apart than this for any formula.')
+        parser.add_argument(
+            '--workers', type=int, default=1, help='The number of worker processes for each analyser.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=10, help='The number of versions sent to a worker at a time.')
+        parser.add_argument(
+            '--output', help='Write the scores, divergence, and flagged versions as JSON to this file.')
+
+    def handle(self, *args, **options):
+        analysers = options['analysers'] or sorted(ANALYSERS)
+        if len(set(analysers)) < 2:
+            raise CommandError('At least two different analysers are needed to compare.')
+
+        versions = app_models.DocumentVersion.objects.order_by('document_id', '-created_date', '-id').distinct(
+            'document_id')
+        if options['document_ids']:
+            versions = versions.filter(document_id__in=options['document_ids'])
+        version_ids = list(versions.values_list('pk', flat=True))[:options['limit']]
+
+        comparison = AnalyserComparison(
+            list(dict.fromkeys(analysers)), formulas=options['formulas'], workers=options['workers'],
+            chunk_size=options['chunk_size'], threshold=options['threshold'])
+        report = comparison.run(self._texts(version_ids))
+
+        self._write_report(report, options['verbosity'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f, indent=2, sort_keys=True)
+            self.stdout.write('Wrote report to {}.'.format(options['output']))
+
+    def _texts(self, version_ids):
+        """Load the text of the versions a batch at a time.
+
+        The worker processes are forked when texts are sent to them, and must not
+        inherit an open database connection. So the connection is closed after
+        each batch is loaded, before any text from the batch is sent.
+        """
+        batch_size = 100
+        for index in range(0, len(version_ids), batch_size):
+            versions = list(app_models.DocumentVersion.objects.filter(
+                pk__in=version_ids[index:index + batch_size]).only('pk', 'content_text_raw', 'content_file'))
+            connections.close_all()
+            for version in versions:
+                yield version.pk, version.get_content_text()
+
+    def _write_report(self, report, verbosity: int) -> None:
+        for name, error in sorted(report.errors.items()):
+            self.stderr.write('{}: not available: {}'.format(name, error))
+        self.stdout.write('Scored {} versions in {:.1f}s.'.format(len(report.scores), report.wall_seconds))
+        for name in report.analysers:
+            if name not in report.errors:
+                self.stdout.write('  {}: loaded in {:.2f}s, scoring took {:.1f}s'.format(
+                    name, report.load_seconds.get(name, 0.0), report.analyser_seconds[name]))
+
+        self.stdout.write('{:<28} {:<34} {:>6} {:>9} {:>9} {:>9} {:>9} {:>6}'.format(
+            'formula', 'analysers', 'texts', 'mean', 'mean abs', 'p90 abs', 'max abs', 'over'))
+        for row in report.divergence():
+            self.stdout.write(
+                '{formula:<28} {pair:<34} {texts:>6} {mean_difference:>+9.2f} {mean_absolute_difference:>9.2f} '
+                '{p90_absolute_difference:>9.2f} {max_absolute_difference:>9.2f} {over_threshold:>6}'.format(
+                    pair=' - '.join(row['analysers']), **row))
+
+        flagged = report.flagged()
+        self.stdout.write('{} versions differ by more than {} on a formula.'.format(len(flagged), report.threshold))
+        for item in flagged if verbosity > 1 else flagged[:10]:
+            self.stdout.write('  version {key}: {max_difference:.2f}'.format(**item))
+            for formula, levels in sorted(item['formulas'].items()):
+                self.stdout.write('    {}: {}'.format(formula, ', '.join(
+                    '{} {}'.format(name, level) for name, level in sorted(levels.items()))))
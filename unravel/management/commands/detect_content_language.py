@@ -0,0 +1,47 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from unravel import models as app_models
+from unravel.tasks import detect_document_version_languages
+
+
+class Command(BaseCommand):
+    help = 'Detect and set the content language of existing document versions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help='Only check versions that currently have this language. Can be given more than once.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000, help='The number of versions to check in each batch.')
+        parser.add_argument(
+            '--no-search-vectors', action='store_false', dest='update_vectors',
+            help='Do not update the search vectors of versions with a changed language.')
+
+    def handle(self, *args, **options):
+        versions = app_models.DocumentVersion.objects.all()
+        if options['languages']:
+            versions = versions.filter(content_language__in=options['languages'])
+
+        started = time.perf_counter()
+        checked = 0
+        changed = Counter()
+        last_id = 0
+        while True:
+            ids = list(versions.filter(pk__gt=last_id).order_by('pk').values_list(
+                'pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            changed.update(detect_document_version_languages(ids, update_vectors=options['update_vectors']))
+            checked += len(ids)
+            last_id = ids[-1]
+            if options['verbosity'] > 1:
+                self.stdout.write('Checked {} versions.'.format(checked))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write('Checked {} versions in {:.1f} seconds, changed {}.'.format(
+            checked, elapsed, sum(changed.values())))
+        for language, count in sorted(changed.items()):
+            self.stdout.write('  {}: {}'.format(language, count))
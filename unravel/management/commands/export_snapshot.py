@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from unravel.lib.corpus_snapshot import export_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Export the documents, versions, tags, sources, and results to a compressed snapshot archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='The snapshot archive file to write.')
+        parser.add_argument(
+            '--chunk-rows', type=int, default=5000, help='The maximum number of rows in each chunk of a table.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with open(options['path'], 'wb') as f:
+            export_snapshot(f, chunk_rows=options['chunk_rows'], progress=self._progress)
+        self.stdout.write('Wrote snapshot to {} in {:.1f}s.'.format(options['path'], time.perf_counter() - started))
+
+    def _progress(self, name: str, count: int) -> None:
+        self.stdout.write('  {}: {} rows'.format(name, count))
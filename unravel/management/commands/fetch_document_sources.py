@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from unravel import models as app_models
+from unravel.lib.source_fetcher import FetchResult, FetchTarget, SourceFetcher
+from unravel.lib.tiered_cache import get_model_cache
+
+
+class Command(BaseCommand):
+    help = 'Check the document source urls for changes, and create a document version for each changed url.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'username', help='The user recorded as creating the new document versions.')
+        parser.add_argument(
+            '--source', type=int, action='append', dest='source_ids',
+            help='Only check the document source with this id. Can be given more than once.')
+        parser.add_argument(
+            '--concurrency', type=int, default=20, help='The maximum number of requests in progress.')
+        parser.add_argument(
+            '--host-interval', type=float, default=1.0,
+            help='The minimum number of seconds between starting requests to the same host.')
+        parser.add_argument(
+            '--timeout', type=float, default=30, help='The request timeout in seconds.')
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError('User "{}" does not exist.'.format(options['username']))
+
+        sources = app_models.DocumentSource.objects.filter(enabled=True)
+        if options['source_ids']:
+            sources = sources.filter(pk__in=options['source_ids'])
+        sources = list(sources.order_by('pk').values_list(
+            'pk', 'url', 'etag', 'last_modified', 'content_hash', 'document_id'))
+
+        # sources that have not been checked before are compared to the latest version of their document
+        latest_hashes = dict(app_models.DocumentVersion.objects.filter(
+            document_id__in={source[5] for source in sources if source[4] is None},
+        ).order_by('document_id', '-created_date', '-id').distinct('document_id').values_list(
+            'document_id', 'content_hash'))
+        targets = [
+            FetchTarget(pk, url, etag, last_modified, content_hash or latest_hashes.get(document_id))
+            for pk, url, etag, last_modified, content_hash, document_id in sources]
+
+        fetcher = SourceFetcher(
+            concurrency=options['concurrency'], host_interval=options['host_interval'], timeout=options['timeout'])
+        results = fetcher.run(
+            targets, on_result=lambda result: self._store_result(user, result),
+            on_finish=connections.close_all)
+        get_model_cache().invalidate(app_models.DocumentSource)
+
+        changed = sum(1 for result in results if result.changed)
+        failed = sum(1 for result in results if result.error)
+        self.stdout.write('Checked {} sources: {} changed, {} unchanged, {} failed.'.format(
+            len(results), changed, len(results) - changed - failed, failed))
+        for result in results:
+            if result.error:
+                self.stderr.write('{}: {}'.format(result.target.url, result.error))
+
+    def _store_result(self, user, result: FetchResult) -> None:
+        fields = {
+            'last_checked_date': timezone.now(),
+            'last_status': result.status,
+            'last_error': result.error,
+        }
+        if not result.error:
+            fields['etag'] = result.etag
+            fields['last_modified'] = result.last_modified
+
+        sources = app_models.DocumentSource.objects.filter(pk=result.target.key)
+        if not result.changed:
+            sources.update(**fields)
+            return
+
+        with transaction.atomic():
+            document_id = sources.values_list('document_id', flat=True).get()
+            version = app_models.DocumentVersion(document_id=document_id, content_text_raw=result.text)
+            version.save(user=user)
+
+            fields['content_hash'] = result.content_hash
+            fields['last_changed_date'] = fields['last_checked_date']
+            sources.update(**fields)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from unravel.lib.corpus_snapshot import import_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Import a snapshot archive written by export_snapshot into an empty database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='The snapshot archive file to read.')
+        parser.add_argument(
+            '--no-search-vectors', action='store_false', dest='update_vectors',
+            help='Do not update the full text search vectors after importing.')
+        parser.add_argument(
+            '--no-render', action='store_false', dest='render',
+            help='Do not queue the render tasks for the formatted text after importing.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as f:
+                import_snapshot(
+                    f, update_vectors=options['update_vectors'], render=options['render'], progress=self._progress)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write('Imported snapshot from {} in {:.1f}s.'.format(
+            options['path'], time.perf_counter() - started))
+
+    def _progress(self, name: str, count: int) -> None:
+        self.stdout.write('  {}: {} rows'.format(name, count))
@@ -0,0 +1,125 @@
+import json
+import time
+
+from celery import current_app
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from unravel import models as app_models
+from unravel.lib import load_test
+from unravel.lib.text_analysis.corpus_generator import parse_size
+
+
+class Command(BaseCommand):
+    help = 'Seed generated documents, then measure the views with many concurrent clients.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'username', help='The user recorded as creating the seeded documents, and logged in to the admin.')
+        parser.add_argument(
+            '--documents', type=int, default=1000, help='The number of documents to seed.')
+        parser.add_argument(
+            '--versions', type=int, default=3, help='The number of versions of each document.')
+        parser.add_argument(
+            '--tags', type=int, default=20, help='The number of tags to seed, each document has up to three.')
+        parser.add_argument(
+            '--size', default='20K', help='The average size of each version text, with an optional K or M suffix.')
+        parser.add_argument(
+            '--seed', type=int, default=0, help='The seed for the generated documents and requests.')
+        parser.add_argument(
+            '--no-seed', action='store_false', dest='create_seed',
+            help='Use documents seeded by a previous run with the same --seed.')
+        parser.add_argument(
+            '--no-render', action='store_false', dest='render',
+            help='Do not render the formatted text when seeding, so the formatted views render on first request.')
+        parser.add_argument(
+            '--keep', action='store_true', help='Keep the seeded documents after the load test.')
+        parser.add_argument(
+            '--clients', type=int, default=8, help='The number of concurrent clients.')
+        parser.add_argument(
+            '--requests', type=int, default=2000, help='The total number of requests.')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Only make this kind of request. Can be given more than once.')
+        parser.add_argument(
+            '--output', help='Write the summary as JSON to this file.')
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError('User "{}" does not exist.'.format(options['username']))
+        try:
+            size = parse_size(options['size'])
+        except ValueError as e:
+            raise CommandError(e)
+
+        # run any celery tasks queued by the views in this process, so no broker is needed
+        current_app.conf.task_always_eager = True
+
+        seed = options['seed']
+        if options['create_seed']:
+            started = time.perf_counter()
+            created = load_test.seed_documents(
+                options['documents'], options['versions'], options['tags'], size, seed, user=user,
+                render=options['render'], progress=self._seed_progress if options['verbosity'] > 1 else None)
+            elapsed = time.perf_counter() - started
+            self.stdout.write('Seeded {} documents, {} versions, and {} tags in {:.1f}s ({:.0f} versions/s).'.format(
+                len(created['documents']), len(created['versions']), len(created['tags']), elapsed,
+                len(created['versions']) / elapsed if elapsed else 0))
+
+        try:
+            summary = self._run(user, seed, options)
+        finally:
+            if options['create_seed'] and not options['keep']:
+                self.stdout.write('Deleted {} seeded documents.'.format(load_test.delete_seeded(seed)))
+
+        self._write_summary(summary)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, sort_keys=True)
+            self.stdout.write('Wrote summary to {}.'.format(options['output']))
+
+    def _run(self, user, seed: int, options) -> dict:
+        versions = app_models.DocumentVersion.objects.filter(
+            document__title__startswith='{} {} '.format(load_test.SEED_PREFIX, seed))
+        version_ids = {}
+        for document_id, version_id in versions.values_list('document_id', 'pk'):
+            version_ids.setdefault(document_id, []).append(version_id)
+        if not version_ids:
+            raise CommandError('There are no seeded documents for seed {}.'.format(seed))
+
+        scenarios = load_test.build_scenarios(sorted(version_ids), version_ids)
+        if options['scenarios']:
+            unknown = set(options['scenarios']) - set(scenarios)
+            if unknown:
+                raise CommandError('Unknown scenarios: {}. Available: {}.'.format(
+                    ', '.join(sorted(unknown)), ', '.join(sorted(scenarios))))
+            scenarios = {name: scenarios[name] for name in options['scenarios']}
+
+        test = load_test.LoadTest(
+            scenarios.values(), clients=options['clients'], requests=options['requests'], user=user, seed=seed)
+        with override_settings(ALLOWED_HOSTS=['testserver'], DEBUG=False):
+            started = time.perf_counter()
+            samples = test.run()
+            elapsed = time.perf_counter() - started
+
+        return {
+            'clients': options['clients'],
+            'seconds': elapsed,
+            'documents': len(version_ids),
+            'scenarios': load_test.summarise(samples, elapsed),
+        }
+
+    def _seed_progress(self, name: str, count: int) -> None:
+        self.stdout.write('Seeded {} {}.'.format(count, name))
+
+    def _write_summary(self, summary: dict) -> None:
+        self.stdout.write('{} requests from {} clients in {:.1f} seconds:'.format(
+            summary['scenarios']['all']['requests'], summary['clients'], summary['seconds']))
+        self.stdout.write('{:<20} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9} {:>8} {:>8}'.format(
+            'scenario', 'requests', 'errors', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'queries', 'db ms'))
+        for name, row in summary['scenarios'].items():
+            self.stdout.write(
+                '{name:<20} {requests:>8} {errors:>7} {p50_ms:>9.1f} {p90_ms:>9.1f} {p99_ms:>9.1f} {max_ms:>9.1f} '
+                '{queries_mean:>8.1f} {db_ms_mean:>8.1f}'.format(name=name, **row))
@@ -0,0 +1,42 @@
+import time
+
+from django.db import connection
+
+from unravel.lib.instrumentation import QUERY_COUNT_BUCKETS, QueryTimer, get_registry, profiled
+
+
+class MetricsMiddleware:
+    """Record the time, number of queries, and database time of each request, by view.
+
+    Add this first in the MIDDLEWARE setting so the queries made by the other
+    middleware are included. The time of streamed content is not included,
+    as the content is sent after the middleware returns.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        registry = get_registry()
+        self.request_seconds = registry.histogram(
+            'unravel_request_seconds', 'Time to handle each request, by view.')
+        self.request_queries = registry.histogram(
+            'unravel_request_queries', 'Number of database queries for each request, by view.', QUERY_COUNT_BUCKETS)
+        self.request_db_seconds = registry.histogram(
+            'unravel_request_db_seconds', 'Time spent in database queries for each request, by view.')
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with profiled('request {} {}'.format(request.method, request.path)), connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        labels = {
+            'view': match.view_name if match else 'unresolved',
+            'method': request.method,
+            'status': response.status_code,
+        }
+        self.request_seconds.observe(elapsed, **labels)
+        self.request_queries.observe(timer.queries, **labels)
+        self.request_db_seconds.observe(timer.seconds, **labels)
+        return response
@@ -0,0 +1,24 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0005_documentresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentresult',
+            name='document_version',
+            field=models.ForeignKey(blank=True, help_text='The document version that was analysed.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='unravel.DocumentVersion'),
+        ),
+        migrations.AddField(
+            model_name='documentresult',
+            name='sentence_heatmap',
+            field=models.BinaryField(blank=True, help_text='Readability metrics for each sentence.', null=True),
+        ),
+    ]
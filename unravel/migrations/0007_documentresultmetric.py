@@ -0,0 +1,56 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0006_documentresult_sentence_heatmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentresult',
+            name='analyser_model_version',
+            field=models.CharField(blank=True, help_text='Version of the language model used by the analyser.', max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentresult',
+            name='analyser_name',
+            field=models.CharField(blank=True, help_text='Name of the analyser that created the result.', max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentresult',
+            name='analyser_version',
+            field=models.CharField(blank=True, help_text='Version of the analyser that created the result.', max_length=50, null=True),
+        ),
+        migrations.CreateModel(
+            name='DocumentResultMetric',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('sentence_count', 'Sentence count'), ('word_count', 'Word count'), ('syllable_count', 'Syllable count'), ('complex_word_count', 'Complex word count'), ('letter_count', 'Letter count'), ('flesch_reading_ease', 'Flesch Reading Ease'), ('flesch_kincaid_grade_level', 'Flesch-Kincaid Grade Level'), ('gunning_fog_index', 'Gunning Fog Index'), ('automated_readability_index', 'Automated Readability Index'), ('coleman_liau_index', 'Coleman-Liau Index')], help_text='The metric name.', max_length=50)),
+                ('value', models.FloatField(help_text='The metric value.')),
+                ('analysed_date', models.DateTimeField(help_text='Date the result was created.')),
+                ('document_version', models.ForeignKey(blank=True, help_text='The document version that was analysed.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='unravel.DocumentVersion')),
+                ('result', models.ForeignKey(help_text='The result this metric is part of.', on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='unravel.DocumentResult')),
+            ],
+            options={
+                'verbose_name': 'Document Result Metric',
+                'verbose_name_plural': 'Document Result Metrics',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='documentresultmetric',
+            index=models.Index(fields=['metric', 'value'], name='unravel_metric_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentresultmetric',
+            index=models.Index(fields=['metric', 'analysed_date'], name='unravel_metric_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='documentresultmetric',
+            unique_together={('result', 'metric')},
+        ),
+    ]
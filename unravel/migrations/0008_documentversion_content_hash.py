@@ -0,0 +1,39 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:20
+
+from django.db import migrations, models
+
+from unravel.lib.content_hash import hash_file, hash_text
+
+
+def set_content_hash(apps, schema_editor):
+    DocumentVersion = apps.get_model('unravel', 'DocumentVersion')
+    for version in DocumentVersion.objects.filter(content_hash__isnull=True).iterator():
+        if version.content_text_raw:
+            content_hash = hash_text(version.content_text_raw)
+        elif version.content_file:
+            with version.content_file.open('rb') as content_file:
+                content_hash = hash_file(content_file)
+        else:
+            continue
+        DocumentVersion.objects.filter(pk=version.pk).update(content_hash=content_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0007_documentresultmetric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='content_formatted_hash',
+            field=models.CharField(blank=True, editable=False, help_text='The content hash that the formatted document text was rendered from.', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='SHA-256 hash of the document content.', max_length=64, null=True),
+        ),
+        migrations.RunPython(set_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0008_documentversion_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='documentresult',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='documenttag',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='documentversion',
+            name='updated_date',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0009_updated_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSource',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('updated_date', models.DateTimeField(auto_now=True, db_index=True)),
+                ('archived_date', models.DateTimeField(blank=True, null=True)),
+                ('url', models.URLField(help_text='The url to check for changes.', max_length=1000, unique=True)),
+                ('enabled', models.BooleanField(default=True, help_text='Whether the url is checked for changes.')),
+                ('etag', models.CharField(blank=True, editable=False, help_text='ETag from the last response.', max_length=500, null=True)),
+                ('last_modified', models.CharField(blank=True, editable=False, help_text='Last-Modified from the last response.', max_length=100, null=True)),
+                ('content_hash', models.CharField(blank=True, editable=False, help_text='SHA-256 hash of the last content.', max_length=64, null=True)),
+                ('last_status', models.IntegerField(blank=True, editable=False, help_text='HTTP status of the last check.', null=True)),
+                ('last_error', models.TextField(blank=True, editable=False, help_text='Error from the last check.', null=True)),
+                ('last_checked_date', models.DateTimeField(blank=True, editable=False, help_text='Date the url was last checked.', null=True)),
+                ('last_changed_date', models.DateTimeField(blank=True, editable=False, help_text='Date the content was last found to have changed.', null=True)),
+                ('archived_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unravel_documentsource_archived', related_query_name='unravel_documentsource_archivers', to=settings.AUTH_USER_MODEL)),
+                ('created_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unravel_documentsource_created', related_query_name='unravel_documentsource_creators', to=settings.AUTH_USER_MODEL)),
+                ('document', models.ForeignKey(help_text='The document that is published at the url.', on_delete=django.db.models.deletion.CASCADE, related_name='sources', to='unravel.Document')),
+                ('updated_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unravel_documentsource_updated', related_query_name='unravel_documentsource_updaters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Document Source',
+                'verbose_name_plural': 'Document Sources',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:28
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0010_documentsource'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='change_ratio',
+            field=models.FloatField(blank=True, editable=False, help_text='How much the content changed from the previous version, from 0 (unchanged) to 1 (all changed).', null=True),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='changed_paragraphs',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, editable=False, help_text='Indexes of the paragraphs that are new or changed from the previous version.', null=True, size=None),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='content_fingerprint',
+            field=models.BinaryField(blank=True, help_text='Hash of each paragraph of the document content.', null=True),
+        ),
+    ]
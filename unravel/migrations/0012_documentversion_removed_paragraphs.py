@@ -0,0 +1,19 @@
+# Generated by Django 2.1.2 on 2026-10-19 18:52
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0011_documentversion_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='removed_paragraphs',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, editable=False, help_text='Indexes of the paragraphs of the previous version that are removed or changed in this version.', null=True, size=None),
+        ),
+    ]
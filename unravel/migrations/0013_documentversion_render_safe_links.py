@@ -0,0 +1,21 @@
+# Generated by Django 2.1.2 on 2026-10-19 21:05
+
+from django.db import migrations
+
+
+def clear_formatted_text(apps, schema_editor):
+    # the formatted text could have unsafe links, it is rendered again when it is next shown
+    DocumentVersion = apps.get_model('unravel', 'DocumentVersion')
+    DocumentVersion.objects.filter(content_formatted_hash__isnull=False).update(
+        content_text_formatted=None, content_formatted_hash=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unravel', '0012_documentversion_removed_paragraphs'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_formatted_text, migrations.RunPython.noop),
+    ]
@@ -4,3 +4,5 @@ from .document import Document
 from .document_tag import DocumentTag
 from .document_version import DocumentVersion
 from .document_result import DocumentResult
+from .document_result_metric import DocumentResultMetric
+from .document_source import DocumentSource
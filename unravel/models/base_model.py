@@ -1,8 +1,15 @@
+from django.apps import apps
 from django.conf import settings
 from django.contrib.admin.models import LogEntry, ADDITION, CHANGE, DELETION
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
+from unravel.lib.instrumentation import timed
+from unravel.lib.tiered_cache import get_model_cache
+
+_AUDIT_METRIC = 'unravel_audit_write_seconds'
+_AUDIT_DOCUMENTATION = 'Time to write an admin log entry for a model change.'
+
 
 class BaseModel(models.Model):
     """An abstract base model that provides common attributes and behaviour."""
@@ -12,7 +19,7 @@ class BaseModel(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
         related_name='%(app_label)s_%(class)s_created', related_query_name='%(app_label)s_%(class)s_creators')
 
-    updated_date = models.DateTimeField(auto_now=True)
+    updated_date = models.DateTimeField(auto_now=True, db_index=True)
     updated_user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
         related_name='%(app_label)s_%(class)s_updated', related_query_name='%(app_label)s_%(class)s_updaters')
@@ -27,15 +34,15 @@ class BaseModel(models.Model):
 
     def save(self, *args, **kwargs):
         # add LogEntry log_action
-        request = self._get_request_user(**kwargs)
+        user = self._get_user(**kwargs)
         if self.pk is None:
             # add / create
             msg = [{'added': {
                 'name': str(self._meta.verbose_name),
                 'object': str(self),
             }}]
-            self._log_addition(request, self, msg)
-            self.created_user = request.user
+            self._log_addition(user, self, msg)
+            self.created_user = user
         else:
             # update / modify - fields: list of field names
             msg = [{'added': {
@@ -43,42 +50,57 @@ class BaseModel(models.Model):
                 'object': str(self),
                 'fields': sorted(f.name for f in self._meta.get_fields()),
             }}]
-            self._log_change(request, self, msg)
-            self.updated_user = request.user
+            self._log_change(user, self, msg)
+            self.updated_user = user
 
         # save object
-        if 'request' in kwargs:
-            kwargs.pop('request')
+        kwargs.pop('request', None)
+        kwargs.pop('user', None)
         super(BaseModel, self).save(*args, **kwargs)
 
+        # invalidate cached reads of this model once the change is visible to other connections
+        get_model_cache().invalidate_on_commit(self)
+
         # TODO: include user in save
 
     def delete(self, *args, **kwargs):
         # add LogEntry log_action
-        request = self._get_request_user(**kwargs)
-        self._log_deletion(request, self, str(self))
-        self.archived_user = request.user
+        user = self._get_user(**kwargs)
+        self._log_deletion(user, self, str(self))
+        self.archived_user = user
 
         # delete object
-        if 'request' in kwargs:
-            kwargs.pop('request')
-        return super(BaseModel, self).delete(*args, **kwargs)
+        kwargs.pop('request', None)
+        kwargs.pop('user', None)
+        result = super(BaseModel, self).delete(*args, **kwargs)
+
+        # a delete can cascade to other models, so invalidate cached reads of all the app models
+        for model in apps.get_app_config(self._meta.app_label).get_models():
+            get_model_cache().invalidate_on_commit(model)
+
+        return result
 
-    def _get_request_user(self, **kwargs):
+    def _get_user(self, **kwargs):
+        # the user is from the request, or passed directly when there is no request (e.g. management commands)
+        user = kwargs.get('user')
         request = kwargs.get('request')
-        if not request or not request.user or request.user.is_anonymous:
+        if user is None and request:
+            user = request.user
+        if not user or user.is_anonymous:
             raise ValueError(
-                'Must pass request with valid logged in user for creating, updating, or deleting a model instance.')
-        return request
+                'Must pass request with valid logged in user, or a valid user, '
+                'for creating, updating, or deleting a model instance.')
+        return user
 
-    def _log_addition(self, request, obj, message):
+    @timed(_AUDIT_METRIC, _AUDIT_DOCUMENTATION, action='addition')
+    def _log_addition(self, user, obj, message):
         """
         Log that an object has been successfully added.
 
         Creates an admin LogEntry object.
         """
         return LogEntry.objects.log_action(
-            user_id=request.user.pk,
+            user_id=user.pk,
             content_type_id=ContentType.objects.get_for_model(obj, for_concrete_model=False).pk,
             object_id=obj.pk,
             object_repr=str(obj),
@@ -86,14 +108,15 @@ class BaseModel(models.Model):
             change_message=message,
         )
 
-    def _log_change(self, request, obj, message):
+    @timed(_AUDIT_METRIC, _AUDIT_DOCUMENTATION, action='change')
+    def _log_change(self, user, obj, message):
         """
         Log that an object has been successfully changed.
 
         Creates an admin LogEntry object.
         """
         return LogEntry.objects.log_action(
-            user_id=request.user.pk,
+            user_id=user.pk,
             content_type_id=ContentType.objects.get_for_model(obj, for_concrete_model=False).pk,
             object_id=obj.pk,
             object_repr=str(obj),
@@ -101,7 +124,8 @@ class BaseModel(models.Model):
             change_message=message,
         )
 
-    def _log_deletion(self, request, obj, object_repr):
+    @timed(_AUDIT_METRIC, _AUDIT_DOCUMENTATION, action='deletion')
+    def _log_deletion(self, user, obj, object_repr):
         """
         Log that an object will be deleted. Note that this method must be
         called before the deletion.
@@ -109,7 +133,7 @@ class BaseModel(models.Model):
         Creates an admin LogEntry object.
         """
         return LogEntry.objects.log_action(
-            user_id=request.user.pk,
+            user_id=user.pk,
             content_type_id=ContentType.objects.get_for_model(obj, for_concrete_model=False).pk,
             object_id=obj.pk,
             object_repr=object_repr,
@@ -1,6 +1,7 @@
 from django.db import models
 
 from unravel import models as app_models
+from unravel.lib.text_analysis.sentence_heatmap import SentenceHeatmap
 
 
 class DocumentResult(app_models.BaseModel):
@@ -8,6 +9,22 @@ class DocumentResult(app_models.BaseModel):
 
     documents = models.ManyToManyField(
         app_models.Document, related_name='results', help_text='Documents that were analysed.')
+    document_version = models.ForeignKey(
+        app_models.DocumentVersion, on_delete=models.CASCADE, related_name='results', blank=True, null=True,
+        help_text='The document version that was analysed.')
+
+    analyser_name = models.CharField(
+        max_length=100, null=True, blank=True, help_text='Name of the analyser that created the result.')
+    analyser_version = models.CharField(
+        max_length=50, null=True, blank=True, help_text='Version of the analyser that created the result.')
+    analyser_model_version = models.CharField(
+        max_length=100, null=True, blank=True, help_text='Version of the language model used by the analyser.')
+
+    # FKs: metrics
+
+    # packed per-sentence metrics, see SentenceHeatmap.to_bytes
+    sentence_heatmap = models.BinaryField(
+        blank=True, null=True, editable=False, help_text='Readability metrics for each sentence.')
 
     class Meta:
         verbose_name = 'Document Result'
@@ -15,3 +32,16 @@ class DocumentResult(app_models.BaseModel):
 
     def __str__(self):
         return 'Results for {} documents'.format(self.documents.count())
+
+    def get_sentence_heatmap(self):
+        """Load the sentence heatmap, or None if there is no heatmap."""
+        if self.sentence_heatmap is None:
+            return None
+        return SentenceHeatmap.from_bytes(self.sentence_heatmap)
+
+    def get_sentence_heatmap_slice(self, start: int, end: int):
+        """Get the sentence metrics for the sentences that overlap the character range [start, end)."""
+        heatmap = self.get_sentence_heatmap()
+        if heatmap is None:
+            return []
+        return heatmap.slice(start, end).rows()
@@ -0,0 +1,82 @@
+from django.db import models
+
+from unravel import models as app_models
+
+
+class DocumentResultMetricQuerySet(models.QuerySet):
+
+    def metric_range(self, metric: str, since=None, **value_lookups):
+        """Filter to one metric, optionally by value (gt, gte, lt, lte) and analysed date.
+        These filters are covered by the (metric, value) and (metric, analysed_date) indexes."""
+        query = self.filter(metric=metric)
+        for lookup, value in value_lookups.items():
+            if lookup not in ('gt', 'gte', 'lt', 'lte'):
+                raise ValueError('Unsupported metric value lookup "{}".'.format(lookup))
+            query = query.filter(**{'value__{}'.format(lookup): value})
+        if since is not None:
+            query = query.filter(analysed_date__gte=since)
+        return query
+
+
+class DocumentResultMetric(models.Model):
+    """One numeric metric from a Document Result.
+
+    Metrics are stored as narrow rows so they can be indexed and aggregated.
+    The rows are written in bulk by the analysis tasks and are not audited,
+    so this model does not extend BaseModel."""
+
+    METRICS = (
+        ('sentence_count', 'Sentence count'),
+        ('word_count', 'Word count'),
+        ('syllable_count', 'Syllable count'),
+        ('complex_word_count', 'Complex word count'),
+        ('letter_count', 'Letter count'),
+        ('flesch_reading_ease', 'Flesch Reading Ease'),
+        ('flesch_kincaid_grade_level', 'Flesch-Kincaid Grade Level'),
+        ('gunning_fog_index', 'Gunning Fog Index'),
+        ('automated_readability_index', 'Automated Readability Index'),
+        ('coleman_liau_index', 'Coleman-Liau Index'),
+    )
+
+    result = models.ForeignKey(
+        app_models.DocumentResult, on_delete=models.CASCADE, related_name='metrics',
+        help_text='The result this metric is part of.')
+    document_version = models.ForeignKey(
+        app_models.DocumentVersion, on_delete=models.CASCADE, related_name='metrics', blank=True, null=True,
+        help_text='The document version that was analysed.')
+    metric = models.CharField(
+        max_length=50, null=False, blank=False, choices=METRICS, help_text='The metric name.')
+    value = models.FloatField(
+        null=False, blank=False, help_text='The metric value.')
+    analysed_date = models.DateTimeField(
+        null=False, blank=False, help_text='Date the result was created.')
+
+    objects = DocumentResultMetricQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Document Result Metric'
+        verbose_name_plural = 'Document Result Metrics'
+        unique_together = ('result', 'metric')
+        indexes = [
+            models.Index(fields=['metric', 'value'], name='unravel_metric_value_idx'),
+            models.Index(fields=['metric', 'analysed_date'], name='unravel_metric_date_idx'),
+        ]
+
+    def __str__(self):
+        return '{} {}'.format(self.get_metric_display(), self.value)
+
+    @classmethod
+    def build_for_result(cls, result, values: dict):
+        """Create unsaved metric instances for a result from a dict of metric name to value.
+        Values that are None are skipped."""
+        known = {name for name, _ in cls.METRICS}
+        metrics = []
+        for name, value in values.items():
+            if name not in known:
+                raise ValueError('Unknown metric "{}".'.format(name))
+            if value is None:
+                continue
+            metrics.append(cls(
+                result=result, document_version_id=result.document_version_id, metric=name,
+                value=value, analysed_date=result.created_date))
+        return metrics
@@ -0,0 +1,39 @@
+from django.db import models
+
+from unravel import models as app_models
+
+
+class DocumentSource(app_models.BaseModel):
+    """A url that is checked for changes to a Document.
+    A new Document Version is created when the content at the url changes."""
+
+    document = models.ForeignKey(
+        app_models.Document, on_delete=models.CASCADE, related_name='sources',
+        help_text='The document that is published at the url.')
+    url = models.URLField(
+        max_length=1000, null=False, blank=False, unique=True, help_text='The url to check for changes.')
+    enabled = models.BooleanField(
+        default=True, help_text='Whether the url is checked for changes.')
+
+    # set by the fetch_document_sources command
+    etag = models.CharField(
+        max_length=500, null=True, blank=True, editable=False, help_text='ETag from the last response.')
+    last_modified = models.CharField(
+        max_length=100, null=True, blank=True, editable=False, help_text='Last-Modified from the last response.')
+    content_hash = models.CharField(
+        max_length=64, null=True, blank=True, editable=False, help_text='SHA-256 hash of the last content.')
+    last_status = models.IntegerField(
+        null=True, blank=True, editable=False, help_text='HTTP status of the last check.')
+    last_error = models.TextField(
+        null=True, blank=True, editable=False, help_text='Error from the last check.')
+    last_checked_date = models.DateTimeField(
+        null=True, blank=True, editable=False, help_text='Date the url was last checked.')
+    last_changed_date = models.DateTimeField(
+        null=True, blank=True, editable=False, help_text='Date the content was last found to have changed.')
+
+    class Meta:
+        verbose_name = 'Document Source'
+        verbose_name_plural = 'Document Sources'
+
+    def __str__(self):
+        return '{} ({})'.format(self.document.title, self.url)
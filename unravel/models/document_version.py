@@ -1,7 +1,10 @@
 from django.contrib.postgres import search
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models import DEFERRED
 
 from unravel import models as app_models
+from unravel.lib.content_hash import hash_file, hash_text
 
 
 class DocumentVersion(app_models.BaseModel):
@@ -40,6 +43,27 @@ class DocumentVersion(app_models.BaseModel):
     content_text_formatted = models.TextField(
         null=True, blank=True, help_text='The formatted document text.')
 
+    # the content hash is set when the version is saved, the formatted hash is set by the render task
+    content_hash = models.CharField(
+        max_length=64, null=True, blank=True, editable=False, db_index=True,
+        help_text='SHA-256 hash of the document content.')
+    content_formatted_hash = models.CharField(
+        max_length=64, null=True, blank=True, editable=False,
+        help_text='The content hash that the formatted document text was rendered from.')
+
+    # the change fingerprint and change compared to the previous version are set by celery tasks
+    content_fingerprint = models.BinaryField(
+        null=True, blank=True, editable=False, help_text='Hash of each paragraph of the document content.')
+    change_ratio = models.FloatField(
+        null=True, blank=True, editable=False,
+        help_text='How much the content changed from the previous version, from 0 (unchanged) to 1 (all changed).')
+    changed_paragraphs = ArrayField(
+        models.IntegerField(), null=True, blank=True, editable=False,
+        help_text='Indexes of the paragraphs that are new or changed from the previous version.')
+    removed_paragraphs = ArrayField(
+        models.IntegerField(), null=True, blank=True, editable=False,
+        help_text='Indexes of the paragraphs of the previous version that are removed or changed in this version.')
+
     # the norm and simple content text are PostgreSQL tsvector, they are set by celery tasks
     content_text_norm = search.SearchVectorField(
         blank=True, null=True, editable=False, help_text='The document text normalised using the specified language.')
@@ -56,3 +80,77 @@ class DocumentVersion(app_models.BaseModel):
 
     def __str__(self):
         return '{} ({})'.format(self.document.title, self.last_authored_date)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(DocumentVersion, cls).from_db(db, field_names, values)
+        # keep the loaded content, so the content hash is only calculated again when the content changes
+        instance._loaded_content = instance._get_content_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._is_content_changed():
+            content_hash = self.calculate_content_hash()
+            if content_hash != self.content_hash:
+                # the fingerprint and the change from the previous version are for the old content
+                self.content_fingerprint = None
+                self.change_ratio = None
+                self.changed_paragraphs = None
+                self.removed_paragraphs = None
+            self.content_hash = content_hash
+        is_new = self._state.adding
+
+        super(DocumentVersion, self).save(*args, **kwargs)
+        self._loaded_content = self._get_content_state()
+
+        if self.content_hash and self.content_hash != self.content_formatted_hash:
+            from unravel.tasks import queue_render_document_version
+            content_hash = self.content_hash
+            transaction.on_commit(lambda: queue_render_document_version(self.pk, content_hash))
+
+        if is_new:
+            from unravel.tasks import process_new_document_version
+            transaction.on_commit(lambda: process_new_document_version.delay(self.pk))
+
+    def calculate_content_hash(self):
+        """Calculate the hash of the raw text or the content file."""
+        if self.content_text_raw:
+            return hash_text(self.content_text_raw)
+        if self.content_file:
+            if not self.content_file._committed:
+                # an upload must stay open until the file field stores it, so it is not opened or closed here
+                return hash_file(self.content_file)
+            with self.content_file.open('rb') as content_file:
+                return hash_file(content_file)
+        return None
+
+    def _get_content_state(self):
+        # the file is stored by name, as the file field can be changed in place
+        content_file = self.__dict__.get('content_file', DEFERRED)
+        if content_file is not DEFERRED:
+            content_file = getattr(content_file, 'name', content_file)
+        return self.__dict__.get('content_text_raw', DEFERRED), content_file
+
+    def _is_content_changed(self) -> bool:
+        """Check whether the raw text or the content file changed since the version was loaded or saved."""
+        loaded = getattr(self, '_loaded_content', None)
+        if loaded is None or not self.content_hash:
+            return True
+        loaded_text, loaded_file_name = loaded
+        if loaded_text is DEFERRED or loaded_file_name is DEFERRED:
+            return True
+        return (self.content_text_raw != loaded_text or self.content_file.name != loaded_file_name or
+                not self.content_file._committed)
+
+    def is_formatted_current(self) -> bool:
+        """Check whether the formatted text was rendered from the current content."""
+        return bool(self.content_hash) and self.content_hash == self.content_formatted_hash
+
+    def get_content_text(self) -> str:
+        """Get the document text from the raw text or the content file."""
+        if self.content_text_raw:
+            return self.content_text_raw
+        if self.content_file:
+            with self.content_file.open('rb') as content_file:
+                return content_file.read().decode('utf-8')
+        return ''
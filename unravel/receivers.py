@@ -0,0 +1,15 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from unravel.lib.tiered_cache import get_model_cache
+
+
+@receiver(m2m_changed, dispatch_uid='unravel_invalidate_many_to_many')
+def invalidate_many_to_many(sender, instance, action, model, **kwargs):
+    """Invalidate cached reads of both sides of a many to many relation when it changes,
+    as the change does not save either model."""
+    if action not in ('post_add', 'post_remove', 'post_clear') or sender._meta.app_label != 'unravel':
+        return
+    model_cache = get_model_cache()
+    model_cache.invalidate_on_commit(type(instance))
+    model_cache.invalidate_on_commit(model)
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent when a new document version is different enough to the previous version to notify about.
+# The change ratio is from 0 (unchanged) to 1 (all changed), see ChangeSummary.
+# The changed paragraphs are indexes in the new version, the removed paragraphs are indexes in the previous version.
+document_version_changed = Signal(providing_args=[
+    'document_version_id', 'previous_version_id', 'change_ratio', 'changed_paragraphs', 'removed_paragraphs'])
@@ -0,0 +1,5 @@
+from .analysis_tasks import analyse_document_version
+from .change_tasks import process_new_document_version
+from .language_tasks import detect_document_version_languages
+from .rendering_tasks import queue_render_document_version, render_document_version
+from .search_tasks import update_search_vectors
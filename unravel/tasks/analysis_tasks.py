@@ -0,0 +1,30 @@
+from celery import shared_task
+from django.db import transaction
+
+from unravel import models as app_models
+from unravel.lib.text_analysis import sentence_heatmap
+from unravel.lib.tiered_cache import get_model_cache
+
+
+@shared_task
+def analyse_document_version(document_version_id: int) -> int:
+    """Analyse a document version and store the result. Returns the DocumentResult id."""
+    version = app_models.DocumentVersion.objects.select_related('document').get(pk=document_version_id)
+    heatmap = sentence_heatmap.SentenceHeatmap.from_text(version.get_content_text())
+
+    # There is no request in a celery task, so the result and metrics are written using bulk_create,
+    # which does not call BaseModel.save.
+    result = app_models.DocumentResult(
+        document_version=version,
+        analyser_name=sentence_heatmap.ANALYSER_NAME,
+        analyser_version=sentence_heatmap.ANALYSER_VERSION,
+        sentence_heatmap=heatmap.to_bytes())
+
+    with transaction.atomic():
+        app_models.DocumentResult.objects.bulk_create([result])
+        result.documents.add(version.document)
+        app_models.DocumentResultMetric.objects.bulk_create(
+            app_models.DocumentResultMetric.build_for_result(result, heatmap.summary()))
+
+    get_model_cache().invalidate(app_models.DocumentResult)
+    return result.pk
@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+
+from celery import shared_task
+from django.conf import settings
+
+from unravel import models as app_models
+from unravel.lib.text_analysis.change_fingerprint import ChangeFingerprint
+from unravel.lib.tiered_cache import get_model_cache
+from unravel.signals import document_version_changed
+from unravel.tasks.analysis_tasks import analyse_document_version
+from unravel.tasks.language_tasks import detect_document_version_languages
+
+logger = logging.getLogger(__name__)
+
+
+def _get_fingerprint(version: app_models.DocumentVersion) -> ChangeFingerprint:
+    """Get the stored fingerprint of a version, or build and store it."""
+    if version.content_fingerprint:
+        return ChangeFingerprint.from_bytes(version.content_fingerprint)
+    fingerprint = ChangeFingerprint.from_text(version.get_content_text())
+    app_models.DocumentVersion.objects.filter(pk=version.pk).update(content_fingerprint=fingerprint.to_bytes())
+    return fingerprint
+
+
+@shared_task
+def process_new_document_version(document_version_id: int) -> Optional[float]:
+    """Compare a new document version to the previous version, and decide whether to analyse and notify.
+
+    The language is detected first, as versions from the admin and the fetcher both start with the default language.
+    Returns the change ratio, or None if there is no previous version.
+    """
+    detect_document_version_languages([document_version_id])
+
+    versions = app_models.DocumentVersion.objects.only(
+        'pk', 'document_id', 'created_date', 'content_text_raw', 'content_file', 'content_fingerprint')
+    version = versions.get(pk=document_version_id)
+    previous = versions.filter(
+        document_id=version.document_id, created_date__lte=version.created_date,
+    ).exclude(pk=version.pk).order_by('-created_date', '-id').first()
+
+    fingerprint = _get_fingerprint(version)
+    if previous is None:
+        get_model_cache().invalidate(app_models.DocumentVersion)
+        analyse_document_version.delay(version.pk)
+        return None
+
+    summary = fingerprint.compare(_get_fingerprint(previous))
+    app_models.DocumentVersion.objects.filter(pk=version.pk).update(
+        change_ratio=summary.ratio, changed_paragraphs=summary.added_paragraphs,
+        removed_paragraphs=summary.removed_paragraphs)
+    get_model_cache().invalidate(app_models.DocumentVersion)
+
+    if summary.ratio > settings.UNRAVEL_CHANGE_ANALYSE_RATIO:
+        analyse_document_version.delay(version.pk)
+
+    if summary.ratio > settings.UNRAVEL_CHANGE_NOTIFY_RATIO:
+        logger.info('Document {} version {} changed by {:.1%} ({} paragraphs added or changed, {} removed or changed) '
+                    'from version {}.'.format(version.document_id, version.pk, summary.ratio,
+                                              len(summary.added_paragraphs), len(summary.removed_paragraphs),
+                                              previous.pk))
+        document_version_changed.send(
+            sender=app_models.DocumentVersion, document_version_id=version.pk, previous_version_id=previous.pk,
+            change_ratio=summary.ratio, changed_paragraphs=summary.added_paragraphs,
+            removed_paragraphs=summary.removed_paragraphs)
+
+    return summary.ratio
@@ -0,0 +1,55 @@
+from celery import shared_task
+from django.db.models.functions import Substr
+
+from unravel import models as app_models
+from unravel.lib.text_analysis.language_detection import get_language_detector
+from unravel.lib.tiered_cache import get_model_cache
+from unravel.tasks.search_tasks import update_search_vectors
+
+# Number of characters loaded from each version to detect the language.
+SAMPLE_CHARS = 8000
+
+
+@shared_task
+def detect_document_version_languages(document_version_ids, update_vectors: bool = True) -> dict:
+    """Detect and set the content language for a batch of document versions.
+    Only the start of each text is loaded. The search vectors are updated for versions
+    with a changed language or no search vector. Returns the number of versions changed to each language."""
+    rows = app_models.DocumentVersion.objects.filter(pk__in=document_version_ids).annotate(
+        content_sample=Substr('content_text_raw', 1, SAMPLE_CHARS),
+    ).values_list('pk', 'content_sample', 'content_file', 'content_language')
+
+    ids, texts, current = [], [], []
+    for pk, sample, content_file, language in rows:
+        if not sample and content_file:
+            sample = _read_file_sample(content_file)
+        ids.append(pk)
+        texts.append(sample or '')
+        current.append(language)
+
+    by_language = {}
+    for pk, language, current_language in zip(ids, get_language_detector().detect_many(texts), current):
+        if language != current_language:
+            by_language.setdefault(language, []).append(pk)
+
+    for language, language_ids in by_language.items():
+        app_models.DocumentVersion.objects.filter(pk__in=language_ids).update(content_language=language)
+
+    changed_ids = [pk for language_ids in by_language.values() for pk in language_ids]
+    if changed_ids:
+        get_model_cache().invalidate(app_models.DocumentVersion)
+
+    if update_vectors:
+        missing_ids = app_models.DocumentVersion.objects.filter(
+            pk__in=ids, content_text_norm__isnull=True).values_list('pk', flat=True)
+        vector_ids = set(changed_ids).union(missing_ids)
+        if vector_ids:
+            update_search_vectors(sorted(vector_ids))
+
+    return {language: len(language_ids) for language, language_ids in by_language.items()}
+
+
+def _read_file_sample(name: str) -> str:
+    storage = app_models.DocumentVersion._meta.get_field('content_file').storage
+    with storage.open(name, 'rb') as content_file:
+        return content_file.read(SAMPLE_CHARS * 2).decode('utf-8', errors='ignore')
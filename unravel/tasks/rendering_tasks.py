@@ -0,0 +1,39 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from unravel import models as app_models
+from unravel.lib.content_rendering import ContentRenderer
+from unravel.lib.tiered_cache import get_model_cache
+
+# Seconds before the same render can be queued again, in case the queued task was lost.
+RENDER_QUEUED_TIMEOUT = 600
+
+
+@shared_task
+def render_document_version(document_version_id: int) -> bool:
+    """Render the formatted text for a document version.
+    Returns False if the formatted text was already rendered from the current content."""
+    version = app_models.DocumentVersion.objects.only(
+        'id', 'content_file', 'content_text_raw', 'content_hash', 'content_formatted_hash',
+    ).get(pk=document_version_id)
+    if version.is_formatted_current():
+        return False
+
+    formatted = ContentRenderer().render(version.get_content_text(), version.content_hash)
+
+    # only store the output if the content has not changed while rendering
+    app_models.DocumentVersion.objects.filter(
+        pk=version.pk, content_hash=version.content_hash,
+    ).update(content_text_formatted=formatted, content_formatted_hash=version.content_hash)
+    get_model_cache().invalidate(app_models.DocumentVersion)
+    return True
+
+
+def queue_render_document_version(document_version_id: int, content_hash: str) -> bool:
+    """Queue the render task for a version, unless it was already queued for the same content.
+    Returns False if the render was already queued."""
+    key = 'unravel:render-queued:{}:{}'.format(document_version_id, content_hash)
+    if not cache.add(key, True, RENDER_QUEUED_TIMEOUT):
+        return False
+    render_document_version.delay(document_version_id)
+    return True
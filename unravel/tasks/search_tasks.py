@@ -0,0 +1,41 @@
+import logging
+
+from celery import shared_task
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F, Q, TextField, Value
+
+from unravel import models as app_models
+from unravel.lib.instrumentation import timed
+from unravel.lib.tiered_cache import get_model_cache
+
+logger = logging.getLogger(__name__)
+
+# Versions with no raw text and a content file, the search vectors are built from the file text.
+_FILE_ONLY = (Q(content_text_raw__isnull=True) | Q(content_text_raw='')) & Q(content_file__gt='')
+
+
+def _search_vectors(text) -> dict:
+    return {
+        'content_text_norm': SearchVector(text, config=F('content_language')),
+        'content_text_simple': SearchVector(text, config='simple'),
+    }
+
+
+@shared_task
+def update_search_vectors(document_version_ids) -> int:
+    """Set the normalised and simple search vectors from the raw text or the content file,
+    using each version's language. Returns the number of versions updated."""
+    versions = app_models.DocumentVersion.objects.filter(pk__in=document_version_ids)
+    with timed('unravel_search_vector_update_seconds', 'Time to update the search vectors of a batch of versions.'):
+        updated = versions.exclude(_FILE_ONLY).update(**_search_vectors('content_text_raw'))
+
+        for version in versions.filter(_FILE_ONLY).only('pk', 'content_text_raw', 'content_file'):
+            try:
+                text = version.get_content_text()
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning('Could not read the content file of document version {}: {}'.format(version.pk, e))
+                continue
+            updated += app_models.DocumentVersion.objects.filter(pk=version.pk).update(
+                **_search_vectors(Value(text, output_field=TextField())))
+    get_model_cache().invalidate(app_models.DocumentVersion)
+    return updated
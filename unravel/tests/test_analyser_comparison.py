@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from unravel.lib.text_analysis.analyser_comparison import AnalyserComparison, ComparisonReport
+from unravel.lib.text_analysis.corpus_generator import generate_corpus_text
+from unravel.lib.text_analysis.readability_benchmark import HEATMAP_ANALYSER
+from unravel.management.commands import compare_analysers
+
+
+class AnalyserComparisonTestCase(SimpleTestCase):
+
+    def test_divergence_and_flagged(self):
+        report = ComparisonReport(['nltk', 'spacy'], ['Lix', 'Rix'], threshold=1.0)
+        report.add('nltk', {1: {'Lix': 10.0, 'Rix': 5.0}, 2: {'Lix': 12.0, 'Rix': None}})
+        report.add('spacy', {1: {'Lix': 10.5, 'Rix': 7.0}, 2: {'Lix': 8.0, 'Rix': 4.0}})
+
+        divergence = {row['formula']: row for row in report.divergence()}
+        self.assertEqual(divergence['Lix']['texts'], 2)
+        self.assertAlmostEqual(divergence['Lix']['mean_difference'], 1.75)
+        self.assertAlmostEqual(divergence['Lix']['mean_absolute_difference'], 2.25)
+        self.assertAlmostEqual(divergence['Lix']['max_absolute_difference'], 4.0)
+        self.assertEqual(divergence['Lix']['over_threshold'], 1)
+        self.assertEqual(divergence['Rix']['texts'], 1)
+
+        flagged = report.flagged()
+        self.assertEqual([(item['key'], item['max_difference']) for item in flagged], [(2, 4.0), (1, 2.0)])
+        self.assertEqual(sorted(flagged[1]['formulas']), ['Rix'])
+
+    def test_run_in_worker_processes(self):
+        texts = [(index, generate_corpus_text(2048, seed=index)) for index in range(5)]
+        comparison = AnalyserComparison(
+            [HEATMAP_ANALYSER, 'unravel.tests.MissingTextAnalyser'], formulas=['FleschKincaidGradeLevel'],
+            chunk_size=2)
+        report = comparison.run(iter(texts))
+
+        self.assertEqual(sorted(report.scores), [0, 1, 2, 3, 4])
+        self.assertIsNotNone(report.scores[0]['FleschKincaidGradeLevel'][HEATMAP_ANALYSER])
+        self.assertIn('unravel.tests.MissingTextAnalyser', report.errors)
+        self.assertEqual(report.divergence(), [])
+        self.assertEqual(report.flagged(), [])
+
+    def test_connection_closed_before_texts_are_sent(self):
+        events = []
+
+        class Version:
+            def __init__(self, pk):
+                self.pk = pk
+
+            def get_content_text(self):
+                return 'text {}'.format(self.pk)
+
+        def load(pk__in):
+            events.append('load')
+            return mock.Mock(only=lambda *fields: [Version(pk) for pk in pk__in])
+
+        app_models = mock.Mock()
+        app_models.DocumentVersion.objects.filter.side_effect = load
+        connections = mock.Mock()
+        connections.close_all.side_effect = lambda: events.append('close')
+
+        with mock.patch.object(compare_analysers, 'app_models', app_models), \
+                mock.patch.object(compare_analysers, 'connections', connections):
+            for key, text in compare_analysers.Command()._texts(list(range(150))):
+                events.append('text')
+                # a worker process could be forked now, so the connection must be closed
+                self.assertEqual([event for event in events if event != 'text'][-1], 'close')
+
+        self.assertEqual(events.count('load'), 2)
+        self.assertEqual(events.count('text'), 150)
@@ -0,0 +1,157 @@
+import json
+import unittest
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+
+from unravel import models as app_models
+from unravel.lib import tiered_cache
+from unravel.lib.keyset_pagination import encode_cursor
+from unravel.lib.tiered_cache import TieredCache
+from unravel.models import Document
+from unravel.views import api_views
+
+
+class ListConditionTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.model_cache = TieredCache(shared=LocMemCache('test_api_views', {}), generation_ttl=0)
+        for target, name, value in (
+                (api_views, 'get_model_cache', lambda: self.model_cache),
+                (api_views, '_cached_list_response', lambda *args: HttpResponse('{"results": []}'))):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get(self, **headers):
+        return api_views.document_list(self.factory.get('/documents', **headers))
+
+    def test_not_modified_until_delete(self):
+        with mock.patch.object(tiered_cache.time, 'time', return_value=1000.5):
+            response = self._get()
+            self.assertEqual(response.status_code, 200)
+            etag, last_modified = response['ETag'], response['Last-Modified']
+            self.assertEqual(last_modified, http_date(1001))
+
+            response = self._get(HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 304)
+
+            # a delete does not change the updated date of the remaining documents,
+            # but it invalidates the model, which changes the ETag even in the same second
+            self.model_cache.invalidate(Document)
+            response = self._get(HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+        with mock.patch.object(tiered_cache.time, 'time', return_value=1002.5):
+            self.model_cache.invalidate(Document)
+            response = self._get(HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Last-Modified'], http_date(1003))
+
+
+class ListRequestTestCase(SimpleTestCase):
+    """Invalid list requests are rejected before the database is queried."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _get(self, **params):
+        response = api_views._list_response(
+            self.factory.get('/documents', params), app_models.Document, api_views.DOCUMENT_FIELDS)
+        return response.status_code, json.loads(response.content.decode('utf-8'))
+
+    def test_unknown_fields(self):
+        self.assertEqual(self._get(fields='title,body,metrics'), (400, {'error': 'Unknown fields: body, metrics.'}))
+
+    def test_invalid_limit(self):
+        for limit in ('ten', '0', '-1', str(api_views.MAX_PAGE_SIZE + 1)):
+            with self.subTest(limit=limit):
+                status, content = self._get(limit=limit)
+                self.assertEqual(status, 400)
+                self.assertIn('limit', content['error'])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self._get(after='nope'), (400, {'error': 'Invalid cursor "nope".'}))
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'The unravel models need PostgreSQL.')
+class ListViewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.documents = Document.objects.bulk_create([
+            Document(title='Document {}'.format(index), description='Terms {}'.format(index)) for index in range(5)])
+        cls.tag = app_models.DocumentTag.objects.bulk_create([
+            app_models.DocumentTag(title='Games', name='games')])[0]
+        cls.tag.documents.add(cls.documents[3], cls.documents[1])
+        cls.result = app_models.DocumentResult.objects.bulk_create([
+            app_models.DocumentResult(analyser_name='readability', analyser_version='1')])[0]
+        cls.result.documents.add(cls.documents[0])
+        app_models.DocumentResultMetric.objects.bulk_create([
+            app_models.DocumentResultMetric(
+                result=cls.result, metric=metric, value=value, analysed_date=timezone.now())
+            for metric, value in (('flesch_reading_ease', 50.5), ('gunning_fog', 12.0))])
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.model_cache = TieredCache(shared=LocMemCache('test_api_list_views', {}), generation_ttl=0)
+        patcher = mock.patch.object(api_views, 'get_model_cache', lambda: self.model_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, view, path, **params):
+        response = view(self.factory.get(path, params))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_document_pages(self):
+        ids = [document.pk for document in self.documents]
+
+        page = self._get(api_views.document_list, '/documents', limit=2, fields='title')
+        self.assertEqual(page['results'], [
+            {'id': ids[0], 'title': 'Document 0'}, {'id': ids[1], 'title': 'Document 1'}])
+        self.assertEqual(page['next'], '/documents?limit=2&fields=title&after={}'.format(encode_cursor(ids[1])))
+
+        page = self._get(api_views.document_list, '/documents', limit=2, fields='title', after=encode_cursor(ids[1]))
+        self.assertEqual([item['id'] for item in page['results']], ids[2:4])
+        page = self._get(api_views.document_list, '/documents', limit=2, fields='title', after=encode_cursor(ids[3]))
+        self.assertEqual([item['id'] for item in page['results']], ids[4:])
+        self.assertIsNone(page['next'])
+
+        page = self._get(api_views.document_list, '/documents', limit=1)
+        self.assertEqual(sorted(page['results'][0]), sorted(api_views.DOCUMENT_FIELDS))
+
+    def test_document_pages_cached(self):
+        first = self._get(api_views.document_list, '/documents', fields='title')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get(api_views.document_list, '/documents', fields='title'), first)
+
+        # a new document changes the model generation, so the page is built again
+        Document.objects.bulk_create([Document(title='Document 5')])
+        self.model_cache.invalidate(Document)
+        page = self._get(api_views.document_list, '/documents', fields='title')
+        self.assertEqual(len(page['results']), 6)
+
+    def test_tag_documents(self):
+        page = self._get(api_views.tag_list, '/tags/', fields='name,documents')
+        self.assertEqual(page['results'], [{
+            'id': self.tag.pk, 'name': 'games', 'documents': [self.documents[1].pk, self.documents[3].pk]}])
+
+    def test_result_documents_and_metrics(self):
+        page = self._get(api_views.result_list, '/annotations', fields='analyser_name,documents,metrics')
+        self.assertEqual(page['results'], [{
+            'id': self.result.pk, 'analyser_name': 'readability', 'documents': [self.documents[0].pk],
+            'metrics': {'flesch_reading_ease': 50.5, 'gunning_fog': 12.0}}])
+
+    def test_empty_related_fields(self):
+        result = app_models.DocumentResult.objects.bulk_create([app_models.DocumentResult()])[0]
+        page = self._get(api_views.result_list, '/annotations', fields='documents,metrics', after=encode_cursor(
+            self.result.pk))
+        self.assertEqual(page['results'], [{'id': result.pk, 'documents': [], 'metrics': {}}])
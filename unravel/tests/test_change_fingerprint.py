@@ -0,0 +1,106 @@
+import time
+
+from django.test import SimpleTestCase
+
+from unravel.lib.text_analysis.change_fingerprint import ChangeFingerprint, match_paragraphs, split_paragraphs
+
+
+class ChangeFingerprintTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.paragraphs = [
+            'Clause {}. The Licensee must not copy, modify, or distribute the software '
+            'except as permitted by this agreement.'.format(index) for index in range(20)]
+        cls.sample_text = '\n\n'.join(cls.paragraphs)
+
+    def test_split_paragraphs(self):
+        text = '\n\nFirst line\nsecond line.\n \n\n  Second paragraph.\n\n\n'
+        paragraphs = [text[start:end] for start, end in split_paragraphs(text)]
+        self.assertEqual(paragraphs, ['First line\nsecond line.', 'Second paragraph.'])
+
+    def test_whitespace_change(self):
+        previous = ChangeFingerprint.from_text(self.sample_text)
+        current = ChangeFingerprint.from_text('\n\n\n'.join(
+            paragraph.replace(' ', '\n', 3) for paragraph in self.paragraphs))
+
+        summary = current.compare(previous)
+        self.assertEqual(summary.ratio, 0)
+        self.assertFalse(summary.changed)
+
+    def test_paragraph_changes(self):
+        paragraphs = list(self.paragraphs)
+        paragraphs[3] = paragraphs[3].replace('must not', 'may')
+        paragraphs.insert(10, 'A new clause about arbitration.')
+        del paragraphs[15]
+
+        previous = ChangeFingerprint.from_text(self.sample_text)
+        summary = ChangeFingerprint.from_text('\n\n'.join(paragraphs)).compare(previous)
+        self.assertEqual(summary.added_paragraphs, [3, 10])
+        self.assertEqual(summary.removed_paragraphs, [3, 14])
+        self.assertTrue(0 < summary.ratio < 0.2)
+
+    def test_rewrite(self):
+        previous = ChangeFingerprint.from_text(self.sample_text)
+        summary = ChangeFingerprint.from_text(self.sample_text.upper()).compare(previous)
+        self.assertEqual(summary.ratio, 1)
+        self.assertEqual(summary.added_paragraphs, list(range(20)))
+
+    def test_empty_previous_version(self):
+        summary = ChangeFingerprint.from_text(self.sample_text).compare(ChangeFingerprint.from_text(''))
+        self.assertEqual(summary.ratio, 1)
+        self.assertEqual(len(summary.added_paragraphs), 20)
+
+    def test_bytes_round_trip(self):
+        fingerprint = ChangeFingerprint.from_text(self.sample_text)
+        restored = ChangeFingerprint.from_bytes(fingerprint.to_bytes())
+        self.assertEqual(restored.hashes, fingerprint.hashes)
+        self.assertEqual(restored.lengths, fingerprint.lengths)
+        self.assertEqual(restored.compare(fingerprint).ratio, 0)
+
+        with self.assertRaises(ValueError):
+            ChangeFingerprint.from_bytes(b'XXXX\x00\x00\x00\x00')
+
+    def test_removed_only(self):
+        paragraphs = list(self.paragraphs)
+        del paragraphs[5:7]
+
+        previous = ChangeFingerprint.from_text(self.sample_text)
+        summary = ChangeFingerprint.from_text('\n\n'.join(paragraphs)).compare(previous)
+        self.assertEqual(summary.added_paragraphs, [])
+        self.assertEqual(summary.removed_paragraphs, [5, 6])
+        self.assertTrue(summary.changed)
+        self.assertTrue(0 < summary.ratio < 0.2)
+
+    def test_repeated_paragraphs(self):
+        # list markers such as "(a)" repeat many times in legal text
+        previous = ['Clause {}.'.format(index // 5) if index % 5 == 0 else '(' + 'abcd'[index % 5 - 1] + ')'
+                    for index in range(100)]
+        current = list(previous)
+        del current[42]
+        current.insert(80, '(e)')
+
+        summary = ChangeFingerprint.from_text('\n\n'.join(current)).compare(
+            ChangeFingerprint.from_text('\n\n'.join(previous)))
+        self.assertEqual(summary.added_paragraphs, [80])
+        self.assertEqual(len(summary.removed_paragraphs), 1)
+
+    def test_repeated_paragraphs_time_is_bounded(self):
+        # a quadratic or worse diff takes minutes for this
+        previous = ChangeFingerprint.from_text('\n\n'.join(['(a)', '(b)'] * 2500))
+        current = ChangeFingerprint.from_text('\n\n'.join(['(a)', '(a)', '(b)'] * 1667))
+
+        started = time.perf_counter()
+        summary = current.compare(previous)
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertTrue(summary.changed)
+
+    def test_match_paragraphs(self):
+        old = [1, 2, 3, 4, 5, 3, 6]
+        new = [1, 3, 4, 7, 5, 3, 6, 8]
+        matches = match_paragraphs(old, new)
+        self.assertEqual(matches, [(0, 0), (2, 1), (3, 2), (4, 4), (5, 5), (6, 6)])
+        self.assertEqual(match_paragraphs([], new), [])
+        self.assertEqual(match_paragraphs(old, []), [])
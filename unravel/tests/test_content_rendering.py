@@ -0,0 +1,100 @@
+import re
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from docutils.core import publish_parts
+
+from unravel.lib import content_rendering
+from unravel.lib.content_rendering import ContentRenderer
+from unravel.tasks import rendering_tasks
+
+
+class ContentRenderingTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.sample_text = (
+            "Terms of Service\n"
+            "================\n\n"
+            "These terms apply to *all* users, see Privacy_ and the notes [1]_.\n\n"
+            "Privacy\n"
+            "-------\n\n"
+            "We collect data.\n\n"
+            "Cookies\n"
+            "~~~~~~~\n\n"
+            "We use cookies.\n\n"
+            "Termination\n"
+            "-----------\n\n"
+            "We may end this agreement.\n\n"
+            "Cookies\n"
+            "~~~~~~~\n\n"
+            "Cookies are removed.\n\n"
+            ".. [1] Notes about the terms.\n")
+
+    def test_render_matches_whole_document(self):
+        renderer = ContentRenderer(render_cache=LocMemCache('test_rendering_whole', {}))
+        html = renderer.render(self.sample_text)
+
+        expected = publish_parts(
+            source=self.sample_text, reader=content_rendering._SafeReader(), writer_name='html',
+            settings_overrides=content_rendering._DOCUTILS_SETTINGS)['fragment']
+        self.assertEqual(html, expected)
+
+        self.assertIn('<h2>Terms of Service</h2>', html)
+        self.assertIn('<h3>Privacy</h3>', html)
+        self.assertIn('<h4>Cookies</h4>', html)
+        self.assertIn('<em>all</em>', html)
+        self.assertIn('href="#privacy"', html)
+        self.assertIn('class="footnote-reference', html)
+        self.assertNotIn('Privacy_', html)
+        self.assertNotIn('[1]_', html)
+        # the repeated title gets a different id
+        ids = re.findall(r' id="([^"]+)"', html)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_render_cached_by_content_hash(self):
+        renderer = ContentRenderer(render_cache=LocMemCache('test_rendering_cache', {}))
+
+        with mock.patch.object(
+                content_rendering, 'render_document', wraps=content_rendering.render_document) as render:
+            html = renderer.render(self.sample_text, 'abc')
+            self.assertEqual(renderer.render(self.sample_text, 'abc'), html)
+            self.assertEqual(render.call_count, 1)
+
+            renderer.render(self.sample_text.replace('We collect data.', 'We collect and share data.'))
+            self.assertEqual(render.call_count, 2)
+
+    def test_render_disables_raw(self):
+        renderer = ContentRenderer(render_cache=LocMemCache('test_rendering_raw', {}))
+        html = renderer.render('Text\n\n.. raw:: html\n\n   <script>alert(1)</script>\n')
+        self.assertNotIn('<script>', html)
+
+    def test_render_removes_unsafe_uris(self):
+        renderer = ContentRenderer(render_cache=LocMemCache('test_rendering_uris', {}))
+        html = renderer.render(
+            'See `terms <javascript:alert(document.cookie)>`_, `policy`_, `site <https://vendor.example/>`_, '
+            'legal@vendor.example, and Notes_.\n\n'
+            '.. _policy: JavaScript:alert(1)\n\n'
+            '.. image:: data:text/html,<script>alert(2)</script>\n\n'
+            '.. image:: https://vendor.example/logo.png\n\n'
+            'Notes\n-----\n')
+
+        self.assertNotIn('javascript', html.lower())
+        self.assertNotIn('data:', html)
+        self.assertIn('<span>terms</span>', html)
+        self.assertIn('<span>policy</span>', html)
+        self.assertIn('href="https://vendor.example/"', html)
+        self.assertIn('href="mailto:legal&#64;vendor.example"', html)
+        self.assertIn('href="#notes"', html)
+        self.assertIn('src="https://vendor.example/logo.png"', html)
+
+    def test_queue_render_once(self):
+        with mock.patch.object(rendering_tasks, 'cache', LocMemCache('test_rendering_queue', {})), \
+                mock.patch.object(rendering_tasks.render_document_version, 'delay') as delay:
+            self.assertTrue(rendering_tasks.queue_render_document_version(1, 'abc'))
+            self.assertFalse(rendering_tasks.queue_render_document_version(1, 'abc'))
+            self.assertTrue(rendering_tasks.queue_render_document_version(1, 'def'))
+            self.assertEqual(delay.call_count, 2)
@@ -0,0 +1,121 @@
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase
+
+from unravel import models as app_models
+from unravel.lib.content_hash import hash_bytes, hash_text
+from unravel.views import content_views
+
+
+class DocumentVersionContentTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.text = 'These terms apply to all users.'
+        self.file_data = b'The terms in the file.'
+
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        storage = FileSystemStorage(location=self.media.name)
+        storage.save('terms.txt', ContentFile(self.file_data))
+        storage.save('terms page.html', ContentFile(b'<script>alert(document.cookie)</script>'))
+        field = app_models.DocumentVersion._meta.get_field('content_file')
+        self._patch(field, 'storage', storage)
+
+    def _patch(self, target, name, value):
+        patcher = mock.patch.object(target, name, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _version(self, raw, content_file):
+        data = raw.encode('utf-8') if raw else self.file_data
+        values = {'id': 1, 'content_file': content_file, 'content_hash': hash_bytes(data)}
+        self._patch(content_views, 'get_cached_document_version_values', lambda *args: values)
+        self._patch(content_views, '_get_raw_text', lambda version_id: raw)
+        return '"{}"'.format(values['content_hash'])
+
+    def _get(self, **headers):
+        response = content_views.document_version_content(self.factory.get('/documents/1/content', **headers), 1)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_text(self):
+        etag = self._version(self.text, None)
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.text.encode('utf-8'))
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Content-Length'], str(len(self.text)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_file(self):
+        etag = self._version('', 'terms.txt')
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.file_data)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=UTF-8''terms.txt")
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    def test_html_file_downloaded(self):
+        self._version('', 'terms page.html')
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=UTF-8''terms%20page.html")
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    def test_text_shown(self):
+        self._version(self.text, None)
+        response, body = self._get()
+        self.assertFalse(response.has_header('Content-Disposition'))
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    def test_text_and_file_serve_hashed_text(self):
+        # the content hash is calculated from the raw text when it is set, so the text is served
+        etag = self._version(self.text, 'terms.txt')
+        self.assertEqual(etag, '"{}"'.format(hash_text(self.text)))
+        response, body = self._get()
+        self.assertEqual(body, self.text.encode('utf-8'))
+
+    def test_range(self):
+        for raw, content_file, data in ((self.text, None, self.text.encode('utf-8')),
+                                        ('', 'terms.txt', self.file_data)):
+            with self.subTest(content_file=content_file):
+                etag = self._version(raw, content_file)
+                response, body = self._get(HTTP_RANGE='bytes=4-8')
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(body, data[4:9])
+                self.assertEqual(response['Content-Range'], 'bytes 4-8/{}'.format(len(data)))
+                self.assertEqual(response['Content-Length'], '5')
+
+                response, body = self._get(HTTP_RANGE='bytes=4-8', HTTP_IF_RANGE=etag)
+                self.assertEqual(response.status_code, 206)
+
+                response, body = self._get(HTTP_RANGE='bytes=4-8', HTTP_IF_RANGE='"other"')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(body, data)
+
+    def test_range_not_satisfiable(self):
+        for raw, content_file, data in ((self.text, None, self.text.encode('utf-8')),
+                                        ('', 'terms.txt', self.file_data)):
+            with self.subTest(content_file=content_file):
+                self._version(raw, content_file)
+                response, body = self._get(HTTP_RANGE='bytes=1000-')
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */{}'.format(len(data)))
+
+    def test_not_modified(self):
+        for raw, content_file in ((self.text, None), ('', 'terms.txt')):
+            with self.subTest(content_file=content_file):
+                etag = self._version(raw, content_file)
+                response, body = self._get(HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(body, b'')
+
+                response, body = self._get(HTTP_IF_NONE_MATCH='"other"')
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,175 @@
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from unravel import models as app_models
+from unravel.lib import corpus_snapshot
+from unravel.lib.content_hash import hash_text
+from unravel.lib.corpus_snapshot import export_snapshot, import_snapshot, snapshot_tables
+from unravel.lib.text_analysis.corpus_generator import generate_corpus_text
+
+logger = logging.getLogger(__name__)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Snapshots are imported with PostgreSQL COPY.')
+class CorpusSnapshotTestCase(TransactionTestCase):
+    """Export a snapshot from PostgreSQL, delete everything, import it again, and compare the rows."""
+
+    def _seed(self, documents: int = 3, versions: int = 2, size: int = 2048):
+        now = timezone.now()
+        document_objects = app_models.Document.objects.bulk_create([
+            app_models.Document(title='Document {}'.format(index), description='Terms "{}", v1'.format(index))
+            for index in range(documents)])
+        tags = app_models.DocumentTag.objects.bulk_create([
+            app_models.DocumentTag(title='Tag {}'.format(index), name='tag-{}'.format(index)) for index in range(2)])
+        tag_links = app_models.DocumentTag.documents.through
+        tag_links.objects.bulk_create([
+            tag_links(documenttag_id=tags[index % 2].pk, document_id=document.pk)
+            for index, document in enumerate(document_objects)])
+
+        # the first version of every document has the same text, so it is stored once in the snapshot
+        shared_text = generate_corpus_text(size, seed=0)
+        version_objects = []
+        for index, document in enumerate(document_objects):
+            for number in range(versions):
+                text = shared_text if number == 0 else generate_corpus_text(size, seed=index * 100 + number)
+                version_objects.append(app_models.DocumentVersion(
+                    document=document, content_text_raw=text, content_hash=hash_text(text),
+                    last_authored_date=now, content_fingerprint=b'\x00\x01\xff',
+                    change_ratio=0.25 if number else None, changed_paragraphs=[1, 2] if number else None,
+                    removed_paragraphs=[] if number else None))
+        # an empty text stays empty, and a version with only a content file keeps the file name
+        version_objects.append(app_models.DocumentVersion(
+            document=document_objects[0], content_text_raw='', content_file='document/2018/10/01/terms.txt',
+            content_hash='0' * 64))
+        version_objects.append(app_models.DocumentVersion(document=document_objects[0], content_text_raw=None))
+        app_models.DocumentVersion.objects.bulk_create(version_objects)
+
+        app_models.DocumentSource.objects.bulk_create([
+            app_models.DocumentSource(
+                document=document_objects[0], url='https://vendor.example/terms', enabled=False,
+                etag='"terms"', last_status=200, last_checked_date=now)])
+        result = app_models.DocumentResult.objects.bulk_create([
+            app_models.DocumentResult(
+                document_version=version_objects[0], analyser_name='sentence_heatmap', analyser_version='1',
+                sentence_heatmap=b'UHM1\x00\x00')])[0]
+        result.documents.add(document_objects[0])
+        app_models.DocumentResultMetric.objects.bulk_create([
+            app_models.DocumentResultMetric(
+                result=result, document_version=version_objects[0], metric='flesch_reading_ease', value=50.5,
+                analysed_date=now)])
+
+    def _rows(self):
+        rows = {}
+        for table in snapshot_tables():
+            values = table.model.objects.order_by('pk').values_list(*table.columns)
+            rows[table.name] = [
+                tuple(bytes(value) if isinstance(value, memoryview) else value for value in row) for row in values]
+        return rows
+
+    def _delete_all(self):
+        for model in (app_models.DocumentResultMetric, app_models.DocumentResult, app_models.DocumentSource,
+                      app_models.DocumentVersion, app_models.DocumentTag, app_models.Document):
+            model.objects.all().delete()
+
+    def test_round_trip(self):
+        self._seed()
+        expected = self._rows()
+
+        f = io.BytesIO()
+        counts = export_snapshot(f, chunk_rows=4)
+        self.assertEqual(counts['documentversion'], 8)
+        # the shared text, the three other texts, and no empty or null texts
+        self.assertEqual(counts['content'], 4)
+
+        self._delete_all()
+        f.seek(0)
+        with mock.patch.object(corpus_snapshot, 'queue_render_document_version', return_value=True) as queue:
+            counts = import_snapshot(f)
+        self.assertEqual(counts['documentversion'], 8)
+        self.assertEqual(self._rows(), expected)
+
+        versions = app_models.DocumentVersion.objects.order_by('pk')
+        self.assertEqual(versions.filter(content_text_raw='').count(), 1)
+        self.assertEqual(versions.filter(content_text_raw__isnull=True).count(), 1)
+        self.assertEqual(versions.filter(content_text_norm__isnull=False).count(), 8)
+
+        # the renders are queued for every version with content
+        self.assertEqual(
+            sorted(call[0] for call in queue.call_args_list),
+            list(versions.filter(content_hash__isnull=False).values_list('pk', 'content_hash')))
+
+        # the id sequences continue after the imported ids
+        document = app_models.Document.objects.bulk_create([app_models.Document(title='New')])[0]
+        self.assertGreater(document.pk, max(row[0] for row in expected['document']))
+
+    def test_export_ignores_concurrent_writes(self):
+        self._seed(documents=1, versions=1)
+        version = app_models.DocumentVersion.objects.filter(content_text_raw__gt='').get()
+        expected = self._rows()
+
+        def change_text():
+            # a thread has its own database connection, so this commits while the export is running
+            app_models.DocumentVersion.objects.filter(pk=version.pk).update(content_text_raw='Changed terms.')
+            app_models.DocumentSource.objects.all().delete()
+            connections.close_all()
+
+        def progress(name, count):
+            if name == 'documentversion':
+                thread = threading.Thread(target=change_text)
+                thread.start()
+                thread.join()
+
+        f = io.BytesIO()
+        export_snapshot(f, progress=progress)
+        self.assertEqual(app_models.DocumentVersion.objects.get(pk=version.pk).content_text_raw, 'Changed terms.')
+
+        self._delete_all()
+        f.seek(0)
+        import_snapshot(f, update_vectors=False, render=False)
+        self.assertEqual(self._rows(), expected)
+
+    def test_import_refuses_tables_with_rows(self):
+        self._seed(documents=1)
+        f = io.BytesIO()
+        export_snapshot(f)
+        f.seek(0)
+        with self.assertRaisesMessage(ValueError, 'Not empty: document'):
+            import_snapshot(f, update_vectors=False, render=False)
+
+    def test_timing_against_loaddata(self):
+        self._seed(documents=200, versions=3, size=5 * 1024)
+        labels = ['unravel.document', 'unravel.documenttag', 'unravel.documentversion', 'unravel.documentsource',
+                  'unravel.documentresult', 'unravel.documentresultmetric']
+
+        with tempfile.TemporaryDirectory() as directory:
+            fixture = os.path.join(directory, 'corpus.json')
+            call_command('dumpdata', *labels, output=fixture, verbosity=0)
+            snapshot = io.BytesIO()
+            export_snapshot(snapshot)
+
+            self._delete_all()
+            started = time.perf_counter()
+            call_command('loaddata', fixture, verbosity=0)
+            loaddata_seconds = time.perf_counter() - started
+
+            self._delete_all()
+            snapshot.seek(0)
+            started = time.perf_counter()
+            counts = import_snapshot(snapshot, update_vectors=False, render=False)
+            snapshot_seconds = time.perf_counter() - started
+
+        # the timing depends on the machine, so it is reported and not checked
+        logger.info('Imported {} versions in {:.2f}s with loaddata and {:.2f}s from a snapshot ({:.1f}x).'.format(
+            counts['documentversion'], loaddata_seconds, snapshot_seconds, loaddata_seconds / snapshot_seconds))
+        self.assertEqual(counts['documentversion'], 602)
@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from unravel import models as app_models
+from unravel.lib.text_analysis import sentence_heatmap
+from unravel.models import DocumentResult, DocumentResultMetric
+from unravel.tasks import analyse_document_version
+
+
+class DocumentResultMetricTestCase(SimpleTestCase):
+
+    def test_metric_range(self):
+        since = datetime(2018, 10, 1, tzinfo=timezone.utc)
+        query = str(DocumentResultMetric.objects.metric_range('flesch_reading_ease', since, gte=30, lt=50).query)
+        self.assertIn('"metric" = flesch_reading_ease', query)
+        self.assertIn('"value" >= 30', query)
+        self.assertIn('"value" < 50', query)
+        self.assertIn('"analysed_date" >= 2018-10-01', query)
+
+    def test_metric_range_rejects_lookup(self):
+        for lookup in ('exact', 'in', 'value__gt', 'isnull'):
+            with self.subTest(lookup=lookup), self.assertRaisesMessage(ValueError, lookup):
+                DocumentResultMetric.objects.metric_range('word_count', **{lookup: 1})
+
+    def test_build_for_result(self):
+        analysed = datetime(2018, 10, 1, tzinfo=timezone.utc)
+        result = DocumentResult(pk=3, document_version_id=7, created_date=analysed)
+        metrics = DocumentResultMetric.build_for_result(
+            result, {'word_count': 120, 'flesch_reading_ease': None, 'gunning_fog_index': 11.5})
+
+        self.assertEqual(
+            [(metric.result_id, metric.document_version_id, metric.metric, metric.value, metric.analysed_date)
+             for metric in metrics],
+            [(3, 7, 'word_count', 120, analysed), (3, 7, 'gunning_fog_index', 11.5, analysed)])
+        self.assertTrue(all(metric.pk is None for metric in metrics))
+
+    def test_build_for_result_rejects_unknown_metric(self):
+        result = DocumentResult(pk=3, document_version_id=7)
+        with self.assertRaisesMessage(ValueError, 'Unknown metric "reading_time".'):
+            DocumentResultMetric.build_for_result(result, {'word_count': 120, 'reading_time': None})
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'The unravel models need PostgreSQL.')
+class AnalyseDocumentVersionTestCase(TestCase):
+
+    def test_result_and_metrics_written(self):
+        user = get_user_model().objects.create_user('editor')
+        document = app_models.Document(title='Terms')
+        document.save(user=user)
+        text = 'These terms apply to all users. You must keep your password secret. We may close your account.'
+        version = app_models.DocumentVersion(document=document, content_text_raw=text)
+        version.save(user=user)
+
+        with mock.patch.object(app_models.DocumentResult, 'save', side_effect=AssertionError('audited save')):
+            result_id = analyse_document_version(version.pk)
+
+        result = DocumentResult.objects.get(pk=result_id)
+        self.assertEqual(result.document_version_id, version.pk)
+        self.assertEqual(result.analyser_name, sentence_heatmap.ANALYSER_NAME)
+        self.assertEqual(list(result.documents.values_list('pk', flat=True)), [document.pk])
+
+        summary = sentence_heatmap.SentenceHeatmap.from_text(text).summary()
+        metrics = DocumentResultMetric.objects.filter(result=result)
+        self.assertEqual(
+            dict(metrics.values_list('metric', 'value')),
+            {name: value for name, value in summary.items() if value is not None})
+        self.assertEqual(set(metrics.values_list('document_version_id', 'analysed_date')),
+                         {(version.pk, result.created_date)})
+        self.assertEqual(
+            list(DocumentResultMetric.objects.metric_range('word_count', gte=1).values_list('result_id', flat=True)),
+            [result.pk])
@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from unravel import models as app_models
+from unravel.lib.content_hash import hash_bytes, hash_text
+from unravel.models import document_version
+
+
+class _StorageMixin:
+
+    def _use_storage(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.storage = FileSystemStorage(location=self.media.name)
+        patcher = mock.patch.object(app_models.DocumentVersion._meta.get_field('content_file'), 'storage', self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class DocumentVersionContentHashTestCase(_StorageMixin, SimpleTestCase):
+
+    def setUp(self):
+        self._use_storage()
+        self.file_data = b'The terms in the file.'
+
+        # the database save is replaced by storing the file, which is what the model save does before the insert
+        def store_files(version, *args, **kwargs):
+            version.content_file = version._meta.get_field('content_file').pre_save(version, version._state.adding)
+            version._state.adding = False
+
+        for target, name, value in (
+                (app_models.BaseModel, 'save', store_files),
+                (document_version, 'transaction', mock.Mock())):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_save_uploaded_file(self):
+        version = app_models.DocumentVersion(content_file=SimpleUploadedFile('terms.txt', self.file_data))
+        version.save()
+
+        self.assertEqual(version.content_hash, hash_bytes(self.file_data))
+        self.assertTrue(version.content_file._committed)
+        with self.storage.open(version.content_file.name, 'rb') as stored:
+            self.assertEqual(stored.read(), self.file_data)
+
+    def test_hash_only_changed_content(self):
+        self.storage.save('terms.txt', ContentFile(self.file_data))
+        version = app_models.DocumentVersion.from_db(
+            'default', ['id', 'content_text_raw', 'content_file', 'content_hash', 'content_formatted_hash'],
+            [1, '', 'terms.txt', hash_bytes(self.file_data), None])
+
+        with mock.patch.object(version, 'calculate_content_hash', wraps=version.calculate_content_hash) as calculate:
+            version.last_authored_date = None
+            version.save()
+            self.assertEqual(calculate.call_count, 0)
+
+            version.content_text_raw = 'The new terms.'
+            version.save()
+            self.assertEqual(calculate.call_count, 1)
+            self.assertEqual(version.content_hash, hash_text('The new terms.'))
+
+            version.save()
+            self.assertEqual(calculate.call_count, 1)
+
+            version.content_text_raw = ''
+            version.content_file = SimpleUploadedFile('new-terms.txt', b'The newer terms.')
+            version.save()
+            self.assertEqual(calculate.call_count, 2)
+            self.assertEqual(version.content_hash, hash_bytes(b'The newer terms.'))
+
+    def test_changed_content_resets_fingerprint(self):
+        version = app_models.DocumentVersion.from_db(
+            'default', ['id', 'content_text_raw', 'content_file', 'content_hash', 'content_formatted_hash',
+                        'content_fingerprint', 'change_ratio', 'changed_paragraphs', 'removed_paragraphs'],
+            [1, 'The terms.', '', hash_text('The terms.'), None, b'\x00\x01', 0.5, [0], [1]])
+
+        version.content_text_raw = 'The terms.'
+        version.save()
+        self.assertEqual(version.content_fingerprint, b'\x00\x01')
+        self.assertEqual(version.change_ratio, 0.5)
+
+        version.content_text_raw = 'The new terms.'
+        version.save()
+        self.assertIsNone(version.content_fingerprint)
+        self.assertIsNone(version.change_ratio)
+        self.assertIsNone(version.changed_paragraphs)
+        self.assertIsNone(version.removed_paragraphs)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Document versions need PostgreSQL.')
+class DocumentVersionSaveTestCase(_StorageMixin, TestCase):
+
+    def test_save_uploaded_file(self):
+        self._use_storage()
+        user = get_user_model().objects.create_user('editor')
+        document = app_models.Document(title='Terms')
+        document.save(user=user)
+
+        version = app_models.DocumentVersion(
+            document=document, content_file=SimpleUploadedFile('terms.txt', b'The terms in the file.'))
+        version.save(user=user)
+
+        version = app_models.DocumentVersion.objects.get(pk=version.pk)
+        self.assertEqual(version.content_hash, hash_bytes(b'The terms in the file.'))
+        self.assertEqual(version.get_content_text(), 'The terms in the file.')
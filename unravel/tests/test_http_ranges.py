@@ -0,0 +1,31 @@
+import io
+
+from django.test import SimpleTestCase
+
+from unravel.lib.http_ranges import RangeNotSatisfiable, iter_file_range, parse_range_header
+
+
+class HttpRangesTestCase(SimpleTestCase):
+
+    def test_parse_range_header(self):
+        self.assertIsNone(parse_range_header(None, 100))
+        self.assertIsNone(parse_range_header('items=0-10', 100))
+        self.assertIsNone(parse_range_header('bytes=0-10,20-30', 100))
+        self.assertIsNone(parse_range_header('bytes=20-10', 100))
+        self.assertEqual(parse_range_header('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range_header('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=90-200', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-200', 100), (0, 99))
+
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range_header('bytes=100-', 100)
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range_header('bytes=-0', 100)
+
+    def test_iter_file_range(self):
+        content = io.BytesIO(bytes(range(256)) * 10)
+        chunks = list(iter_file_range(content, 5, 1004, chunk_size=100))
+        self.assertEqual(len(chunks), 10)
+        self.assertEqual(b''.join(chunks), (bytes(range(256)) * 10)[5:1005])
+        self.assertTrue(content.closed)
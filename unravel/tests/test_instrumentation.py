@@ -0,0 +1,113 @@
+import threading
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from unravel.lib.instrumentation import MetricsRegistry, QueryTimer, SamplingProfiler, get_registry, timed
+from unravel.middleware import MetricsMiddleware
+
+
+class InstrumentationTestCase(SimpleTestCase):
+
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('unravel_test_seconds', 'Test timings.', buckets=(0.1, 1.0))
+        histogram.observe(0.05, view='a')
+        histogram.observe(0.5, view='a')
+        histogram.observe(5, view='a')
+        histogram.observe(0.1, view='b')
+
+        self.assertEqual(histogram.count(view='a'), 3)
+        self.assertAlmostEqual(histogram.sum(view='a'), 5.55)
+        self.assertEqual(registry.histogram('unravel_test_seconds', 'Test timings.'), histogram)
+
+        self.assertEqual(registry.render().splitlines(), [
+            '# HELP unravel_test_seconds Test timings.',
+            '# TYPE unravel_test_seconds histogram',
+            'unravel_test_seconds_bucket{view="a",le="0.1"} 1',
+            'unravel_test_seconds_bucket{view="a",le="1.0"} 2',
+            'unravel_test_seconds_bucket{view="a",le="+Inf"} 3',
+            'unravel_test_seconds_sum{view="a"} 5.55',
+            'unravel_test_seconds_count{view="a"} 3',
+            'unravel_test_seconds_bucket{view="b",le="0.1"} 1',
+            'unravel_test_seconds_bucket{view="b",le="1.0"} 1',
+            'unravel_test_seconds_bucket{view="b",le="+Inf"} 1',
+            'unravel_test_seconds_sum{view="b"} 0.1',
+            'unravel_test_seconds_count{view="b"} 1',
+        ])
+
+    def test_counter_and_extra(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('unravel_test_total', 'Test count.')
+        counter.inc(task='a "quoted" name')
+        counter.inc(2, task='a "quoted" name')
+        self.assertEqual(counter.value(task='a "quoted" name'), 3)
+
+        lines = registry.render({'unravel_cache_misses': 4}).splitlines()
+        self.assertIn('unravel_test_total{task="a \\"quoted\\" name"} 3', lines)
+        self.assertEqual(lines[-2:], ['# TYPE unravel_cache_misses gauge', 'unravel_cache_misses 4'])
+
+        with self.assertRaises(ValueError):
+            registry.histogram('unravel_test_total', 'Not a histogram.')
+
+    def test_timed(self):
+        registry = MetricsRegistry()
+        timer = timed('unravel_test_seconds', 'Test timings.', registry=registry, stage='one')
+
+        @timer
+        def work():
+            with timer:
+                time.sleep(0.01)
+
+        work()
+        histogram = registry.histogram('unravel_test_seconds', 'Test timings.')
+        self.assertEqual(histogram.count(stage='one'), 2)
+        self.assertGreaterEqual(histogram.sum(stage='one'), 0.02)
+
+    def test_query_timer(self):
+        timer = QueryTimer()
+        calls = []
+
+        def execute(sql, params, many, context):
+            calls.append(sql)
+            return 'result'
+
+        self.assertEqual(timer(execute, 'SELECT 1', None, False, {}), 'result')
+        self.assertEqual(timer(execute, 'SELECT 2', None, False, {}), 'result')
+        self.assertEqual(calls, ['SELECT 1', 'SELECT 2'])
+        self.assertEqual(timer.queries, 2)
+        self.assertGreaterEqual(timer.seconds, 0)
+
+    def test_sampling_profiler(self):
+        profiler = SamplingProfiler(interval=0.001, slow_seconds=0.01)
+
+        def slow_function():
+            time.sleep(0.2)
+
+        with self.assertLogs('unravel.lib.instrumentation', level='WARNING') as logs:
+            with profiler.span('test'):
+                slow_function()
+        self.assertIn('Slow test took', logs.output[0])
+        self.assertIn('slow_function', logs.output[0])
+
+        # fast spans are not logged, and other threads are not sampled
+        other = threading.Thread(target=slow_function)
+        other.start()
+        profiler.slow_seconds = 60
+        with profiler.span('fast'):
+            time.sleep(0.01)
+        other.join()
+        self.assertEqual(profiler.end_span(), {})
+
+    def test_middleware(self):
+        middleware = MetricsMiddleware(lambda request: HttpResponse(status=204))
+        histogram = get_registry().histogram('unravel_request_seconds', 'Time to handle each request, by view.')
+        labels = {'view': 'unresolved', 'method': 'GET', 'status': 204}
+        before = histogram.count(**labels)
+
+        response = middleware(RequestFactory().get('/documents'))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(histogram.count(**labels), before + 1)
+        self.assertIn('unravel_request_queries_bucket{method="GET",status="204",view="unresolved",le="0"}',
+                      get_registry().render())
@@ -0,0 +1,69 @@
+from collections import namedtuple
+
+from django.test import SimpleTestCase
+
+from unravel.lib.keyset_pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+
+_Item = namedtuple('_Item', ['id', 'title'])
+
+
+class _ListQuerySet:
+    """The part of a queryset used by keyset_page, over a list of items."""
+
+    def __init__(self, items):
+        self.items = items
+
+    def order_by(self, field):
+        return _ListQuerySet(sorted(self.items, key=lambda item: self._value(item, field)))
+
+    def filter(self, id__gt):
+        return _ListQuerySet([item for item in self.items if self._value(item, 'id') > id__gt])
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def _value(self, item, field):
+        return item[field] if isinstance(item, dict) else getattr(item, field)
+
+
+class KeysetPaginationTestCase(SimpleTestCase):
+
+    def test_cursor_round_trip(self):
+        for last_id in (0, 1, 99, 2 ** 40):
+            cursor = encode_cursor(last_id)
+            self.assertNotIn('=', cursor)
+            self.assertEqual(decode_cursor(cursor), last_id)
+
+    def test_invalid_cursor(self):
+        cursors = [
+            'not a cursor', '!!!!', encode_cursor(1)[:-2],
+            'eyJpZCI6IjEifQ',  # {"id":"1"}
+            'eyJpZCI6dHJ1ZX0',  # {"id":true}
+            'eyJrZXkiOjF9',  # {"key":1}
+            'WzFd',  # [1]
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_pages(self):
+        queryset = _ListQuerySet([{'id': item_id, 'title': str(item_id)} for item_id in (7, 3, 5, 1, 9)])
+
+        items, cursor = keyset_page(queryset, None, 2)
+        self.assertEqual([item['id'] for item in items], [1, 3])
+        items, cursor = keyset_page(queryset, cursor, 2)
+        self.assertEqual([item['id'] for item in items], [5, 7])
+        items, cursor = keyset_page(queryset, cursor, 2)
+        self.assertEqual([item['id'] for item in items], [9])
+        self.assertIsNone(cursor)
+
+        # a page that ends exactly at the last item has no next page
+        items, cursor = keyset_page(queryset, None, 5)
+        self.assertEqual(len(items), 5)
+        self.assertIsNone(cursor)
+
+    def test_model_items(self):
+        queryset = _ListQuerySet([_Item(2, 'b'), _Item(1, 'a'), _Item(3, 'c')])
+        items, cursor = keyset_page(queryset, None, 2)
+        self.assertEqual(items, [_Item(1, 'a'), _Item(2, 'b')])
+        self.assertEqual(decode_cursor(cursor), 2)
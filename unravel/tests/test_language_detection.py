@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from unravel import models as app_models
+from unravel.lib.text_analysis.language_detection import UNKNOWN_LANGUAGE, LanguageDetector
+from unravel.models import DocumentVersion
+from unravel.tasks import analysis_tasks, process_new_document_version, update_search_vectors
+
+GERMAN_TEXT = ("Sie sind selbst dafür verantwortlich, Ihr Passwort geheim zu halten. Wir können Ihr Konto "
+               "sperren, wenn wir glauben, dass es ohne Ihre Erlaubnis benutzt wurde.")
+
+
+class LanguageDetectionTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.detector = LanguageDetector()
+        cls.sample_text = {
+            'english': "You are responsible for keeping your password secure. We may suspend your account if we "
+                       "believe it has been used without your permission.",
+            'danish': "Du er selv ansvarlig for at holde din adgangskode hemmelig. Vi kan lukke din konto, hvis vi "
+                      "mener, at den er blevet brugt uden din tilladelse.",
+            'german': GERMAN_TEXT,
+            'norwegian': "Du er selv ansvarlig for å holde passordet ditt hemmelig. Vi kan stenge kontoen din hvis "
+                         "vi mener at den har blitt brukt uten din tillatelse.",
+            'russian': "Вы несете ответственность за сохранность своего пароля. Мы можем заблокировать вашу учетную "
+                       "запись, если считаем, что она использовалась без вашего разрешения.",
+            'spanish': "Usted es responsable de mantener segura su contraseña. Podemos suspender su cuenta si "
+                       "creemos que ha sido utilizada sin su permiso.",
+        }
+
+    def test_profiles_match_content_languages(self):
+        content_languages = {language for language, _ in DocumentVersion.CONTENT_TEXT_LANGUAGES}
+        self.assertEqual(set(self.detector.languages) | {UNKNOWN_LANGUAGE}, content_languages)
+
+    def test_detect_many(self):
+        languages = list(self.sample_text)
+        detected = self.detector.detect_many(self.sample_text[language] for language in languages)
+        self.assertEqual(detected, languages)
+
+    def test_long_text_is_sampled(self):
+        self.assertEqual(self.detector.detect(self.sample_text['german'] * 100), 'german')
+
+    def test_unknown(self):
+        self.assertEqual(self.detector.detect(''), UNKNOWN_LANGUAGE)
+        self.assertEqual(self.detector.detect('1.2 (a)'), UNKNOWN_LANGUAGE)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Search vectors need PostgreSQL.')
+class NewVersionLanguageTestCase(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('editor')
+        self.document = app_models.Document(title='AGB')
+        self.document.save(user=self.user)
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.storage = FileSystemStorage(location=media.name)
+        for target, name, value in (
+                (DocumentVersion._meta.get_field('content_file'), 'storage', self.storage),
+                (analysis_tasks.analyse_document_version, 'delay', mock.Mock())):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _search(self, language, query):
+        return DocumentVersion.objects.filter(
+            content_text_norm=SearchQuery(query, config=language)).values_list('pk', flat=True)
+
+    def test_new_version_language_detected(self):
+        # a version saved from the admin starts with the default language
+        version = DocumentVersion(document=self.document, content_text_raw=GERMAN_TEXT)
+        version.save(user=self.user)
+        self.assertEqual(version.content_language, 'english')
+
+        process_new_document_version(version.pk)
+        version.refresh_from_db()
+        self.assertEqual(version.content_language, 'german')
+        self.assertEqual(list(self._search('german', 'Erlaubnis')), [version.pk])
+
+    def test_content_file_search_vectors(self):
+        name = self.storage.save('agb.txt', ContentFile(GERMAN_TEXT.encode('utf-8')))
+        version = DocumentVersion(document=self.document, content_file=name, content_language='german')
+        version.save(user=self.user)
+        missing = DocumentVersion(document=self.document, content_file='missing.txt')
+        missing.content_hash = 'missing'
+        DocumentVersion.objects.bulk_create([missing])
+
+        self.assertEqual(update_search_vectors([version.pk, missing.pk]), 1)
+        self.assertEqual(list(self._search('german', 'Konto')), [version.pk])
+        self.assertIsNone(DocumentVersion.objects.get(pk=missing.pk).content_text_norm)
@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+
+from unravel.lib.load_test import Sample, percentile, summarise
+
+
+class LoadTestTestCase(SimpleTestCase):
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3.0], 90), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarise(self):
+        samples = [
+            Sample('document_content', 200, 0.010, 2, 0.002),
+            Sample('document_content', 200, 0.030, 4, 0.004),
+            Sample('document_list', 500, 0.100, 1, 0.050),
+            Sample('document_list', None, 0.200, 0, 0.0),
+        ]
+        summary = summarise(samples, elapsed=2.0)
+        self.assertEqual(sorted(summary), ['all', 'document_content', 'document_list'])
+
+        content = summary['document_content']
+        self.assertEqual(content['requests'], 2)
+        self.assertEqual(content['errors'], 0)
+        self.assertEqual(content['requests_per_second'], 1)
+        self.assertAlmostEqual(content['p50_ms'], 10)
+        self.assertAlmostEqual(content['max_ms'], 30)
+        self.assertEqual(content['queries_mean'], 3)
+        self.assertEqual(content['queries_max'], 4)
+        self.assertAlmostEqual(content['db_ms_mean'], 3)
+
+        self.assertEqual(summary['document_list']['errors'], 2)
+        self.assertEqual(summary['all']['requests'], 4)
@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.test import SimpleTestCase
+
+from unravel.lib.text_analysis.corpus_generator import count_words, generate_corpus_text
+from unravel.lib.text_analysis.readability_benchmark import HEATMAP_ANALYSER, ReadabilityBenchmark, compare_results
+from unravel.management.commands.benchmark_readability import Command
+
+
+class CountedTextAnalyser:
+    """A text analyser that counts how many times it is created."""
+
+    created = 0
+
+    def __init__(self):
+        CountedTextAnalyser.created += 1
+        self.data = bytearray(1024 * 1024)
+
+
+class ReadabilityBenchmarkTestCase(SimpleTestCase):
+
+    def test_generated_text(self):
+        text = generate_corpus_text(20 * 1024)
+        self.assertEqual(text, generate_corpus_text(20 * 1024))
+        self.assertNotEqual(text, generate_corpus_text(20 * 1024, seed=1))
+        self.assertLessEqual(len(text.encode('utf-8')), 20 * 1024)
+        self.assertGreater(len(text.encode('utf-8')), 19 * 1024)
+        self.assertTrue(text.startswith('1. DEFINITIONS AND INTERPRETATION\n\n1.1 "'))
+        self.assertTrue(text.endswith('.'))
+
+    def test_count_words(self):
+        self.assertEqual(count_words("The Licensee's rights (e.g. to copy) end on 1 July."), 11)
+
+    def test_run_heatmap(self):
+        results = ReadabilityBenchmark(sizes=[2048, 1024], analysers=[HEATMAP_ANALYSER], repeat=1).run()
+        self.assertEqual(results['sizes'], [1024, 2048])
+        self.assertEqual([row['size'] for row in results['results']], [1024, 2048])
+        for row in results['results']:
+            self.assertIsNone(row['error'])
+            self.assertGreater(row['words_per_second'], 0)
+            self.assertGreater(row['peak_bytes'], 0)
+
+    def test_missing_analyser(self):
+        results = ReadabilityBenchmark(
+            sizes=[1024], analysers=['unravel.tests.MissingTextAnalyser'], repeat=1).run()
+        self.assertEqual(results['results'], [])
+        self.assertIsNotNone(results['analysers']['unravel.tests.MissingTextAnalyser']['error'])
+
+    def test_analyser_created_once(self):
+        CountedTextAnalyser.created = 0
+        name = 'unravel.tests.test_readability_benchmark.CountedTextAnalyser'
+        results = ReadabilityBenchmark(sizes=[1024], analysers=[name], formulas=[], repeat=1).run()
+        self.assertEqual(CountedTextAnalyser.created, 1)
+        self.assertIsNone(results['analysers'][name]['error'])
+        self.assertGreaterEqual(results['analysers'][name]['load_peak_bytes'], 1024 * 1024)
+
+    def test_write_row_without_speed(self):
+        stdout = StringIO()
+        command = Command(stdout=stdout, stderr=StringIO())
+        command._write_row({
+            'analyser': 'nltk', 'formula': 'Lix', 'size': 1024, 'words': 180, 'seconds': 0.0,
+            'words_per_second': None, 'peak_bytes': 2048, 'level': 41.25, 'error': None})
+        output = stdout.getvalue()
+        self.assertIn('            - words/s', output)
+        self.assertIn('level 41.2', output)
+
+    def test_compare_results(self):
+        previous = {'results': [
+            {'analyser': 'nltk', 'formula': 'Lix', 'size': 1024, 'words_per_second': 1000.0},
+            {'analyser': 'nltk', 'formula': 'Rix', 'size': 1024, 'words_per_second': 1000.0},
+        ]}
+        current = {'results': [
+            {'analyser': 'nltk', 'formula': 'Lix', 'size': 1024, 'words_per_second': 950.0},
+            {'analyser': 'nltk', 'formula': 'Rix', 'size': 1024, 'words_per_second': 800.0},
+            {'analyser': 'spacy', 'formula': 'Rix', 'size': 1024, 'words_per_second': 800.0},
+        ]}
+        compared = compare_results(previous, current, max_slowdown=0.1)
+        self.assertEqual([(row['formula'], row['regression']) for row in compared], [('Lix', False), ('Rix', True)])
+        self.assertAlmostEqual(compared[1]['change'], -0.2)
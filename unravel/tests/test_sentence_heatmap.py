@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+
+from unravel.lib.text_analysis.sentence_heatmap import SentenceHeatmap, split_sentences
+from unravel.models import DocumentResultMetric
+
+
+class SentenceHeatmapTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.sample_text = (
+            "The Australian platypus is seemingly a hybrid of a mammal and reptilian creature. "
+            "The Licensor is based in the U.S. and e.g. Canada. You agree!\n\n"
+            "Termination\n\n"
+            "This agreement ends when you stop using the software.")
+
+    def test_split_sentences(self):
+        sentences = [self.sample_text[start:end] for start, end in split_sentences(self.sample_text)]
+        self.assertEqual(sentences, [
+            "The Australian platypus is seemingly a hybrid of a mammal and reptilian creature.",
+            "The Licensor is based in the U.S. and e.g. Canada.",
+            "You agree!",
+            "Termination",
+            "This agreement ends when you stop using the software.",
+        ])
+
+    def test_sentence_metrics(self):
+        heatmap = SentenceHeatmap.from_text(self.sample_text)
+        self.assertEqual(len(heatmap), 5)
+
+        first = heatmap.rows()[0]
+        self.assertEqual(first['words'], 13)
+        self.assertEqual(first['syllables'], 24)
+        self.assertEqual(first['letters'], 68)
+        self.assertEqual(first['flesch_kincaid_grade_level'], 11.3)
+
+    def test_bytes_round_trip(self):
+        heatmap = SentenceHeatmap.from_text(self.sample_text)
+        data = heatmap.to_bytes()
+        self.assertEqual(SentenceHeatmap.from_bytes(data).rows(), heatmap.rows())
+        self.assertEqual(SentenceHeatmap.from_bytes(SentenceHeatmap().to_bytes()).rows(), [])
+
+    def test_slice(self):
+        heatmap = SentenceHeatmap.from_text(self.sample_text)
+        start = self.sample_text.index('Canada')
+        end = self.sample_text.index('Termination') + 1
+
+        rows = heatmap.slice(start, end).rows()
+        self.assertEqual([self.sample_text[row['start']:row['end']] for row in rows], [
+            "The Licensor is based in the U.S. and e.g. Canada.",
+            "You agree!",
+            "Termination",
+        ])
+        self.assertEqual(len(heatmap.slice(len(self.sample_text), len(self.sample_text) + 10)), 0)
+
+    def test_summary(self):
+        heatmap = SentenceHeatmap.from_text(self.sample_text)
+        summary = heatmap.summary()
+        self.assertEqual(summary['sentence_count'], 5)
+        self.assertEqual(summary['word_count'], sum(row['words'] for row in heatmap.rows()))
+
+        metric_names = {name for name, _ in DocumentResultMetric.METRICS}
+        self.assertEqual(set(summary), metric_names)
+
+        empty = SentenceHeatmap().summary()
+        self.assertEqual(empty['word_count'], 0)
+        self.assertIsNone(empty['gunning_fog_index'])
@@ -0,0 +1,78 @@
+import io
+import zipfile
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase
+
+from unravel.lib.corpus_snapshot import copy_csv
+from unravel.lib.snapshot_archive import BINARY, DATETIME, SnapshotReader, SnapshotWriter
+
+
+class SnapshotArchiveTestCase(SimpleTestCase):
+
+    def test_roundtrip(self):
+        created = datetime(2018, 10, 1, 12, 30, tzinfo=timezone.utc)
+        rows = [(index, 'title {}'.format(index), created, b'\x00\xff' * index or None) for index in range(7)]
+        columns = ['id', 'title', 'created_date', 'fingerprint']
+        types = ['int', 'text', DATETIME, BINARY]
+
+        f = io.BytesIO()
+        with SnapshotWriter(f, chunk_rows=3, metadata={'version': '0.0.1'}) as writer:
+            self.assertEqual(writer.write_table('document', columns, types, iter(rows)), 7)
+            self.assertEqual(writer.write_table('empty', ['id'], ['int'], []), 0)
+
+        f.seek(0)
+        with SnapshotReader(f) as reader:
+            self.assertEqual(reader.manifest['version'], '0.0.1')
+            self.assertEqual(sorted(reader.tables), ['document', 'empty'])
+            self.assertEqual(reader.columns('document'), columns)
+            self.assertEqual(reader.types('document'), types)
+            self.assertEqual(reader.row_count('document'), 7)
+
+            chunks = list(reader.iter_chunks('document'))
+            self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+            self.assertEqual([row for chunk in chunks for row in chunk], rows)
+            self.assertEqual(list(reader.iter_chunks('empty')), [])
+
+    def test_chunk_bytes(self):
+        f = io.BytesIO()
+        with SnapshotWriter(f, chunk_rows=100, chunk_bytes=10) as writer:
+            writer.write_table('content', ['text'], ['text'], [('abcdef',)] * 4)
+
+        f.seek(0)
+        with SnapshotReader(f) as reader:
+            self.assertEqual([len(chunk) for chunk in reader.iter_chunks('content')], [2, 2])
+
+    def test_not_a_snapshot(self):
+        f = io.BytesIO()
+        with zipfile.ZipFile(f, 'w') as archive:
+            archive.writestr('other.txt', 'other')
+        f.seek(0)
+        with self.assertRaisesMessage(ValueError, 'no manifest'):
+            SnapshotReader(f)
+
+        f = io.BytesIO()
+        with zipfile.ZipFile(f, 'w') as archive:
+            archive.writestr('manifest.json', '{"format_version": 99, "tables": {}}')
+        f.seek(0)
+        with self.assertRaisesMessage(ValueError, 'format version 99'):
+            SnapshotReader(f)
+
+    def test_no_manifest_after_error(self):
+        f = io.BytesIO()
+        with self.assertRaises(RuntimeError):
+            with SnapshotWriter(f) as writer:
+                writer.write_table('document', ['id'], ['int'], [(1,)])
+                raise RuntimeError()
+        f.seek(0)
+        with self.assertRaises(ValueError):
+            SnapshotReader(f)
+
+    def test_copy_csv(self):
+        created = datetime(2018, 10, 1, 12, 30, tzinfo=timezone.utc)
+        output = copy_csv(
+            [(1, None, '', 'say "hi",\nthere', True, b'\x01\xab', [1, 2], created)],
+            ['int', 'text', 'text', 'text', 'bool', BINARY, 'array', DATETIME])
+        self.assertEqual(
+            output.read(),
+            '"1",,"","say ""hi"",\nthere","t","\\x01ab","{1,2}","2018-10-01T12:30:00+00:00"\n')
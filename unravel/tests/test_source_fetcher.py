@@ -0,0 +1,109 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from unravel.lib.source_fetcher import FetchResult, FetchTarget, SourceFetcher
+
+
+class _PolicyHandler(BaseHTTPRequestHandler):
+    """A local stand-in for a vendor policy site."""
+
+    pages = {
+        '/terms': ('"terms-v1"', 'These terms apply to all users.'),
+        '/privacy': (None, 'We collect data.'),
+    }
+
+    def do_GET(self):
+        if self.path not in self.pages:
+            self.send_error(404)
+            return
+        etag, text = self.pages[self.path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SourceFetcherTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), _PolicyHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_fetch_changes(self):
+        fetcher = SourceFetcher(concurrency=2, host_interval=0, timeout=5)
+        targets = [
+            FetchTarget(1, self.base_url + '/terms', None, None, None),
+            FetchTarget(2, self.base_url + '/privacy', None, None, None),
+            FetchTarget(3, self.base_url + '/missing', None, None, None),
+        ]
+        terms, privacy, missing = fetcher.run(targets)
+
+        self.assertTrue(terms.changed)
+        self.assertEqual(terms.status, 200)
+        self.assertEqual(terms.etag, '"terms-v1"')
+        self.assertEqual(terms.text, 'These terms apply to all users.')
+        self.assertTrue(privacy.changed)
+        self.assertFalse(missing.changed)
+        self.assertEqual(missing.status, 404)
+        self.assertIsNotNone(missing.error)
+
+        # the second check uses the validators and content hash from the first check
+        seen = []
+        terms_again, privacy_again = fetcher.run([
+            FetchTarget(1, terms.target.url, terms.etag, terms.last_modified, terms.content_hash),
+            FetchTarget(2, privacy.target.url, privacy.etag, privacy.last_modified, privacy.content_hash),
+        ], on_result=seen.append)
+
+        self.assertEqual(terms_again.status, 304)
+        self.assertFalse(terms_again.changed)
+        self.assertEqual(privacy_again.status, 200)
+        self.assertFalse(privacy_again.changed)
+        self.assertEqual(len(seen), 2)
+
+    def test_host_interval_does_not_block_other_hosts(self):
+        fetcher = SourceFetcher(concurrency=1, host_interval=0.5, timeout=5)
+        started = {}
+
+        def fetch(target):
+            started[target.key] = time.monotonic()
+            return FetchResult(target, status=304)
+
+        targets = [
+            FetchTarget(1, 'https://one.example/terms', None, None, None),
+            FetchTarget(2, 'https://one.example/privacy', None, None, None),
+            FetchTarget(3, 'https://two.example/terms', None, None, None),
+        ]
+        begin = time.monotonic()
+        with mock.patch.object(fetcher, 'fetch', fetch):
+            fetcher.run(targets)
+
+        # the second request to the first host waits for the interval without holding the only slot
+        self.assertLess(started[3] - begin, 0.25)
+        self.assertGreaterEqual(started[2] - started[1], 0.5)
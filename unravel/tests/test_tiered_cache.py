@@ -0,0 +1,117 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from unravel import receivers
+from unravel.lib import tiered_cache
+from unravel.lib.tiered_cache import LruCache, TieredCache
+from unravel.models import Document, DocumentTag
+
+
+class TieredCacheTestCase(SimpleTestCase):
+
+    def test_lru_entry_limit(self):
+        lru = LruCache(max_entries=2, max_bytes=1000)
+        lru.set('a', 1, 1)
+        lru.set('b', 2, 1)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3, 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(lru.get('c'), 3)
+
+    def test_lru_byte_limit(self):
+        lru = LruCache(max_entries=10, max_bytes=100)
+        lru.set('a', 'a', 60)
+        lru.set('b', 'b', 60)
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(lru.current_bytes, 60)
+        lru.set('c', 'c', 200)
+        self.assertIsNone(lru.get('c'))
+        self.assertEqual(lru.get('b'), 'b')
+
+    def test_tiers_and_counters(self):
+        shared = LocMemCache('test_tiered_shared', {})
+        cache = TieredCache(shared=shared)
+
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', {'value': 1})
+        self.assertEqual(cache.get('key'), {'value': 1})
+
+        # another process with an empty local tier reads from the shared tier
+        other = TieredCache(shared=shared)
+        self.assertEqual(other.get('key'), {'value': 1})
+        self.assertEqual(other.get('key'), {'value': 1})
+
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['local_hits'], 1)
+        self.assertEqual(other.stats()['shared_hits'], 1)
+        self.assertEqual(other.stats()['local_hits'], 1)
+        self.assertEqual(other.stats()['hit_rate'], 1.0)
+
+    def test_invalidate(self):
+        shared = LocMemCache('test_tiered_invalidate', {})
+        cache = TieredCache(shared=shared, generation_ttl=0)
+
+        document_key = cache.model_key(Document, 'list')
+        tag_key = cache.model_key(DocumentTag, 'list')
+        cache.set(document_key, 'documents')
+
+        cache.invalidate(Document)
+        self.assertNotEqual(cache.model_key(Document, 'list'), document_key)
+        self.assertEqual(cache.model_key(DocumentTag, 'list'), tag_key)
+
+        # other processes see the new generation once their generation ttl expires
+        other = TieredCache(shared=shared, generation_ttl=0)
+        self.assertEqual(other.model_key(Document, 'list'), cache.model_key(Document, 'list'))
+
+    def test_changed_date_read_locally(self):
+        shared = LocMemCache('test_tiered_changed', {})
+        cache = TieredCache(shared=shared, generation_ttl=60)
+        other = TieredCache(shared=shared, generation_ttl=60)
+
+        with mock.patch.object(tiered_cache.time, 'time', return_value=1000.5):
+            cache.invalidate(Document)
+            changed = cache.changed_date(Document)
+            self.assertEqual(other.changed_date(Document), changed)
+
+        with mock.patch.object(shared, 'get', side_effect=AssertionError('read the shared cache')):
+            self.assertEqual(cache.changed_date(Document), changed)
+            self.assertEqual(other.changed_date(Document), changed)
+
+        # the process that invalidates sees the change at once, other processes after the generation ttl
+        with mock.patch.object(tiered_cache.time, 'time', return_value=2000.5):
+            cache.invalidate(Document)
+        self.assertGreater(cache.changed_date(Document), changed)
+        self.assertEqual(other.changed_date(Document), changed)
+        self.assertEqual(TieredCache(shared=shared).changed_date(Document), cache.changed_date(Document))
+
+    def test_invalidate_on_commit(self):
+        shared = LocMemCache('test_tiered_on_commit', {})
+        cache = TieredCache(shared=shared, generation_ttl=0)
+        document_key = cache.model_key(Document, 'list')
+
+        callbacks = []
+        with mock.patch.object(tiered_cache.transaction, 'on_commit', callbacks.append):
+            cache.invalidate_on_commit(Document)
+
+        # a read before the commit is cached under the old generation, which is not read after the commit
+        self.assertEqual(cache.model_key(Document, 'list'), document_key)
+        cache.set(document_key, 'old documents')
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(cache.model_key(Document, 'list'), document_key)
+        self.assertIsNone(cache.get(cache.model_key(Document, 'list')))
+
+    def test_many_to_many_change_invalidates_both_models(self):
+        model_cache = mock.Mock()
+        with mock.patch.object(receivers, 'get_model_cache', return_value=model_cache):
+            receivers.invalidate_many_to_many(
+                DocumentTag.documents.through, DocumentTag(), 'pre_add', Document)
+            model_cache.invalidate_on_commit.assert_not_called()
+
+            receivers.invalidate_many_to_many(
+                DocumentTag.documents.through, DocumentTag(), 'post_add', Document)
+            model_cache.invalidate_on_commit.assert_has_calls([mock.call(DocumentTag), mock.call(Document)])
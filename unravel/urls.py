@@ -4,5 +4,17 @@ from . import views
 
 
 urlpatterns = [
-    # path('', views.index, name='index'),
+    path('documents', views.document_list, name='document_list'),
+    path('tags/', views.tag_list, name='tag_list'),
+    path('annotations', views.result_list, name='result_list'),
+    path('documents/<int:document_id>/content',
+         views.document_version_content, name='document_content'),
+    path('documents/<int:document_id>/formatted',
+         views.document_version_formatted, name='document_formatted'),
+    path('documents/<int:document_id>/versions/<int:version_id>/content',
+         views.document_version_content, name='document_version_content'),
+    path('documents/<int:document_id>/versions/<int:version_id>/formatted',
+         views.document_version_formatted, name='document_version_formatted'),
+    path('status/cache', views.cache_stats, name='cache_stats'),
+    path('metrics', views.metrics, name='metrics'),
 ]
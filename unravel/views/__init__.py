@@ -1,3 +1,3 @@
-#from django.shortcuts import render
-
-# Create your views here.
+from .api_views import document_list, result_list, tag_list
+from .content_views import document_version_content, document_version_formatted
+from .status_views import cache_stats, metrics
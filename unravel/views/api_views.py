@@ -0,0 +1,148 @@
+from django.http import HttpResponse, JsonResponse
+from django.utils.http import urlencode
+from django.views.decorators.http import condition, require_safe
+
+from unravel import models as app_models
+from unravel.lib.content_hash import hash_text
+from unravel.lib.keyset_pagination import InvalidCursor, keyset_page
+from unravel.lib.tiered_cache import get_model_cache
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+DOCUMENT_FIELDS = ('id', 'title', 'description', 'created_date', 'updated_date')
+TAG_FIELDS = ('id', 'title', 'name', 'description', 'created_date', 'updated_date', 'documents')
+RESULT_FIELDS = (
+    'id', 'document_version', 'analyser_name', 'analyser_version', 'analyser_model_version',
+    'created_date', 'updated_date', 'documents', 'metrics')
+
+
+def _last_modified(model):
+    """Get when the model was last changed, used for the Last-Modified header.
+    This includes deletes, many to many changes, and bulk updates, which do not change the updated date."""
+
+    def last_modified(request, *args, **kwargs):
+        return get_model_cache().changed_date(model)
+
+    return last_modified
+
+
+def _etag(model):
+    """Get an ETag from the model cache generation, which changes whenever the model is changed.
+    HTTP dates only have seconds, so this also detects changes in the same second."""
+
+    def etag(request, *args, **kwargs):
+        label = model._meta.label_lower
+        return '"{}-{}"'.format(label, get_model_cache().generation(label))
+
+    return etag
+
+
+def _load_documents(model, ids):
+    """Get the document ids for each id of a model with a 'documents' many to many field."""
+    field = model._meta.get_field('documents')
+    source, target = field.m2m_column_name(), field.m2m_reverse_name()
+    links = field.remote_field.through.objects.filter(**{'{}__in'.format(source): ids}).values_list(source, target)
+
+    documents = {}
+    for source_id, document_id in links.order_by(target):
+        documents.setdefault(source_id, []).append(document_id)
+    return documents
+
+
+def _load_metrics(model, ids):
+    """Get the metrics for each result id."""
+    metrics = {}
+    rows = app_models.DocumentResultMetric.objects.filter(result_id__in=ids).values_list('result_id', 'metric', 'value')
+    for result_id, metric, value in rows:
+        metrics.setdefault(result_id, {})[metric] = value
+    return metrics
+
+
+# fields that are loaded with a separate query for the items on a page
+_RELATED_LOADERS = {
+    'documents': (_load_documents, list),
+    'metrics': (_load_metrics, dict),
+}
+
+
+def _cached_list_response(request, model, available_fields):
+    """Get a page of a model as JSON from the model cache, or build and cache the page."""
+    model_cache = get_model_cache()
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    key = model_cache.model_key(model, 'list', hash_text(query))
+
+    content = model_cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type='application/json')
+
+    response = _list_response(request, model, available_fields)
+    if response.status_code == 200:
+        model_cache.set(key, response.content)
+    return response
+
+
+def _list_response(request, model, available_fields):
+    """Build a page of a model as JSON.
+
+    Query parameters:
+    - fields: comma separated fields to include, the id is always included
+    - limit: the number of items per page
+    - after: the cursor from the 'next' url of the previous page
+    """
+    fields = available_fields
+    if request.GET.get('fields'):
+        fields = ['id'] + [name.strip() for name in request.GET['fields'].split(',') if name.strip() != 'id']
+        unknown = [name for name in fields if name not in available_fields]
+        if unknown:
+            return JsonResponse({'error': 'Unknown fields: {}.'.format(', '.join(unknown))}, status=400)
+
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'error': 'The limit must be a number.'}, status=400)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return JsonResponse({'error': 'The limit must be between 1 and {}.'.format(MAX_PAGE_SIZE)}, status=400)
+
+    column_fields = [name for name in fields if name not in _RELATED_LOADERS]
+    try:
+        items, next_cursor = keyset_page(model.objects.values(*column_fields), request.GET.get('after'), limit)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    ids = [item['id'] for item in items]
+    for name in fields:
+        if name in _RELATED_LOADERS:
+            loader, default = _RELATED_LOADERS[name]
+            related = loader(model, ids) if ids else {}
+            for item in items:
+                item[name] = related.get(item['id']) or default()
+
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query['after'] = next_cursor
+        next_url = '{}?{}'.format(request.path, query.urlencode())
+
+    return JsonResponse({'results': items, 'next': next_url})
+
+
+@require_safe
+@condition(etag_func=_etag(app_models.Document), last_modified_func=_last_modified(app_models.Document))
+def document_list(request):
+    """List documents as JSON."""
+    return _cached_list_response(request, app_models.Document, DOCUMENT_FIELDS)
+
+
+@require_safe
+@condition(etag_func=_etag(app_models.DocumentTag), last_modified_func=_last_modified(app_models.DocumentTag))
+def tag_list(request):
+    """List document tags as JSON."""
+    return _cached_list_response(request, app_models.DocumentTag, TAG_FIELDS)
+
+
+@require_safe
+@condition(etag_func=_etag(app_models.DocumentResult), last_modified_func=_last_modified(app_models.DocumentResult))
+def result_list(request):
+    """List document results (annotations) as JSON."""
+    return _cached_list_response(request, app_models.DocumentResult, RESULT_FIELDS)
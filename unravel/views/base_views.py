@@ -0,0 +1,40 @@
+from django.db.models.fields.files import FieldFile
+from django.http import Http404
+
+from unravel import models as app_models
+from unravel.lib.tiered_cache import get_model_cache
+
+
+def get_document_version(document_id: int, version_id: int = None, fields=None):
+    """Get a version of a document, or the latest version if version_id is None.
+    Only the given fields are loaded, if any are given."""
+    query = app_models.DocumentVersion.objects.filter(document_id=document_id)
+    if fields:
+        query = query.only(*fields)
+
+    if version_id is None:
+        version = query.order_by('-created_date', '-id').first()
+    else:
+        version = query.filter(pk=version_id).first()
+
+    if version is None:
+        raise Http404('Document version not found.')
+    return version
+
+
+def get_cached_document_version_values(document_id: int, version_id: int, fields):
+    """Get a dict of field values for a document version from the model cache.
+    Plain values are cached instead of model instances, as cached values are shared and must not change.
+    File fields are returned as the file name."""
+    model_cache = get_model_cache()
+    key = model_cache.model_key(app_models.DocumentVersion, 'values', document_id, version_id, ','.join(fields))
+
+    def load():
+        version = get_document_version(document_id, version_id, fields)
+        values = {}
+        for name in fields:
+            value = getattr(version, name)
+            values[name] = (value.name or None) if isinstance(value, FieldFile) else value
+        return values
+
+    return model_cache.get_or_set(key, load)
@@ -0,0 +1,120 @@
+import io
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.html import escape
+from django.views.decorators.http import require_GET, require_safe
+
+from unravel import models as app_models
+from unravel.lib.http_ranges import RangeNotSatisfiable, iter_file_range, parse_range_header
+from unravel.lib.tiered_cache import get_model_cache
+from unravel.tasks import queue_render_document_version
+from unravel.views.base_views import get_cached_document_version_values, get_document_version
+
+
+def _get_raw_text(version_id: int) -> str:
+    raw = app_models.DocumentVersion.objects.filter(pk=version_id).values_list('content_text_raw', flat=True)
+    return raw.first() or ''
+
+
+@require_safe
+def document_version_content(request, document_id: int, version_id: int = None):
+    """Stream the content of a document version.
+
+    The raw text is served if it is set, otherwise the content file is read in chunks,
+    so large documents use constant memory. This is the same content the content hash is calculated from.
+    The content file is sent as a download, so an uploaded html file is not shown as a page of this site.
+    Supports a single byte range, and conditional requests using an ETag
+    derived from the content hash.
+    """
+    version = get_cached_document_version_values(document_id, version_id, ('id', 'content_file', 'content_hash'))
+
+    etag = '"{}"'.format(version['content_hash']) if version['content_hash'] else None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    # the raw text is not cached with the other values, it is only loaded when the content is sent
+    data = _get_raw_text(version['id']).encode('utf-8')
+    disposition = None
+    if data or not version['content_file']:
+        content = io.BytesIO(data)
+        size = len(data)
+        content_type = 'text/plain; charset=utf-8'
+    else:
+        storage = app_models.DocumentVersion._meta.get_field('content_file').storage
+        content = storage.open(version['content_file'], 'rb')
+        size = storage.size(version['content_file'])
+        content_type = mimetypes.guess_type(version['content_file'])[0] or 'application/octet-stream'
+        # an uploaded file can be any type, e.g. html, so it is downloaded instead of shown on this site
+        disposition = "attachment; filename*=UTF-8''{}".format(quote(os.path.basename(version['content_file'])))
+
+    # ignore the range if the If-Range validator does not match the current content
+    if_range = request.META.get('HTTP_IF_RANGE')
+    range_header = request.META.get('HTTP_RANGE') if not if_range or if_range == etag else None
+
+    try:
+        byte_range = parse_range_header(range_header, size)
+    except RangeNotSatisfiable:
+        content.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */{}'.format(size)
+        return response
+
+    if byte_range is None:
+        start, end = 0, size - 1
+        response = StreamingHttpResponse(iter_file_range(content, start, end), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_file_range(content, start, end), content_type=content_type, status=206)
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, size)
+
+    response['Content-Length'] = str(max(0, end - start + 1))
+    response['Accept-Ranges'] = 'bytes'
+    response['X-Content-Type-Options'] = 'nosniff'
+    if disposition:
+        response['Content-Disposition'] = disposition
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
+@require_GET
+def document_version_formatted(request, document_id: int, version_id: int = None):
+    """Show the formatted content of a document version.
+
+    The formatted text is rendered by a celery task, this view never renders.
+    If the formatted text is missing or out of date, the render task is queued
+    once for the current content. The raw text is shown until the task has finished.
+    The content file is not read, a version with only a content file links to the content instead.
+    """
+    model_cache = get_model_cache()
+    key = model_cache.model_key(app_models.DocumentVersion, 'formatted', document_id, version_id)
+    formatted = model_cache.get(key)
+    if formatted is not None:
+        return HttpResponse(formatted)
+
+    version = get_document_version(document_id, version_id, fields=(
+        'id', 'content_text_raw', 'content_text_formatted', 'content_hash', 'content_formatted_hash'))
+
+    if version.is_formatted_current():
+        model_cache.set(key, version.content_text_formatted)
+        return HttpResponse(version.content_text_formatted)
+
+    if version.content_hash:
+        queue_render_document_version(version.pk, version.content_hash)
+    if version.content_text_raw:
+        return HttpResponse('<pre>{}</pre>'.format(escape(version.content_text_raw)))
+    if version_id is None:
+        content_url = reverse('document_content', args=[document_id])
+    else:
+        content_url = reverse('document_version_content', args=[document_id, version_id])
+    return HttpResponse('<p>The formatted text is not ready yet. <a href="{}">Show the content.</a></p>'.format(
+        escape(content_url)))
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_safe
+
+from unravel.lib.instrumentation import get_registry
+from unravel.lib.tiered_cache import get_model_cache
+
+
+@require_safe
+@staff_member_required
+def cache_stats(request):
+    """Show the model cache hit and miss counters for the process that handled the request."""
+    return JsonResponse(get_model_cache().stats())
+
+
+@require_safe
+def metrics(request):
+    """Show the timings and counters for the process that handled the request, in the Prometheus text format.
+    Only available to the INTERNAL_IPS."""
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        raise PermissionDenied
+
+    cache_stats = get_model_cache().stats()
+    extra = {'unravel_cache_{}'.format(name): value for name, value in cache_stats.items() if value is not None}
+    return HttpResponse(get_registry().render(extra), content_type='text/plain; version=0.0.4; charset=utf-8')